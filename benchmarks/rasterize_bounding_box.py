@@ -0,0 +1,84 @@
+"""
+Benchmark of GeoRasterizer.rasterize with a bounding box versus the number of cost
+categories.
+
+The single-pass burn of the cost-sorted shapes is compared with the former
+implementation, which rasterized the bounding box and then burned every cost category
+in a separate pass over the full output raster. Both rasters are checked for equality.
+
+Usage:
+    python benchmarks/rasterize_bounding_box.py [--size 4000] [--shapes 20000]
+"""
+import argparse
+from time import perf_counter
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from rasterio.features import rasterize
+
+from pyorps.io.geo_dataset import InMemoryVectorDataset
+from pyorps.raster.rasterizer import GeoRasterizer
+
+
+def create_land_use(size: int, n_shapes: int, n_categories: int,
+                    seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    Create overlapping rectangles with random cost categories.
+    """
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(0, size, size=(2, n_shapes))
+    w, h = rng.uniform(1, size / 20, size=(2, n_shapes))
+    values = rng.integers(1, n_categories + 1, size=n_shapes)
+    return gpd.GeoDataFrame({"category": "land_use", "value": values},
+                            geometry=shapely.box(x, y, x + w, y + h),
+                            crs="EPSG:32632")
+
+
+def rasterize_per_category(rasterizer: GeoRasterizer, bounding_box) -> np.ndarray:
+    """
+    Former implementation: one pass over the full raster for every cost category.
+    """
+    data = rasterizer.base_data.sort_values(by="value", ascending=True)
+    out_shape = rasterizer.raster.shape
+    raster = rasterize([(bounding_box, 65535)], out_shape=out_shape, fill=65535,
+                       dtype="uint16", transform=rasterizer.transform)
+    for unique_value in data["value"].unique():
+        value_geoms = data.loc[data["value"] == unique_value]
+        rasterize(zip(value_geoms["geometry"], value_geoms["value"]),
+                  out_shape=out_shape, fill=65535, out=raster, dtype="uint16",
+                  transform=rasterizer.transform)
+    return raster
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=4000,
+                        help="Width and height of the raster in cells")
+    parser.add_argument("--shapes", type=int, default=20000,
+                        help="Number of shapes")
+    args = parser.parse_args()
+
+    bounding_box = shapely.box(0, 0, args.size, args.size)
+    print(f"{'categories':>10} {'per category [s]':>17} {'single pass [s]':>16} "
+          f"{'speedup':>8}")
+    for n_categories in (1, 5, 10, 25, 50, 100):
+        gdf = create_land_use(args.size, args.shapes, n_categories)
+        rasterizer = GeoRasterizer(InMemoryVectorDataset(gdf, crs="EPSG:32632"),
+                                   {"category": {"land_use": 1}})
+
+        start = perf_counter()
+        raster = rasterizer.rasterize(field_name="value", bounding_box=bounding_box)
+        single_pass = perf_counter() - start
+
+        start = perf_counter()
+        expected = rasterize_per_category(rasterizer, bounding_box)
+        per_category = perf_counter() - start
+
+        assert np.array_equal(raster.data, expected)
+        print(f"{n_categories:>10} {per_category:>17.3f} {single_pass:>16.3f} "
+              f"{per_category / single_pass:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
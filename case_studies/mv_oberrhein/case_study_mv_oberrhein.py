@@ -281,7 +281,8 @@ def find_routes_for_connection_lines(
                                                  sources_crs=gis_data_crs)
     targets = all_targets[0]
 
-    # Find routes with different neighborhood settings
+    # Find routes with different neighborhood settings. The raster file and the
+    # search windows are loaded once and shared through the process cache
     for r in ['r0', 'r1', 'r2', 'r3']:
         # The R3 neighborhood must be processed in clusters due to memory constraints
         # Each cluster contains 2 potential connection points to keep the graph size
@@ -294,7 +295,8 @@ def find_routes_for_connection_lines(
                 ts = targets.loc[target_indices]
                 path_finder = pyorps.PathFinder(raster_path, source_coords=sources,
                                                 target_coords=ts, neighborhood_str=r,
-                                                ignore_max_cost=False)
+                                                ignore_max_cost=False,
+                                                use_process_cache=True)
                 paths = path_finder.find_route()
                 for path in paths:
                     all_paths.add(path)
@@ -302,7 +304,8 @@ def find_routes_for_connection_lines(
             ts = targets.loc[[1, 2, 133, 141, 138, 170, 101, 106]]
             path_finder = pyorps.PathFinder(raster_path, source_coords=sources,
                                             target_coords=ts, neighborhood_str=r,
-                                            ignore_max_cost=False)
+                                            ignore_max_cost=False,
+                                            use_process_cache=True)
             paths = path_finder.find_route()
             for path in paths:
                 all_paths.add(path)
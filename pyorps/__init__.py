@@ -2,18 +2,24 @@
 
 __version__ = "0.1.0"
 
-# Import key components for easy access
-from .io.geo_dataset import (
-    GeoDataset, VectorDataset, RasterDataset,
-    InMemoryVectorDataset, LocalVectorDataset,
-    WFSVectorDataset, LocalRasterDataset,
-    InMemoryRasterDataset, initialize_geo_dataset
-)
-from .raster.rasterizer import GeoRasterizer
-from .graph.path_finder import PathFinder
-from .core.path import Path, PathCollection  # Fixed: import from core.path instead of graph
-from .core.cost_assumptions import (CostAssumptions, get_zero_cost_assumptions, detect_feature_columns,
-                                    save_empty_cost_assumptions)
+from ._lazy import attach_lazy_attributes
+
+# Key components for easy access, imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    ".io.geo_dataset": [
+        "GeoDataset", "VectorDataset", "RasterDataset",
+        "InMemoryVectorDataset", "LocalVectorDataset",
+        "WFSVectorDataset", "LocalRasterDataset",
+        "InMemoryRasterDataset", "initialize_geo_dataset",
+    ],
+    ".raster.rasterizer": ["GeoRasterizer"],
+    ".graph.path_finder": ["PathFinder"],
+    ".core.path": ["Path", "PathCollection"],
+    ".core.cost_assumptions": [
+        "CostAssumptions", "get_zero_cost_assumptions", "detect_feature_columns",
+        "save_empty_cost_assumptions",
+    ],
+}, submodules=["core", "graph", "io", "raster", "server", "utils"])
 
 __all__ = [
     # Core dataset classes
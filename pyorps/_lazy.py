@@ -0,0 +1,50 @@
+"""
+Lazy attribute loading for the pyorps packages.
+
+The packages re-export the classes and functions of their submodules. Importing all
+submodules eagerly would import geopandas, rasterio, shapely, pandas and numba (with
+its kernels) on "import pyorps". Instead, the packages define a module __getattr__,
+which imports the submodule of an attribute on its first access.
+"""
+from importlib import import_module
+from typing import Any, Callable, Iterable, Optional
+
+
+def attach_lazy_attributes(
+        package: str,
+        attributes: dict[str, Iterable[str]],
+        submodules: Optional[Iterable[str]] = None
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Create the module __getattr__ and __dir__ functions of a package.
+
+    Parameters:
+        package: Name of the package (__name__ of its __init__ module)
+        attributes: Dictionary mapping the relative names of the submodules to the
+            names of the attributes they define
+        submodules: Relative names of submodules that are available as attributes of
+            the package
+
+    Returns:
+        The __getattr__ and __dir__ functions of the package
+    """
+    module_of = {name: module for module, names in attributes.items()
+                 for name in names}
+    submodules = set(submodules or ())
+    package_module = import_module(package)
+
+    def __getattr__(name: str) -> Any:
+        if name in module_of:
+            value = getattr(import_module(module_of[name], package), name)
+        elif name in submodules:
+            value = import_module(f".{name}", package)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # Later accesses do not pass through __getattr__
+        setattr(package_module, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(package_module)) | set(module_of) | submodules)
+
+    return __getattr__, __dir__
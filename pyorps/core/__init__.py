@@ -1,10 +1,18 @@
 """Core types and base classes for geospatial data processing."""
 
-from .cost_assumptions import (CostAssumptions, get_zero_cost_assumptions, detect_feature_columns,
-                               save_empty_cost_assumptions)
-from .types import (InputDataType, CostAssumptionsType, BboxType, GeometryMaskType, CoordinateTuple, CoordinateList, CoordinateInput,
-                    NormalizedCoordinate)
-from .path import Path, PathCollection
+from .._lazy import attach_lazy_attributes
+
+# Attributes are imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    ".cost_assumptions": ["CostAssumptions", "get_zero_cost_assumptions",
+                          "detect_feature_columns", "save_empty_cost_assumptions"],
+    ".types": ["InputDataType", "CostAssumptionsType", "BboxType", "GeometryMaskType",
+               "CoordinateTuple", "CoordinateList", "CoordinateInput",
+               "NormalizedCoordinate"],
+    ".path": ["Path", "PathCollection"],
+})
+
+# The exceptions do not depend on other packages
 from .exceptions import (
     # Cost assumption exceptions
     CostAssumptionsError, FileLoadError, InvalidSourceError, FormatError,
@@ -12,7 +20,9 @@ from .exceptions import (
     # WFS exceptions
     WFSError, WFSConnectionError, WFSResponseParsingError, WFSLayerNotFoundError,
     # Graph API exceptions
-    RasterShapeError, NoPathFoundError, AlgorthmNotImplementedError
+    RasterShapeError, NoPathFoundError, AlgorthmNotImplementedError,
+    # Routing server exceptions
+    RoutingServerError
 )
 
 __all__ = [
@@ -35,5 +45,8 @@ __all__ = [
     "WFSError", "WFSConnectionError", "WFSResponseParsingError", "WFSLayerNotFoundError",
 
     # Exceptions - Graph API
-    "RasterShapeError", "NoPathFoundError", "AlgorthmNotImplementedError"
+    "RasterShapeError", "NoPathFoundError", "AlgorthmNotImplementedError",
+
+    # Exceptions - Routing server
+    "RoutingServerError"
 ]
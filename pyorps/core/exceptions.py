@@ -116,4 +116,17 @@ class PairwiseError(Exception):
     def __init__(self) -> None:
         message = (f"Pairwise computation failed! Source and target lists must have "
                    f"the same length for pairwise computation!")
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+"""
+Exceptions for routing server
+"""
+
+
+class RoutingServerError(Exception):
+    """
+    Custom exception if the routing server cannot answer a request
+    """
+    def __init__(self, message: str, status: int = 400) -> None:
+        self.status = status
+        super().__init__(message)
@@ -7,23 +7,37 @@ This module provides:
 3. Dynamic loading of graph implementations via get_graph_api_class
 """
 
-# Import main graph class and key function
-from .path_finder import PathFinder, get_graph_api_class
+from .._lazy import attach_lazy_attributes
 
-# Import Path classes from core (do not re-export from graph.raster_graph)
-from ..core.path import Path, PathCollection
+# Attributes are imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    # Main graph class and key function
+    ".path_finder": ["PathFinder", "get_graph_api_class"],
+
+    # Route memoization and shortest-path trees
+    ".route_cache": ["RouteCache"],
+    ".shortest_path_tree": ["ShortestPathTree", "ShortestPathTreeCache"],
+
+    # Path classes from core (do not re-export from graph.raster_graph)
+    "..core.path": ["Path", "PathCollection"],
+
+    # API base classes
+    ".api": ["GraphAPI", "GraphLibraryAPI"],
+})
 
 # Import exceptions
 from ..core.exceptions import NoPathFoundError, AlgorthmNotImplementedError
 
-# Import API base classes
-from .api import GraphAPI, GraphLibraryAPI
-
 __all__ = [
     # Main graph class and factory function
     "PathFinder",
     "get_graph_api_class",
 
+    # Route memoization and shortest-path trees
+    "RouteCache",
+    "ShortestPathTree",
+    "ShortestPathTreeCache",
+
     # Path classes
     "Path",
     "PathCollection",
@@ -272,6 +272,13 @@ class GraphLibraryAPI(GraphAPI):
         Default implementation for pairwise shortest path computation.
         Subclasses can override this for library-specific optimizations.
 
+        The pairs are grouped by their source (or by their target, if there are fewer
+        distinct targets than sources) and one multi-target search is run per group.
+        The paths are scattered back into the order of the pairs afterward. This
+        reduces the number of searches from the number of pairs to the number of
+        distinct sources (or targets). As the A* heuristic is specific to a target,
+        pairs are searched individually with "astar".
+
         Parameters:
             sources: List of source node identifiers
             targets: List of target node identifiers
@@ -281,15 +288,66 @@ class GraphLibraryAPI(GraphAPI):
         Returns:
             List of paths, each connecting corresponding source-target pairs
         """
-        paths = []
-        for source, target in zip(sources, targets):
-            try:
-                path = self._compute_single_path(source, target, algorithm, **kwargs)
-                paths.append(path)
-            except NoPathFoundError:
-                paths.append([])
+        if algorithm == "astar":
+            paths = []
+            for source, target in zip(sources, targets):
+                try:
+                    path = self._compute_single_path(source, target, algorithm,
+                                                     **kwargs)
+                    paths.append(path)
+                except NoPathFoundError:
+                    paths.append([])
+            return paths
+
+        reverse, groups = self._plan_pairwise_groups(sources, targets)
+        paths = [[] for _ in range(len(sources))]
+        for origin, (destinations, positions) in groups.items():
+            if len(destinations) == 1:
+                # A single search with a target allows for an early exit
+                try:
+                    group_paths = [self._compute_single_path(origin, destinations[0],
+                                                             algorithm, **kwargs)]
+                except NoPathFoundError:
+                    group_paths = [[]]
+            else:
+                group_paths = self._compute_single_source_multiple_targets(
+                    origin, destinations, algorithm, **kwargs
+                )
+            for position, path in zip(positions, group_paths):
+                # The graphs are undirected, so a path can be reversed
+                paths[position] = path[::-1] if reverse else path
         return paths
 
+    @staticmethod
+    def _plan_pairwise_groups(
+            sources: NodeList,
+            targets: NodeList
+    ) -> tuple[bool, dict[Node, tuple[list[Node], list[int]]]]:
+        """
+        Group source-target pairs by their source or by their target, whichever
+        leads to fewer searches.
+
+        Parameters:
+            sources: List of source node identifiers
+            targets: List of target node identifiers
+
+        Returns:
+            tuple containing:
+            - Whether the pairs are grouped by target (the paths of the groups need
+              to be reversed in this case)
+            - Dictionary mapping the origin of each search to the destinations of the
+              search and the positions of the corresponding pairs
+        """
+        reverse = len(set(targets)) < len(set(sources))
+        origins, destinations = (targets, sources) if reverse else (sources, targets)
+
+        groups = {}
+        for position, (origin, destination) in enumerate(zip(origins, destinations)):
+            group_destinations, group_positions = groups.setdefault(origin, ([], []))
+            group_destinations.append(destination)
+            group_positions.append(position)
+        return reverse, groups
+
     def _compute_all_pairs_shortest_paths(
             self,
             sources: NodeList,
@@ -355,6 +413,9 @@ class GraphLibraryAPI(GraphAPI):
             target: The index of the target node in the raster data
             source: Optional source node for calculating area-specific minimum values
             kwargs: Additional parameters, including optional heu_weight for scaling
+                and min_value, a known lower bound of the costs (e.g. from the
+                precomputed statistics of a raster store), which replaces the
+                minimum of the raster data
 
         Returns:
             tuple containing:
@@ -376,7 +437,9 @@ class GraphLibraryAPI(GraphAPI):
         euclidean_distance = np.sqrt(x_square + y_square)
 
         # Use localized min value between source and target
-        if source is not None:
+        if kwargs.get('min_value') is not None:
+            min_value = kwargs['min_value']
+        elif source is not None:
             buffer_radius = kwargs.get('buffer_radius', 200)
             # Convert the source index to its 2D coordinates
             x_source, y_source = np.unravel_index(source, self.raster_data.shape)
@@ -419,6 +482,9 @@ class GraphLibraryAPI(GraphAPI):
             target: The index of the target node in the raster data
             source: Optional source node for calculating area-specific minimum values
             kwargs: Additional parameters, including optional heu_weight for scaling
+                and min_value, a known lower bound of the costs (e.g. from the
+                precomputed statistics of a raster store), which replaces the
+                minimum of the raster data
 
         Returns:
             tuple containing:
@@ -439,10 +505,10 @@ class GraphLibraryAPI(GraphAPI):
             np.square(x_target - x_nodes) + np.square(y_target - y_nodes)
         )
 
-        min_value = None
+        min_value = kwargs.get('min_value')
 
         # Use Bresenham's algorithm to find cells along the source-target line
-        if source is not None:
+        if source is not None and min_value is None:
             # Convert the source index to its 2D coordinates
             x_source, y_source = np.unravel_index(source, self.raster_data.shape)
 
@@ -0,0 +1,139 @@
+"""
+Process-pool batch routing for independent source-target pairs.
+
+Every pair gets its own search window, so no graph can be shared between the pairs.
+Instead, the loaded raster is placed once in shared memory and each worker process
+attaches to it. The workers create the window, build the graph and find the route for
+a single pair and send the result back as a dictionary of compact numpy arrays.
+"""
+from typing import Optional, Any
+
+import numpy as np
+from rasterio.transform import Affine
+
+from pyorps.core.exceptions import NoPathFoundError
+from pyorps.core.types import CoordinateTuple
+from pyorps.graph.path_finder import PathFinder, get_graph_api_class
+from pyorps.utils.shared_array import (SharedArray, SharedArrayHandle,
+                                       attach_shared_array, spawn_process_pool)
+
+# State of a worker process, set once by the pool initializer
+_worker_state: dict[str, Any] = {}
+
+
+def run_batch(
+        raster_data: np.ndarray,
+        transform: Affine,
+        crs: Any,
+        sources: list[CoordinateTuple],
+        targets: list[CoordinateTuple],
+        processes: Optional[int] = None,
+        **route_options
+) -> list[Optional[dict[str, Any]]]:
+    """
+    Find the routes for all source-target pairs in a pool of worker processes.
+
+    Parameters:
+        raster_data: The loaded raster data with shape (bands, rows, cols) or
+            (rows, cols)
+        transform: Affine transform of the raster
+        crs: Coordinate reference system of the raster
+        sources: Source coordinate of each pair
+        targets: Target coordinate of each pair
+        processes: Number of worker processes. If None, the number of CPUs is used.
+        **route_options: Options passed to PathFinder and PathFinder.find_route in
+            the workers (search_space_buffer_m, neighborhood_str, steps,
+            ignore_max_cost, graph_api, algorithm, calculate_metrics)
+
+    Returns:
+        A list with one compact result dictionary per pair (in the order of the
+        pairs) or None if no path was found for the pair
+    """
+    with SharedArray(raster_data.shape, raster_data.dtype) as shared:
+        shared.array[...] = raster_data
+        with spawn_process_pool(processes, _init_worker,
+                                (shared.handle, transform, crs,
+                                 route_options)) as executor:
+            return list(executor.map(_route_pair, range(len(sources)), sources,
+                                     targets))
+
+
+def _init_worker(
+        handle: SharedArrayHandle,
+        transform: Affine,
+        crs: Any,
+        route_options: dict[str, Any]
+) -> None:
+    """
+    Attach the worker process to the shared raster and import the graph library.
+
+    Parameters:
+        handle: Handle of the shared raster data
+        transform: Affine transform of the raster
+        crs: Coordinate reference system of the raster
+        route_options: Options for PathFinder and PathFinder.find_route
+    """
+    shm, data = attach_shared_array(handle)
+    data.flags.writeable = False
+
+    _worker_state.update(shm=shm, data=data, transform=transform, crs=crs,
+                         route_options=route_options)
+
+    # Import the graph library once instead of for every pair
+    get_graph_api_class(route_options.get("graph_api", "networkit"))
+
+
+def _route_pair(
+        pair_id: int,
+        source: CoordinateTuple,
+        target: CoordinateTuple
+) -> Optional[dict[str, Any]]:
+    """
+    Create the window and the graph for a single pair and find its route.
+
+    Parameters:
+        pair_id: Position of the pair in the batch
+        source: Source coordinate of the pair
+        target: Target coordinate of the pair
+
+    Returns:
+        Compact result dictionary or None if no path was found
+    """
+    options = dict(_worker_state["route_options"])
+    algorithm = options.pop("algorithm", "dijkstra")
+    calculate_metrics = options.pop("calculate_metrics", True)
+
+    path_finder = PathFinder(
+        dataset_source=_worker_state["data"],
+        source_coords=source,
+        target_coords=target,
+        transform=_worker_state["transform"],
+        crs=_worker_state["crs"],
+        **options
+    )
+    try:
+        path = path_finder.find_route(algorithm=algorithm,
+                                      calculate_metrics=calculate_metrics)
+    except NoPathFoundError:
+        return None
+
+    result = {
+        "pair_id": pair_id,
+        "source": source,
+        "target": target,
+        "path_indices": np.asarray(path.path_indices, dtype=np.uint32),
+        "path_coords": np.asarray(path.path_coords, dtype=np.float64),
+        "euclidean_distance": float(path.euclidean_distance),
+        "search_space_buffer_m": path.search_space_buffer_m,
+        "runtimes": path.runtimes,
+        "total_length": None,
+        "categories": None,
+        "lengths": None,
+    }
+    if path.length_by_category is not None:
+        result["total_length"] = path.total_length
+        # The categories keep the data type of the raster
+        result["categories"] = np.array(list(path.length_by_category.keys()))
+        result["lengths"] = np.fromiter(path.length_by_category.values(),
+                                        dtype=np.float64)
+    return result
@@ -1,14 +1,22 @@
+import asyncio
+import os
 from time import time
-from typing import Optional, Union, Any, Generator
+from typing import Optional, Union, Any, Generator, AsyncIterator, TYPE_CHECKING
 from contextlib import contextmanager
+from copy import copy
+from concurrent.futures import Executor
+from functools import partial
+from threading import Lock
 
-from numpy import array, ndarray, ravel_multi_index, unravel_index, sqrt, uint32 
+from numpy import (array, ndarray, ravel_multi_index, unravel_index, sqrt, uint32,
+                   atleast_1d, full, inf, vstack, number)
 from geopandas import GeoDataFrame, GeoSeries
 from shapely.geometry import LineString, Point, MultiPoint
 from rasterio.transform import Affine
 
 # Project imports
 from pyorps.core.path import Path, PathCollection
+from pyorps.core.exceptions import NoPathFoundError
 from pyorps.core.types import (BboxType, GeometryMaskType, InputDataType,
                                CostAssumptionsType, CoordinateInput, Node, NodeList,
                                NodePathList, NormalizedCoordinate, CoordinateTuple,
@@ -17,8 +25,31 @@ from pyorps.graph.api.graph_api import GraphAPI
 from pyorps.raster.rasterizer import GeoRasterizer
 from pyorps.raster.handler import RasterHandler
 from pyorps.utils.neighborhood import get_neighborhood_steps
-from pyorps.io.geo_dataset import initialize_geo_dataset, VectorDataset, RasterDataset
-from pyorps.utils.traversal import calculate_path_metrics_numba
+from pyorps.io.geo_dataset import (initialize_geo_dataset, VectorDataset, RasterDataset,
+                                   LocalRasterDataset)
+from pyorps.utils.traversal import (calculate_path_metrics_numba,
+                                    calculate_path_metrics_categories_numba,
+                                    construct_edges, build_csr_numba)
+from pyorps.utils.caching import MemoryCache, content_hash
+
+if TYPE_CHECKING:
+    # The optional caches are only imported when they are used
+    from pyorps.graph.route_cache import RouteCache
+    from pyorps.graph.shortest_path_tree import ShortestPathTreeCache
+    from pyorps.raster.rasterization_cache import RasterizationCache
+    from pyorps.io.block_cache import RasterBlockCache
+
+# Runtimes of the setup steps, which are shared by all queries of a PathFinder
+SETUP_RUNTIMES = ("raster_loading", "import_time_graph_api", "edge_construction",
+                  "graph_creation")
+
+# Parallel numba kernels must not be launched concurrently with the workqueue
+# threading layer
+_parallel_kernel_lock = Lock()
+
+# Process-wide cache of loaded raster datasets, raster handlers and graphs, shared by
+# all PathFinders created with use_process_cache=True
+process_cache = MemoryCache(max_bytes=2 ** 31)
 
 
 @contextmanager
@@ -107,6 +138,14 @@ class PathFinder:
             mask: Optional[GeometryMaskType] = None,
             transform: Optional[Affine] = None,
             raster_save_path: Optional[str] = None,
+            edge_cache_dir: Optional[str] = None,
+            edge_cache_max_bytes: int = 2 ** 30,
+            use_process_cache: bool = False,
+            route_cache: Optional["RouteCache"] = None,
+            tree_cache: Optional["ShortestPathTreeCache"] = None,
+            rasterization_cache: Optional["RasterizationCache"] = None,
+            load_full_raster: bool = False,
+            block_cache: Optional["RasterBlockCache"] = None,
             **kwargs
     ):
         """
@@ -150,6 +189,33 @@ class PathFinder:
                 RasterDataset. Can be used ia a raster dataset is passed directly to
                 dataset_source.
             raster_save_path: Path to save the raster dataset to.
+            edge_cache_dir: Directory of an on-disk cache for the edges of the graph.
+                The edges are stored as memory-mappable .npy files, keyed by a hash
+                of the raster window, the steps and ignore_max_cost, and are reused
+                instead of constructing them again. If None, no cache is used.
+            edge_cache_max_bytes: Size limit of the edge cache directory. The least
+                recently used edges are evicted if it is exceeded.
+            use_process_cache: Whether to share the loaded raster, the search window
+                and the graph with other PathFinders of the process through the
+                process_cache. Only used for raster files without cost assumptions
+                and modifications. The cached raster data is read-only.
+            route_cache: RouteCache to memoize the routes of single source-target
+                queries of find_route. Cached routes are returned without creating
+                or querying the graph.
+            tree_cache: ShortestPathTreeCache to keep the Dijkstra search of every
+                source. If given, find_route answers single-source dijkstra queries
+                from the saved shortest-path tree of the source and only resumes the
+                search for targets outside of its settled region.
+            rasterization_cache: RasterizationCache to reuse the rasterized and
+                modified vector data of an earlier run with the same dataset, cost
+                assumptions, rasterization parameters and datasets_to_modify.
+            load_full_raster: Whether to read the complete raster file. By default,
+                only the search window (and the bands selected with the indexes
+                keyword argument) of a raster file without cost assumptions is read.
+            block_cache: RasterBlockCache to keep the decoded blocks of the raster
+                file. Search windows of later PathFinders on the same file are then
+                assembled from the cached blocks instead of decoding them again
+                (e.g. pyorps.io.block_cache.raster_block_cache).
             **kwargs: Additional keyword arguments to pass to the rasterize function
                 of the RasterHandler (if a VectorDataset or a source to a VectorDataset
                 has been provided with dataset_source) or to the load function of the
@@ -191,15 +257,72 @@ class PathFinder:
         self.raster_handler = None
         self.geo_rasterizer = None
         self._graph_api = None
+        self._graph_api_lock = Lock()
+        self._raster_handler_lock = Lock()
         self.path_gdf = None
+        self.route_cache = route_cache
+        self.tree_cache = tree_cache
+        self.rasterization_cache = rasterization_cache
+        self.load_full_raster = load_full_raster
+        self.block_cache = block_cache
+        self._csr = None
+        self._window_digest = None
+        self.edge_cache = None
+        if edge_cache_dir is not None:
+            from pyorps.utils.caching import DiskArrayCache
+
+            self.edge_cache = DiskArrayCache(edge_cache_dir, edge_cache_max_bytes)
 
         # Load the dataset
-        self.dataset = initialize_geo_dataset(dataset_source, crs, bbox, mask,
-                                              transform)
+        self._dataset_cache_key = None
+        self._raster_handler_cache_key = None
+        if (use_process_cache and cost_assumptions is None and not datasets_to_modify
+                and bbox is None and mask is None and not kwargs):
+            self.dataset = self._get_cached_dataset(dataset_source, crs, transform)
+        else:
+            self.dataset = initialize_geo_dataset(dataset_source, crs, bbox, mask,
+                                                  transform)
         if self.source_coords is not None and self.target_coords is not None:
             self.create_raster_handler(cost_assumptions, datasets_to_modify,
                                        raster_save_path, **kwargs)
 
+    def _get_cached_dataset(
+            self,
+            dataset_source: InputDataType,
+            crs: Optional[str],
+            transform: Optional[Affine]
+    ) -> Union[RasterDataset, VectorDataset]:
+        """
+        Return the loaded raster dataset of a file from the process cache or load it
+        and store it in the cache. Other sources are initialized without the cache.
+
+        Parameters:
+            dataset_source: Source of the dataset
+            crs: The coordinate reference system of the project
+            transform: Affine transformation of the dataset
+
+        Returns:
+            The (loaded) dataset
+        """
+        if not isinstance(dataset_source, str) or not os.path.isfile(dataset_source):
+            return initialize_geo_dataset(dataset_source, crs, None, None, transform)
+
+        stat = os.stat(dataset_source)
+        key = ("dataset", os.path.abspath(dataset_source), stat.st_mtime_ns,
+               stat.st_size, str(crs), repr(transform))
+        dataset = process_cache.get(key)
+        if dataset is None:
+            dataset = initialize_geo_dataset(dataset_source, crs, None, None,
+                                             transform)
+            if not isinstance(dataset, RasterDataset):
+                return dataset
+            dataset.load_data()
+            # The raster is shared by all PathFinders and must never be modified
+            dataset.data.flags.writeable = False
+            process_cache.put(key, dataset, dataset.data.nbytes)
+        self._dataset_cache_key = key
+        return dataset
+
     @staticmethod
     def normalize_coordinates(
             input_data: Optional[CoordinateInput]
@@ -295,6 +418,12 @@ class PathFinder:
         Returns:
             RasterReader: The created RasterReader object
         """
+        if self._dataset_cache_key is not None and (cost_assumptions is not None or
+                                                    datasets_to_modify or kwargs):
+            # Modifications must not reach the shared raster of the process cache
+            self.dataset = copy(self.dataset)
+            self._dataset_cache_key = None
+
         # Using timed context manager instead of manual timing
         with timed("raster_loading", self.runtimes):
             # Check if we have vector data but no cost_assumptions
@@ -304,14 +433,33 @@ class PathFinder:
 
             # Process the dataset based on its type and parameters
             if isinstance(self.dataset, VectorDataset) and cost_assumptions is not None:
-                # Create a GeoRasterizer and rasterize the vector data
-                self.geo_rasterizer = GeoRasterizer(self.dataset, cost_assumptions)
-                self.geo_rasterizer.rasterize(save_path=raster_save_path, **kwargs)
+                raster_key = cached_raster = None
+                if self.rasterization_cache is not None:
+                    raster_key = self.rasterization_cache.make_key(
+                        self.dataset, cost_assumptions,
+                        GeoRasterizer.rasterize_parameters(**kwargs),
+                        datasets_to_modify
+                    )
+                    cached_raster = self.rasterization_cache.get(raster_key)
+
+                if cached_raster is not None:
+                    # Start from the raster of an earlier run with the same inputs
+                    self.geo_rasterizer = GeoRasterizer(cached_raster, cost_assumptions)
+                    if raster_save_path is not None:
+                        self.geo_rasterizer.save_raster(raster_save_path)
+                else:
+                    # Create a GeoRasterizer and rasterize the vector data
+                    self.geo_rasterizer = GeoRasterizer(self.dataset, cost_assumptions)
+                    self.geo_rasterizer.rasterize(save_path=raster_save_path, **kwargs)
 
-                # Apply any additional dataset modifications
-                if datasets_to_modify:
-                    for dataset_params in datasets_to_modify:
-                        self.geo_rasterizer.modify_raster_from_dataset(**dataset_params)
+                    # Apply any additional dataset modifications
+                    if datasets_to_modify:
+                        for dataset_params in datasets_to_modify:
+                            self.geo_rasterizer.modify_raster_from_dataset(
+                                **dataset_params)
+                    if raster_key is not None:
+                        self.rasterization_cache.put(raster_key,
+                                                     self.geo_rasterizer.raster_dataset)
 
                 # Create RasterHandler with the rasterized data
                 self.raster_handler = RasterHandler(
@@ -341,9 +489,39 @@ class PathFinder:
                         self.target_coords,
                         self.search_space_buffer_m
                     )
+                elif self._dataset_cache_key is not None:
+                    # Use the cached raster and share the search window with the
+                    # cached handlers, whose search space covers the one of the query
+                    geometry, window = RasterHandler.search_space(
+                        self.dataset, self.source_coords, self.target_coords,
+                        self.search_space_buffer_m)
+                    prefix = ("raster_handler", self._dataset_cache_key)
+                    match = process_cache.find(
+                        lambda k, handler: k[:2] == prefix and
+                        handler.buffer_geometry.covers(geometry))
+                    if match is not None:
+                        key, self.raster_handler = match
+                    else:
+                        key = prefix + (tuple(window.flatten()), geometry.wkb)
+                        self.raster_handler = process_cache.get_or_create(
+                            key,
+                            lambda: RasterHandler(self.dataset, self.source_coords,
+                                                  self.target_coords,
+                                                  self.search_space_buffer_m),
+                            lambda handler: handler.data.nbytes
+                        )
+                    self._raster_handler_cache_key = key
+                    if raster_save_path is not None:
+                        self.raster_handler.save_section_as_raster(raster_save_path)
                 else:
                     # Direct use of the raster without modifications
-                    self.dataset.load_data(**kwargs)
+                    if (isinstance(self.dataset, LocalRasterDataset) and
+                            self.dataset.data is None and not self.load_full_raster):
+                        # The RasterHandler only reads the search window
+                        self.dataset.block_cache = self.block_cache
+                        self.dataset.load_metadata(**kwargs)
+                    else:
+                        self.dataset.load_data(**kwargs)
 
                     self.raster_handler = RasterHandler(
                         self.dataset,
@@ -376,13 +554,37 @@ class PathFinder:
         # Get raster data for the specified band
         raster_data = self.raster_handler.data[band_index]
 
+        # Share the graph of the search window with other PathFinders of the process
+        graph_key = None
+        if self._raster_handler_cache_key is not None:
+            graph_key = ("graph", self._raster_handler_cache_key, band_index,
+                         self.steps.tobytes(), self.steps.shape,
+                         self.graph_api_name, bool(self.ignore_max_cost))
+            self._graph_api = process_cache.get(graph_key)
+            if self._graph_api is not None:
+                self.runtimes["edge_construction"] = 0.0
+                self.runtimes["graph_creation"] = 0.0
+                return getattr(self._graph_api, "graph", None)
+
+        # Use the edges from the edge cache or construct and store them
+        edges = {}
+        if self.edge_cache is not None:
+            with timed("edge_construction", self.runtimes):
+                edges = self._get_cached_edges(raster_data)
+
         # Create graph using the graph API
         self._graph_api = graph_api_class_constructor(raster_data, self.steps,
-                                                      ignore_max=self.ignore_max_cost)
+                                                      ignore_max=self.ignore_max_cost,
+                                                      **edges)
+        if graph_key is not None:
+            process_cache.put(graph_key, self._graph_api,
+                              self._estimate_graph_nbytes(self._graph_api))
         # Save edge construction and graph creation times
         if (hasattr(self._graph_api, 'edge_construction_time') and
                 hasattr(self._graph_api, 'graph_creation_time')):
-            self.runtimes["edge_construction"] = self._graph_api.edge_construction_time
+            if not edges:
+                edge_construction_time = self._graph_api.edge_construction_time
+                self.runtimes["edge_construction"] = edge_construction_time
             self.runtimes["graph_creation"] = self._graph_api.graph_creation_time
             return self._graph_api.graph
         else:
@@ -390,13 +592,54 @@ class PathFinder:
             self.runtimes["graph_creation"] = 0.0
             return None
 
+    @staticmethod
+    def _estimate_graph_nbytes(graph_api: GraphAPI) -> int:
+        """
+        Estimate the memory used by a graph for the budget of the process cache.
+
+        Parameters:
+            graph_api: The graph API holding the graph
+
+        Returns:
+            Estimated size in bytes (edges with two node indices and a weight, plus
+            the raster of the search window)
+        """
+        nbytes = graph_api.raster_data.nbytes
+        if hasattr(graph_api, "get_number_of_edges"):
+            nbytes += 16 * graph_api.get_number_of_edges()
+            nbytes += 8 * graph_api.get_number_of_nodes()
+        return nbytes
+
+    def _get_cached_edges(self, raster_data: ndarray) -> dict[str, ndarray]:
+        """
+        Load the edges of the raster window from the edge cache or construct them
+        and store them in the cache.
+
+        Parameters:
+            raster_data: 2D raster data of the search window
+
+        Returns:
+            Dictionary with from_nodes, to_nodes and cost
+        """
+        key = content_hash(raster_data, self.steps, bool(self.ignore_max_cost))
+        edges = self.edge_cache.get(key)
+        if edges is None:
+            from_nodes, to_nodes, cost = construct_edges(raster_data, self.steps,
+                                                         self.ignore_max_cost)
+            edges = {"from_nodes": from_nodes, "to_nodes": to_nodes, "cost": cost}
+            self.edge_cache.put(key, edges)
+        return edges
+
     @property
     def graph_api(self) -> GraphAPI:
         if self._graph_api is None:
-            self.create_graph()
-            # Overwrite the shortest_path_start_time, to make sure, that graph creation
-            # is not part of it
-            self.runtimes["shortest_path_start_time"] = time()
+            # The graph is only created once, even if multiple threads query routes
+            with self._graph_api_lock:
+                if self._graph_api is None:
+                    self.create_graph()
+                    # Overwrite the shortest_path_start_time, to make sure, that
+                    # graph creation is not part of it
+                    self.runtimes["shortest_path_start_time"] = time()
         return self._graph_api
 
     def get_node_indices_from_coords(
@@ -506,23 +749,46 @@ class PathFinder:
         source_indices = self.get_node_indices_from_coords(source)
         target_indices = self.get_node_indices_from_coords(target)
 
+        # Return a memoized route without touching the graph
+        route_key = None
+        if (self.route_cache is not None and not isinstance(source, list)
+                and not isinstance(target, list)):
+            route_key = self._route_cache_key(source_indices, target_indices,
+                                              algorithm)
+            route = self.route_cache.get(route_key)
+            if route is not None:
+                return self._create_cached_path_result(route, source, target,
+                                                       algorithm, calculate_metrics)
+
         # Time the shortest path calculation
         self.runtimes["shortest_path_start_time"] = time()
 
-        # Find the shortest path using the graph API
-        with timed("shortest_path", self.runtimes):
-            path_indices = self.graph_api.shortest_path(
-                source_indices=source_indices,
-                target_indices=target_indices,
-                algorithm=algorithm,
-                pairwise=pairwise,
-                **kwargs
-            )
+        # Find the shortest path using the graph API or the saved shortest-path tree
+        # of the source
+        if (self.tree_cache is not None and algorithm == "dijkstra" and not pairwise
+                and not isinstance(source, list)):
+            csr = self._get_csr()
+            self.runtimes["shortest_path_start_time"] = time()
+            with timed("shortest_path", self.runtimes):
+                path_indices = self._tree_shortest_paths(csr, source_indices,
+                                                         target_indices)
+        else:
+            with timed("shortest_path", self.runtimes):
+                path_indices = self.graph_api.shortest_path(
+                    source_indices=source_indices,
+                    target_indices=target_indices,
+                    algorithm=algorithm,
+                    pairwise=pairwise,
+                    **self._heuristic_kwargs(algorithm, kwargs)
+                )
 
         # Case 1: Single source, single target -> single path
         if not isinstance(path_indices[0], list):
-            return self._create_path_result(path_indices, source, target, algorithm,
+            path = self._create_path_result(path_indices, source, target, algorithm,
                                             calculate_metrics)
+            if route_key is not None:
+                self._store_route(route_key, path)
+            return path
         else:
             # Case 2 & 3: Multiple paths
             # For single source + multiple targets OR multiple sources +
@@ -538,6 +804,468 @@ class PathFinder:
                 results.add(path)
         return results
 
+    def query_route(
+            self,
+            source: CoordinateInput,
+            target: CoordinateInput,
+            algorithm: str = "dijkstra",
+            calculate_metrics: bool = True,
+            pairwise: bool = False,
+            **kwargs
+    ) -> Union[Path, PathCollection]:
+        """
+        Thread-safe variant of find_route for serving many queries from one PathFinder.
+
+        The loaded raster and the graph are only read. All per-query state (the
+        timings and the resulting paths) lives in the call, so the PathFinder's
+        runtimes and paths are not changed. The graph is created once by the first
+        query if it does not exist yet. Many threads can therefore query routes from
+        one warmed PathFinder concurrently.
+
+        Parameters:
+            source: Source coordinates. Can be: tuple, list of tuples, array of
+                arrays, shapely Point, shapely MultiPoint, GeoSeries of points, or
+                GeoDataFrame of points. Must lie within the search space of the
+                PathFinder.
+            target: Target coordinates. Same formats as source.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+            calculate_metrics: Whether to calculate path metrics. Defaults to True.
+            pairwise: Whether to calculate paths pairwise (requires equal number of
+                sources and targets). Default is False.
+
+        Returns:
+            A Path for a single source and target, a PathCollection otherwise
+        """
+        if self.raster_handler is None:
+            raise ValueError("The raster handler needs to be created before routes "
+                             "can be queried! Please call create_raster_handler "
+                             "first.")
+        source = PathFinder.normalize_coordinates(source)
+        target = PathFinder.normalize_coordinates(target)
+        if source is None or target is None:
+            raise ValueError("Source and target coordinates must not be None!")
+
+        graph_api = self.graph_api
+        runtimes = {k: v for k, v in self.runtimes.items() if k in SETUP_RUNTIMES}
+
+        source_indices = self.get_node_indices_from_coords(source)
+        target_indices = self.get_node_indices_from_coords(target)
+
+        runtimes["shortest_path_start_time"] = time()
+        with timed("shortest_path", runtimes):
+            path_indices = graph_api.shortest_path(
+                source_indices=source_indices,
+                target_indices=target_indices,
+                algorithm=algorithm,
+                pairwise=pairwise,
+                **self._heuristic_kwargs(algorithm, kwargs)
+            )
+
+        if not isinstance(path_indices[0], list):
+            return self._build_path(path_indices, source, target, algorithm,
+                                    calculate_metrics, runtimes, 0)
+        results = PathCollection()
+        for path in path_indices:
+            if not path:
+                continue
+            source = self.get_coords_from_node_indices(path[0])[0]
+            target = self.get_coords_from_node_indices(path[-1])[0]
+            results.add(self._build_path(path, source, target, algorithm,
+                                         calculate_metrics, runtimes, len(results)))
+        return results
+
+    def cost_matrix(
+            self,
+            sources: Optional[CoordinateInput] = None,
+            targets: Optional[CoordinateInput] = None,
+            algorithm: str = "dijkstra",
+            **kwargs
+    ) -> ndarray:
+        """
+        Calculate the total cost of the shortest paths between all sources and
+        targets. One multi-target search is run per source. Like query_route, this
+        method does not change the PathFinder and is thread-safe.
+
+        Parameters:
+            sources: Source coordinates. If None, uses the source_coords provided at
+                initialization.
+            targets: Target coordinates. If None, uses the target_coords provided at
+                initialization.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+
+        Returns:
+            Array of shape (number of sources, number of targets) with the total cost
+            of each path (inf if no path was found)
+        """
+        sources, targets = self._coordinate_lists(sources, targets)
+        rows = [self._cost_matrix_row(s, targets, algorithm, **kwargs) for s in sources]
+        return vstack(rows)
+
+    def _coordinate_lists(
+            self,
+            sources: Optional[CoordinateInput],
+            targets: Optional[CoordinateInput]
+    ) -> tuple[CoordinateList, CoordinateList]:
+        """
+        Normalize sources and targets to lists of coordinates, using the coordinates
+        provided at initialization if they are None.
+
+        Parameters:
+            sources: Source coordinates or None
+            targets: Target coordinates or None
+
+        Returns:
+            tuple of the source coordinate list and the target coordinate list
+        """
+        coordinate_lists = []
+        for coords, default in ((sources, self.source_coords),
+                                (targets, self.target_coords)):
+            coords = default if coords is None else self.normalize_coordinates(coords)
+            if coords is None:
+                raise ValueError("Source and target coordinates must not be None!")
+            coordinate_lists.append(coords if isinstance(coords, list) else [coords])
+        return coordinate_lists[0], coordinate_lists[1]
+
+    def _cost_matrix_row(
+            self,
+            source: CoordinateTuple,
+            targets: CoordinateList,
+            algorithm: str,
+            **kwargs
+    ) -> ndarray:
+        """
+        Calculate the total cost of the shortest paths from one source to all targets.
+
+        Parameters:
+            source: Source coordinate
+            targets: List of target coordinates
+            algorithm: Algorithm to use for shortest path
+
+        Returns:
+            Array with the total cost for each target (inf if no path was found)
+        """
+        graph_api = self.graph_api
+        source_index = self.get_node_indices_from_coords(source)
+        target_indices = atleast_1d(self.get_node_indices_from_coords(targets))
+        paths = graph_api.shortest_path(source_indices=int(source_index),
+                                        target_indices=target_indices.tolist(),
+                                        algorithm=algorithm, **kwargs)
+        row = full(len(targets), inf)
+        raster_data = self.raster_handler.data[0]
+        for i, path in enumerate(paths):
+            if len(path) == 0:
+                continue
+            with _parallel_kernel_lock:
+                _, cat, length = self._path_metrics(raster_data,
+                                                    array(path, dtype=uint32))
+            row[i] = sum(c * l for c, l in zip(cat, length))
+        return row
+
+    async def find_route_async(
+            self,
+            source: Optional[CoordinateInput] = None,
+            target: Optional[CoordinateInput] = None,
+            algorithm: str = "dijkstra",
+            calculate_metrics: bool = True,
+            pairwise: bool = False,
+            raster_parameters: Optional[dict[str, Any]] = None,
+            executor: Optional[Executor] = None,
+            **kwargs
+    ) -> Union[Path, PathCollection]:
+        """
+        Find the shortest path(s) without blocking the event loop.
+
+        Raster loading, graph construction and the search are run one after another
+        in the executor. The coroutine can be cancelled between these stages; a
+        stage that is already running in the executor is finished, but no further
+        stage is started. Like query_route, the resulting paths are not added to
+        the paths of the PathFinder, so many requests can be served concurrently.
+
+        Parameters:
+            source: Source coordinates. If None, uses the source_coords provided at
+                initialization.
+            target: Target coordinates. If None, uses the target_coords provided at
+                initialization.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+            calculate_metrics: Whether to calculate path metrics. Defaults to True.
+            pairwise: Whether to calculate paths pairwise (requires equal number of
+                sources and targets). Default is False.
+            raster_parameters: Parameters for create_raster_handler, if the raster
+                handler has not been created yet.
+            executor: Executor to run the stages in. If None, the default executor
+                of the event loop is used.
+
+        Returns:
+            A Path for a single source and target, a PathCollection otherwise
+        """
+        source = self.source_coords if source is None else source
+        target = self.target_coords if target is None else target
+        await self._prepare_async(raster_parameters, executor)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(self.query_route, source, target, algorithm=algorithm,
+                              calculate_metrics=calculate_metrics,
+                              pairwise=pairwise, **kwargs)
+        )
+
+    async def stream_routes_async(
+            self,
+            sources: Optional[CoordinateInput] = None,
+            targets: Optional[CoordinateInput] = None,
+            algorithm: str = "dijkstra",
+            calculate_metrics: bool = True,
+            raster_parameters: Optional[dict[str, Any]] = None,
+            executor: Optional[Executor] = None,
+            **kwargs
+    ) -> AsyncIterator[Path]:
+        """
+        Find the shortest paths between all sources and targets and yield each path
+        as soon as its search has finished.
+
+        Every source-target pair is searched separately and concurrently in the
+        executor, so a single-source multi-target query yields the path of each
+        target as soon as it is settled instead of after all targets. Use
+        query_route or cost_matrix to find the paths of all targets in one search of
+        a source. If the consumer stops iterating or the task is cancelled, searches
+        which have not started yet are cancelled.
+
+        Parameters:
+            sources: Source coordinates. If None, uses the source_coords provided at
+                initialization.
+            targets: Target coordinates. If None, uses the target_coords provided at
+                initialization.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+            calculate_metrics: Whether to calculate path metrics. Defaults to True.
+            raster_parameters: Parameters for create_raster_handler, if the raster
+                handler has not been created yet.
+            executor: Executor to run the stages in. If None, the default executor
+                of the event loop is used.
+
+        Yields:
+            The found paths in the order in which the searches finish
+        """
+        sources, targets = self._coordinate_lists(sources, targets)
+        await self._prepare_async(raster_parameters, executor)
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(
+                executor, partial(self.query_route, source, target,
+                                  algorithm=algorithm,
+                                  calculate_metrics=calculate_metrics, **kwargs)
+            )
+            for source in sources for target in targets
+        ]
+        try:
+            for future in asyncio.as_completed(futures):
+                yield await future
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def cost_matrix_async(
+            self,
+            sources: Optional[CoordinateInput] = None,
+            targets: Optional[CoordinateInput] = None,
+            algorithm: str = "dijkstra",
+            raster_parameters: Optional[dict[str, Any]] = None,
+            executor: Optional[Executor] = None,
+            **kwargs
+    ) -> ndarray:
+        """
+        Calculate the cost matrix between all sources and targets without blocking
+        the event loop. The rows of the matrix are calculated concurrently in the
+        executor.
+
+        Parameters:
+            sources: Source coordinates. If None, uses the source_coords provided at
+                initialization.
+            targets: Target coordinates. If None, uses the target_coords provided at
+                initialization.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+            raster_parameters: Parameters for create_raster_handler, if the raster
+                handler has not been created yet.
+            executor: Executor to run the stages in. If None, the default executor
+                of the event loop is used.
+
+        Returns:
+            Array of shape (number of sources, number of targets) with the total cost
+            of each path (inf if no path was found)
+        """
+        sources, targets = self._coordinate_lists(sources, targets)
+        await self._prepare_async(raster_parameters, executor)
+        loop = asyncio.get_running_loop()
+        rows = await asyncio.gather(*[
+            loop.run_in_executor(executor, partial(self._cost_matrix_row, source,
+                                                   targets, algorithm, **kwargs))
+            for source in sources
+        ])
+        return vstack(rows)
+
+    async def _prepare_async(
+            self,
+            raster_parameters: Optional[dict[str, Any]],
+            executor: Optional[Executor]
+    ) -> None:
+        """
+        Create the raster handler and the graph in the executor, if they do not exist
+        yet. Cancellation takes effect between the two stages.
+
+        Parameters:
+            raster_parameters: Parameters for create_raster_handler
+            executor: Executor to run the stages in
+        """
+        loop = asyncio.get_running_loop()
+        if self.raster_handler is None:
+            await loop.run_in_executor(
+                executor, partial(self._create_raster_handler_once,
+                                  **(raster_parameters or {}))
+            )
+        if self._graph_api is None:
+            await loop.run_in_executor(executor, getattr, self, "graph_api")
+
+    def _create_raster_handler_once(self, **kwargs) -> RasterHandler:
+        """
+        Create the raster handler unless another thread has already created it.
+
+        Parameters:
+            kwargs: Parameters for create_raster_handler
+
+        Returns:
+            The RasterHandler of the PathFinder
+        """
+        with self._raster_handler_lock:
+            if self.raster_handler is None:
+                self.create_raster_handler(**kwargs)
+        return self.raster_handler
+
+    def _get_csr(self) -> tuple[ndarray, ndarray, ndarray]:
+        """
+        Create the CSR adjacency of the search window once for the shortest-path
+        trees.
+
+        Returns:
+            Row pointers, column indices and weights of the CSR adjacency
+        """
+        if self._csr is None:
+            raster_data = self.raster_handler.data[0]
+            with timed("edge_construction", self.runtimes):
+                if self.edge_cache is not None:
+                    edges = self._get_cached_edges(raster_data)
+                    from_nodes, to_nodes, cost = (edges["from_nodes"],
+                                                  edges["to_nodes"], edges["cost"])
+                else:
+                    from_nodes, to_nodes, cost = construct_edges(
+                        raster_data, self.steps, self.ignore_max_cost)
+            with timed("graph_creation", self.runtimes):
+                self._csr = build_csr_numba(from_nodes, to_nodes, cost,
+                                            raster_data.size)
+        return self._csr
+
+    def _tree_shortest_paths(
+            self,
+            csr: tuple[ndarray, ndarray, ndarray],
+            source_index: Node,
+            target_indices: Union[Node, NodeList]
+    ) -> Union[NodeList, NodePathList]:
+        """
+        Find the shortest paths from the saved shortest-path tree of the source.
+
+        Parameters:
+            csr: CSR adjacency of the search window
+            source_index: Node index of the source
+            target_indices: Node index or node indices of the targets
+
+        Returns:
+            The path for a single target, a list of paths otherwise (empty lists for
+            unreachable targets)
+        """
+        from pyorps.graph.shortest_path_tree import ShortestPathTree
+
+        key = content_hash(self._get_window_digest(), int(source_index), self.steps,
+                           bool(self.ignore_max_cost))
+        tree = self.tree_cache.get_or_create(
+            key, lambda directory, name: ShortestPathTree(*csr, source_index,
+                                                          directory, name)
+        )
+        if isinstance(target_indices, (list, ndarray)):
+            return tree.shortest_paths(target_indices)
+        path = tree.shortest_paths(target_indices)[0]
+        if not path:
+            raise NoPathFoundError(source_index, target_indices)
+        return path
+
+    def _get_window_digest(self) -> str:
+        """
+        Content hash of the raster window, calculated once per raster handler.
+        """
+        if self._window_digest is None or \
+                self._window_digest[0] is not self.raster_handler:
+            self._window_digest = (self.raster_handler,
+                                   content_hash(self.raster_handler.data[0]))
+        return self._window_digest[1]
+
+    def _route_cache_key(self, source_index: Node, target_index: Node,
+                         algorithm: str) -> str:
+        """
+        Create the key of a route in the route cache.
+
+        Parameters:
+            source_index: Node index of the source
+            target_index: Node index of the target
+            algorithm: Shortest path algorithm
+
+        Returns:
+            The key of the route
+        """
+        from pyorps.graph.route_cache import RouteCache
+
+        return RouteCache.make_key(self._get_window_digest(), source_index,
+                                   target_index, self.steps, algorithm,
+                                   self.graph_api_name, self.ignore_max_cost)
+
+    def _store_route(self, route_key: str, path: Path) -> None:
+        """
+        Store the node indices and the metrics of a path in the route cache.
+
+        Parameters:
+            route_key: Key of the route
+            path: The path to store
+        """
+        categories = lengths = None
+        if path.length_by_category is not None:
+            categories = list(path.length_by_category.keys())
+            lengths = list(path.length_by_category.values())
+        self.route_cache.put(route_key, path.path_indices, path.total_length,
+                             categories, lengths)
+
+    def _create_cached_path_result(self, route, source, target, algorithm,
+                                   calculate_metrics):
+        """
+        Create a path result from a route of the route cache.
+
+        Parameters:
+            route: The cached route
+            source: Source coordinate
+            target: Target coordinate
+            algorithm: The routing algorithm used
+            calculate_metrics: Whether to add the path metrics
+
+        Returns:
+            The created Path object
+        """
+        runtimes = {"shortest_path": 0.0}
+        path = self._build_path(route["path_indices"].tolist(), source, target,
+                                algorithm, False, runtimes, len(self.paths))
+        if calculate_metrics:
+            if route["total_length"] is None:
+                with timed("path_metrics", runtimes):
+                    self.calculate_path_metrics(path.path_indices, path)
+            else:
+                PathFinder._set_path_metrics(path, route["total_length"],
+                                             route["categories"], route["lengths"])
+        self.paths.add(path)
+        return path
+
     def _create_path_result(self, path_indices, source, target, algorithm,
                             calculate_metrics):
         """
@@ -553,6 +1281,32 @@ class PathFinder:
         Returns:
             Dictionary containing path information
         """
+        path = self._build_path(path_indices, source, target, algorithm,
+                                calculate_metrics, self.runtimes, len(self.paths))
+
+        # Store path in PathCollection
+        self.paths.add(path)
+
+        return path
+
+    def _build_path(self, path_indices, source, target, algorithm, calculate_metrics,
+                    runtimes, path_id):
+        """
+        Create a Path object from path indices without changing the PathFinder.
+
+        Parameters:
+            path_indices: List of node indices for the path
+            source: Source coordinate(s)
+            target: Target coordinate(s)
+            algorithm: The routing algorithm used
+            calculate_metrics: Whether to calculate metrics
+            runtimes: Dictionary with the runtimes of the query, which is updated
+                with the total runtime and the runtime of the path metrics
+            path_id: ID of the path
+
+        Returns:
+            The created Path object
+        """
         # Convert path indices to coordinates
         path_coords = self.get_coords_from_node_indices(path_indices)
 
@@ -565,17 +1319,16 @@ class PathFinder:
 
         # Calculate total runtime based on the graph API used
         if self.graph_api_name == "cython":
-            self.runtimes["total"] = self.runtimes.get("raster_loading", 0) + \
-                                     self.runtimes.get("shortest_path", 0.0)
+            runtimes["total"] = runtimes.get("raster_loading", 0) + \
+                                runtimes.get("shortest_path", 0.0)
         else:
-            self.runtimes["total"] = self.runtimes.get("raster_loading", 0) + \
-                                     self.runtimes.get("graph_creation", 0) + \
-                                     self.runtimes.get("edge_construction", 0) + \
-                                     self.runtimes.get("import_time_graph_api", 0) + \
-                                     self.runtimes.get("shortest_path", 0.0)
+            runtimes["total"] = runtimes.get("raster_loading", 0) + \
+                                runtimes.get("graph_creation", 0) + \
+                                runtimes.get("edge_construction", 0) + \
+                                runtimes.get("import_time_graph_api", 0) + \
+                                runtimes.get("shortest_path", 0.0)
 
         # Create path object using the Path dataclass
-        path_id = len(self.paths)
         path = Path(
             source=source,
             target=target,
@@ -585,7 +1338,7 @@ class PathFinder:
             path_coords=path_coords,
             path_geometry=path_geometry,
             euclidean_distance=euclidean_distance,
-            runtimes=self.runtimes.copy(),
+            runtimes=runtimes.copy(),
             path_id=path_id,
             search_space_buffer_m=self.search_space_buffer_m,
             neighborhood=self.neighborhood_str
@@ -593,12 +1346,9 @@ class PathFinder:
 
         # Calculate path metrics if requested
         if calculate_metrics:
-            with timed("path_metrics", self.runtimes):
+            with timed("path_metrics", runtimes):
                 self.calculate_path_metrics(path_indices, path)
 
-        # Store path in PathCollection
-        self.paths.add(path)
-
         return path
 
     def calculate_path_metrics(self, path_indices, path):
@@ -616,11 +1366,74 @@ class PathFinder:
         raster_data = self.raster_handler.data[0]
 
         # Calculate metrics using Numba-accelerated function
-        path.total_length, cat, length = calculate_path_metrics_numba(raster_data,
-                                                                      path_indices)
+        with _parallel_kernel_lock:
+            total_length, cat, length = self._path_metrics(raster_data, path_indices)
+        PathFinder._set_path_metrics(path, total_length, cat, length)
+
+    def _path_metrics(
+            self,
+            raster_data: ndarray,
+            path_indices: ndarray
+    ) -> tuple[float, ndarray, ndarray]:
+        """
+        Calculate the total length, the categories and the lengths by category of a
+        path. The precomputed categories of the raster (e.g. of a raster store) are
+        used if available instead of the unique values of the search window.
+
+        Parameters:
+            raster_data: 2D raster data of the search window
+            path_indices: Node indices of the path
+
+        Returns:
+            Total length, categories and lengths by category
+        """
+        categories = getattr(self.raster_handler, "categories", None)
+        if isinstance(categories, ndarray):
+            return calculate_path_metrics_categories_numba(raster_data, path_indices,
+                                                           categories)
+        return calculate_path_metrics_numba(raster_data, path_indices)
+
+    def _heuristic_kwargs(self, algorithm: str, kwargs: dict[str, Any]
+                          ) -> dict[str, Any]:
+        """
+        Add the lower bound of the costs of the search window from the precomputed
+        statistics of the raster to the arguments of A*, so the heuristic does not
+        scan the raster for its minimum.
+
+        Parameters:
+            algorithm: Algorithm of the shortest path query
+            kwargs: Arguments of the shortest path query
+
+        Returns:
+            The arguments of the query
+        """
+        if algorithm != "astar" or "min_value" in kwargs:
+            return kwargs
+        min_value = getattr(self.raster_handler, "min_value", None)
+        if not isinstance(min_value, (int, float, number)):
+            return kwargs
+        return {**kwargs, "min_value": min_value}
+
+    @staticmethod
+    def _set_path_metrics(
+            path: Path,
+            total_length: float,
+            categories: ndarray,
+            lengths: ndarray
+    ) -> None:
+        """
+        Add the total length, the length by category and the total cost to a Path.
+
+        Parameters:
+            path: Path object to update with metrics.
+            total_length: Total length of the path
+            categories: Cost categories of the raster
+            lengths: Length of the path in each of the categories
+        """
+        path.total_length = total_length
 
         # Convert to regular Python dictionary
-        path.length_by_category = dict(zip(cat, length))
+        path.length_by_category = dict(zip(categories, lengths))
         tot = path.total_length
         l_by_cat = path.length_by_category.items()
         # Calculate percentages
@@ -630,6 +1443,97 @@ class PathFinder:
         # Calculate total cost
         path.total_cost = sum(cat * length for cat, length in l_by_cat)
 
+    def find_routes_batch(
+            self,
+            pairs: list[tuple[CoordinateInput, CoordinateInput]],
+            processes: Optional[int] = None,
+            algorithm: str = "dijkstra",
+            calculate_metrics: bool = True
+    ) -> PathCollection:
+        """
+        Find the routes for many independent source-target pairs in parallel.
+
+        Each pair gets its own search window and graph. The loaded raster is put into
+        shared memory once and the pairs are dispatched to a pool of worker
+        processes, which create the window, build the graph and find the route. The
+        workers return compact arrays, from which the Path objects are created.
+
+        Parameters:
+            pairs: List of (source, target) coordinate pairs
+            processes: Number of worker processes. If None, the number of CPUs is
+                used.
+            algorithm: Algorithm to use for shortest path. Defaults to "dijkstra".
+            calculate_metrics: Whether to calculate path metrics. Defaults to True.
+
+        Returns:
+            PathCollection with one path per pair, where the path_id is the position
+            of the pair in pairs. Pairs without a path are missing in the collection.
+        """
+        from pyorps.graph.batch import run_batch
+
+        raster_dataset = self._get_loaded_raster_dataset()
+        sources = [PathFinder.normalize_coordinates(s) for s, _ in pairs]
+        targets = [PathFinder.normalize_coordinates(t) for _, t in pairs]
+
+        results = run_batch(
+            raster_dataset.data,
+            raster_dataset.transform,
+            raster_dataset.crs,
+            sources,
+            targets,
+            processes=processes,
+            search_space_buffer_m=self.search_space_buffer_m,
+            neighborhood_str=self.neighborhood_str,
+            steps=self.steps,
+            ignore_max_cost=self.ignore_max_cost,
+            graph_api=self.graph_api_name,
+            algorithm=algorithm,
+            calculate_metrics=calculate_metrics
+        )
+
+        paths = PathCollection()
+        for result in results:
+            if result is None:
+                continue
+            path_coords = result["path_coords"]
+            path = Path(
+                source=result["source"],
+                target=result["target"],
+                algorithm=algorithm,
+                graph_api=self.graph_api_name,
+                path_indices=result["path_indices"],
+                path_coords=path_coords,
+                path_geometry=LineString(path_coords),
+                euclidean_distance=result["euclidean_distance"],
+                runtimes=result["runtimes"],
+                path_id=result["pair_id"],
+                search_space_buffer_m=result["search_space_buffer_m"],
+                neighborhood=self.neighborhood_str
+            )
+            if result["categories"] is not None:
+                PathFinder._set_path_metrics(path, result["total_length"],
+                                             result["categories"], result["lengths"])
+            paths.add(path, replace=True)
+        return paths
+
+    def _get_loaded_raster_dataset(self) -> RasterDataset:
+        """
+        Return the complete raster dataset used for path finding and load its data
+        if it has not been loaded yet.
+
+        Returns:
+            The loaded RasterDataset
+        """
+        if self.geo_rasterizer is not None:
+            return self.geo_rasterizer.raster_dataset
+        if isinstance(self.dataset, RasterDataset):
+            if self.dataset.data is None:
+                self.dataset.load_data(**(getattr(self.dataset, "read_kwargs", None)
+                                          or {}))
+            return self.dataset
+        raise ValueError("Vector data needs to be rasterized first! Please call "
+                         "create_raster_handler with cost assumptions.")
+
     def get_path(self, path_id=None, source=None, target=None):
         """
         Retrieve a stored path by ID, or by source AND target.
@@ -694,7 +1598,7 @@ class PathFinder:
         if save_file_path is not None and save_file_path != '':
             self.path_gdf.to_file(save_file_path)
 
-    def save_raster(self, save_path: Optional[str] = None) -> None:
+    def save_raster(self, save_path: Optional[str] = None, **geotiff_options) -> None:
         """
         Save the raster data used for path calculations to a GeoTIFF file.
 
@@ -706,6 +1610,8 @@ class PathFinder:
         Parameters:
             save_path: Path where the raster file should be saved. If None, uses
                 the default filename "pyorps_raster.tiff" in the current directory.
+            **geotiff_options: Options of pyorps.io.raster_writer.write_geotiff, e.g.
+                blocksize, compress, overviews or cog
 
         Returns:
             None
@@ -721,9 +1627,9 @@ class PathFinder:
         if save_path is None:
             save_path = "pyorps_raster.tiff"
         if self.geo_rasterizer is not None:
-            self.geo_rasterizer.save_raster(save_path)
+            self.geo_rasterizer.save_raster(save_path, **geotiff_options)
         else:
-            self.raster_handler.save_section_as_raster(save_path)
+            self.raster_handler.save_section_as_raster(save_path, **geotiff_options)
 
     def plot_paths(self,
                    paths: Optional[Union[Path, PathCollection, list[Path]]] = None,
@@ -0,0 +1,213 @@
+"""
+Memoization of route results.
+
+The RouteCache stores the node indices and the metrics of found paths under a key of
+the raster window content, the snapped source and target cells, the neighborhood, the
+algorithm and the graph backend. A PathFinder with a RouteCache answers repeated
+queries from the cache without creating or querying the graph. Entries are kept in an
+in-memory LRU and can additionally be persisted in an SQLite database, so the cache
+survives the process. The database keeps a bounded number of routes and drops the
+least recently used ones.
+"""
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Optional
+
+import numpy as np
+
+from pyorps.utils.caching import content_hash
+
+
+class RouteCache:
+    """
+    LRU cache of compact route results with optional SQLite persistence.
+
+    A cached route is a dictionary with the path indices (uint32 array) and the path
+    metrics total_length, categories (array of the raster data type) and lengths
+    (float64 array). The metrics are None if they were not calculated.
+    """
+
+    def __init__(self,
+                 max_entries: int = 4096,
+                 database_path: Optional[str] = None,
+                 max_database_entries: int = 65536):
+        """
+        Parameters:
+            max_entries: Maximum number of routes kept in memory
+            database_path: Path of an SQLite database to persist the routes in. If
+                None, the routes are only kept in memory.
+            max_database_entries: Maximum number of routes kept in the database
+        """
+        self.max_entries = max_entries
+        self.max_database_entries = max_database_entries
+        self.database_path = database_path
+        self.stats = {"hits": 0, "misses": 0, "database_hits": 0}
+        self._routes: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._connection = None
+        if database_path is not None:
+            self._connection = sqlite3.connect(database_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS routes ("
+                "key TEXT PRIMARY KEY, path_indices BLOB, total_length REAL, "
+                "categories BLOB, categories_dtype TEXT NOT NULL, lengths BLOB, "
+                "last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS routes_last_used ON routes (last_used)")
+            self._connection.commit()
+
+    @staticmethod
+    def make_key(
+            window_digest: str,
+            source_cell: int,
+            target_cell: int,
+            steps: np.ndarray,
+            algorithm: str,
+            graph_api: str,
+            ignore_max_cost: bool
+    ) -> str:
+        """
+        Create the key of a route.
+
+        Parameters:
+            window_digest: Content hash of the raster window
+            source_cell: Node index of the snapped source
+            target_cell: Node index of the snapped target
+            steps: Steps of the neighborhood
+            algorithm: Shortest path algorithm
+            graph_api: Name of the graph backend
+            ignore_max_cost: Whether cells with the maximum cost are ignored
+
+        Returns:
+            The key
+        """
+        return content_hash(window_digest, int(source_cell), int(target_cell),
+                            np.asarray(steps), algorithm, graph_api,
+                            bool(ignore_max_cost))
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Return the cached route of key from memory or from the database.
+
+        Parameters:
+            key: Key of the route
+
+        Returns:
+            The cached route or None if the route is not cached
+        """
+        with self._lock:
+            route = self._routes.get(key)
+            if route is not None:
+                self._routes.move_to_end(key)
+                self.stats["hits"] += 1
+                return route
+            if self._connection is not None:
+                route = self._read_route(key)
+            if route is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["database_hits"] += 1
+            self._store_in_memory(key, route)
+            return route
+
+    def put(
+            self,
+            key: str,
+            path_indices: Any,
+            total_length: Optional[float] = None,
+            categories: Optional[np.ndarray] = None,
+            lengths: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Store a route.
+
+        Parameters:
+            key: Key of the route
+            path_indices: Node indices of the path
+            total_length: Total length of the path
+            categories: Cost categories along the path (their data type is kept)
+            lengths: Length of the path in each of the categories
+        """
+        route = {
+            "path_indices": np.asarray(path_indices, dtype=np.uint32),
+            "total_length": None if total_length is None else float(total_length),
+            "categories": None if categories is None else np.asarray(categories),
+            "lengths": None if lengths is None else
+            np.asarray(lengths, dtype=np.float64),
+        }
+        with self._lock:
+            self._store_in_memory(key, route)
+            if self._connection is not None:
+                self._write_route(key, route)
+
+    def _store_in_memory(self, key: str, route: dict[str, Any]) -> None:
+        self._routes[key] = route
+        self._routes.move_to_end(key)
+        while len(self._routes) > self.max_entries:
+            self._routes.popitem(last=False)
+
+    def _read_route(self, key: str) -> Optional[dict[str, Any]]:
+        row = self._connection.execute(
+            "SELECT path_indices, total_length, categories, categories_dtype, lengths "
+            "FROM routes WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._connection.execute("UPDATE routes SET last_used = ? WHERE key = ?",
+                                 (time(), key))
+        self._connection.commit()
+        path_indices, total_length, categories, categories_dtype, lengths = row
+        return {
+            "path_indices": np.frombuffer(path_indices, dtype=np.uint32),
+            "total_length": total_length,
+            "categories": None if categories is None else
+            np.frombuffer(categories, dtype=categories_dtype),
+            "lengths": None if lengths is None else
+            np.frombuffer(lengths, dtype=np.float64),
+        }
+
+    def _write_route(self, key: str, route: dict[str, Any]) -> None:
+        def _blob(a):
+            return None if a is None else a.tobytes()
+
+        categories = route["categories"]
+        self._connection.execute(
+            "INSERT OR REPLACE INTO routes (key, path_indices, total_length, "
+            "categories, categories_dtype, lengths, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, _blob(route["path_indices"]), route["total_length"],
+             _blob(categories), "" if categories is None else categories.dtype.str,
+             _blob(route["lengths"]), time())
+        )
+        # Drop the least recently used routes beyond the limit of the database
+        self._connection.execute(
+            "DELETE FROM routes WHERE key IN (SELECT key FROM routes "
+            "ORDER BY last_used LIMIT max(0, (SELECT COUNT(*) FROM routes) - ?))",
+            (self.max_database_entries,)
+        )
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def clear(self) -> None:
+        """
+        Remove all routes from memory and from the database.
+        """
+        with self._lock:
+            self._routes.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM routes")
+                self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,264 @@
+"""
+Persisted single-source shortest-path trees for incremental target queries.
+
+A ShortestPathTree keeps the complete state of a Dijkstra search from one source: the
+distances, the predecessors, the settled nodes and the frontier. Targets inside the
+settled region are answered by backtracking the predecessors alone, targets outside
+of it resume the search from the saved frontier instead of restarting it. The
+ShortestPathTreeCache keeps a bounded number of trees, optionally in memory-mapped
+files, so further candidate targets of a source only pay for the additional search.
+Evicted trees stay usable by the queries still holding them; their memory-mapped
+files are deleted once the last reference to the tree is gone.
+"""
+import os
+import weakref
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+import numpy as np
+
+from pyorps.utils.traversal import dijkstra_resume_numba, backtrack_path_numba
+
+
+def _remove_files(paths: list[str]) -> None:
+    """
+    Delete the memory-mapped files of a tree.
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    paths.clear()
+
+
+class ShortestPathTree:
+    """
+    Resumable Dijkstra search from a single source on a CSR adjacency.
+    """
+
+    def __init__(
+            self,
+            indptr: np.ndarray,
+            indices: np.ndarray,
+            weights: np.ndarray,
+            source: int,
+            directory: Optional[str] = None,
+            name: str = "tree"
+    ):
+        """
+        Parameters:
+            indptr: Row pointers of the CSR adjacency
+            indices: Column indices of the CSR adjacency
+            weights: Edge weights of the CSR adjacency
+            source: Source node of the search
+            directory: Directory for memory-mapped state arrays. If None, the state
+                is kept in memory.
+            name: Prefix of the files of the memory-mapped state arrays
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.source = int(source)
+        self.files = []
+        self._lock = Lock()
+        # Deletes the files when the tree is released or garbage collected
+        self._finalizer = weakref.finalize(self, _remove_files, self.files)
+
+        n = len(indptr) - 1
+        self.dist = self._allocate(directory, name, "dist", n, np.float64, np.inf)
+        self.pred = self._allocate(directory, name, "pred", n, np.int64, -1)
+        self.state = self._allocate(directory, name, "state", n, np.int8, 0)
+        self.heap = self._allocate(directory, name, "heap", n, np.int64, 0)
+        self.pos = self._allocate(directory, name, "pos", n, np.int64, -1)
+
+        self.dist[self.source] = 0.0
+        self.state[self.source] = 1
+        self.heap[0] = self.source
+        self.pos[self.source] = 0
+        self.heap_size = 1
+
+    def _allocate(self, directory: Optional[str], name: str, field: str, n: int,
+                  dtype: type, fill_value: float) -> np.ndarray:
+        """
+        Allocate a state array in memory or as a memory-mapped .npy file.
+        """
+        if directory is None:
+            return np.full(n, fill_value, dtype=dtype)
+        path = os.path.join(directory, f"{name}_{field}.npy")
+        array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n,))
+        array[:] = fill_value
+        self.files.append(path)
+        return array
+
+    def is_settled(self, target: int) -> bool:
+        """
+        Whether the shortest path to target is already known.
+        """
+        return bool(self.state[target] == 2)
+
+    def settle(self, targets: np.ndarray) -> None:
+        """
+        Resume the search until all targets are settled or no node can be reached.
+
+        Parameters:
+            targets: Target nodes
+        """
+        targets = np.atleast_1d(np.asarray(targets, dtype=np.int64))
+        with self._lock:
+            self._settle(targets)
+
+    def _settle(self, targets: np.ndarray) -> None:
+        """
+        Resume the search for the targets. The lock of the tree must be held.
+
+        Raises:
+            RuntimeError: If the tree has been released
+        """
+        if self.dist is None:
+            raise RuntimeError("The shortest-path tree has been released")
+        if all(self.state[t] == 2 for t in targets):
+            return
+        self.heap_size = dijkstra_resume_numba(
+            self.indptr, self.indices, self.weights, self.dist, self.pred,
+            self.state, self.heap, self.pos, self.heap_size, targets
+        )
+
+    def shortest_paths(self, targets: np.ndarray) -> list[list[int]]:
+        """
+        Find the shortest paths from the source to all targets.
+
+        Parameters:
+            targets: Target nodes
+
+        Returns:
+            A list of node lists, one per target (empty if the target cannot be
+            reached)
+        """
+        targets = np.atleast_1d(np.asarray(targets, dtype=np.int64))
+        with self._lock:
+            self._settle(targets)
+            return [backtrack_path_numba(self.pred, self.source, int(t)).tolist()
+                    for t in targets]
+
+    def distances(self, targets: np.ndarray) -> np.ndarray:
+        """
+        Costs of the shortest paths from the source to all targets.
+
+        Parameters:
+            targets: Target nodes
+
+        Returns:
+            Array of costs (inf if a target cannot be reached)
+        """
+        targets = np.atleast_1d(np.asarray(targets, dtype=np.int64))
+        with self._lock:
+            self._settle(targets)
+            return np.array(self.dist[targets], dtype=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the search state in bytes (0 if the tree has been released).
+        """
+        return sum(a.nbytes for a in (self.dist, self.pred, self.state, self.heap,
+                                      self.pos) if a is not None)
+
+    def release(self) -> None:
+        """
+        Drop the state arrays and delete their memory-mapped files. Later queries of
+        the tree raise a RuntimeError.
+        """
+        with self._lock:
+            self.dist = self.pred = self.state = self.heap = self.pos = None
+            self._finalizer()
+
+
+class ShortestPathTreeCache:
+    """
+    Bounded least recently used cache of ShortestPathTrees.
+
+    Evicting a tree only drops the reference of the cache, so queries still using the
+    tree are not affected. Trees of different keys are created concurrently.
+    """
+
+    def __init__(self, max_trees: int = 8, directory: Optional[str] = None):
+        """
+        Parameters:
+            max_trees: Maximum number of trees kept in the cache
+            directory: Directory for memory-mapped state arrays of the trees. If None,
+                the trees are kept in memory.
+        """
+        self.max_trees = max_trees
+        self.directory = directory
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._trees: OrderedDict[str, ShortestPathTree] = OrderedDict()
+        self._lock = Lock()
+        # Locks of the keys, whose trees are being created
+        self._key_locks: dict[str, Lock] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_or_create(
+            self,
+            key: str,
+            create: Callable[[Optional[str], str], ShortestPathTree]
+    ) -> ShortestPathTree:
+        """
+        Return the tree stored under key or create and store it.
+
+        Parameters:
+            key: Key of the tree (e.g. a hash of the window, the neighborhood and the
+                source node)
+            create: Function creating the tree from the directory and the file name
+                prefix of its state arrays
+
+        Returns:
+            The ShortestPathTree
+        """
+        tree = self._get(key)
+        if tree is not None:
+            return tree
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, Lock())
+        try:
+            with key_lock:
+                # The tree may have been created by a concurrent call in the meantime
+                tree = self._get(key)
+                if tree is not None:
+                    return tree
+                with self._lock:
+                    self.stats["misses"] += 1
+                tree = create(self.directory, key)
+                with self._lock:
+                    self._trees[key] = tree
+                    while len(self._trees) > self.max_trees:
+                        self._trees.popitem(last=False)
+                        self.stats["evictions"] += 1
+                return tree
+        finally:
+            with self._lock:
+                if self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def _get(self, key: str) -> Optional[ShortestPathTree]:
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is not None:
+                self.stats["hits"] += 1
+                self._trees.move_to_end(key)
+            return tree
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._trees
+
+    def clear(self) -> None:
+        """
+        Remove all trees. Their files are deleted once they are no longer used.
+        """
+        with self._lock:
+            self._trees.clear()
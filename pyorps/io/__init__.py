@@ -8,23 +8,42 @@ This module provides:
 4. Factory functions to create appropriate dataset instances
 """
 
-# Core dataset classes
-from .geo_dataset import (
-    # Base classes
-    GeoDataset, VectorDataset, RasterDataset,
+from .._lazy import attach_lazy_attributes
 
-    # Vector dataset implementations
-    InMemoryVectorDataset, LocalVectorDataset, WFSVectorDataset,
+# Attributes are imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    # Core dataset classes, dataset implementations and factory function
+    ".geo_dataset": [
+        "GeoDataset", "VectorDataset", "RasterDataset",
+        "InMemoryVectorDataset", "LocalVectorDataset", "WFSVectorDataset",
+        "ParquetVectorDataset", "LocalRasterDataset", "MosaicRasterDataset",
+        "MemmapRasterDataset", "RasterStoreDataset", "InMemoryRasterDataset",
+        "initialize_geo_dataset",
+    ],
 
-    # Raster dataset implementations
-    LocalRasterDataset, InMemoryRasterDataset,
+    # Spatially indexed vector store
+    ".vector_store": ["create_vector_store", "read_vector_store", "row_group_bounds"],
 
-    # Factory function
-    initialize_geo_dataset
-)
+    # Cache of decoded raster blocks
+    ".block_cache": ["RasterBlockCache", "raster_block_cache"],
 
-# Data loading functions
-from .vector_loader import load_from_wfs
+    # GeoTIFF output
+    ".raster_writer": ["write_geotiff"],
+
+    # Mosaics of raster tiles
+    ".mosaic": ["TileIndex", "find_tiles"],
+
+    # Memory-mapped rasters
+    ".memmap_raster": ["write_memmap_raster", "convert_to_memmap_raster",
+                       "open_memmap_raster"],
+
+    # Chunked raster store with precomputed statistics
+    ".raster_store": ["create_raster_store", "RasterStore", "RasterStatistics"],
+
+    # Data loading functions
+    ".vector_loader": ["load_from_wfs"],
+    ".wfs_cache": ["WFSResponseCache"],
+})
 
 # Exception classes
 from ..core.exceptions import (
@@ -38,15 +57,35 @@ __all__ = [
 
     # Vector dataset implementations
     "InMemoryVectorDataset", "LocalVectorDataset", "WFSVectorDataset",
+    "ParquetVectorDataset",
 
     # Raster dataset implementations
-    "LocalRasterDataset", "InMemoryRasterDataset",
+    "LocalRasterDataset", "MosaicRasterDataset", "MemmapRasterDataset",
+    "RasterStoreDataset", "InMemoryRasterDataset",
 
     # Factory function
     "initialize_geo_dataset",
 
+    # Spatially indexed vector store
+    "create_vector_store", "read_vector_store", "row_group_bounds",
+
+    # Cache of decoded raster blocks
+    "RasterBlockCache", "raster_block_cache",
+
+    # GeoTIFF output
+    "write_geotiff",
+
+    # Mosaics of raster tiles
+    "TileIndex", "find_tiles",
+
+    # Memory-mapped rasters
+    "write_memmap_raster", "convert_to_memmap_raster", "open_memmap_raster",
+
+    # Chunked raster store with precomputed statistics
+    "create_raster_store", "RasterStore", "RasterStatistics",
+
     # Data loading functions
-    "load_from_wfs",
+    "load_from_wfs", "WFSResponseCache",
 
     # Exception classes
     "WFSError", "WFSConnectionError",
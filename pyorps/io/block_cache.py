@@ -0,0 +1,105 @@
+"""
+Block-level cache of decoded raster blocks.
+
+GeoTIFF files are stored in blocks (tiles or strips), which are decompressed as a
+whole whenever a pixel of them is read. Batches of routes on the same raster read
+overlapping search windows and decode the same blocks again and again. The
+RasterBlockCache keeps the decoded blocks, keyed by file, band and block position,
+within a memory budget and assembles windows by copying from the cached blocks. Only
+the blocks missing in the cache are read from the file.
+"""
+import os
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.windows import Window
+
+from pyorps.utils.caching import MemoryCache
+
+
+class RasterBlockCache(MemoryCache):
+    """
+    Least recently used cache of the decoded blocks of raster files.
+
+    The keys contain the modification time and the size of the file, so blocks of a
+    file that has been rewritten are not reused.
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 28):
+        """
+        Parameters:
+            max_bytes: Memory budget of all cached blocks in bytes
+        """
+        super().__init__(max_bytes)
+
+    def read_window(self,
+                    path: str,
+                    window: Window,
+                    indexes: Optional[Union[int, Sequence[int]]] = None
+                    ) -> np.ndarray:
+        """
+        Read a window of a raster file from the cached blocks. Missing blocks are read
+        from the file and added to the cache. Like rasterio's read, the window is
+        clipped to the extent of the raster.
+
+        Parameters:
+            path: Path of the raster file
+            window: The window to read
+            indexes: Bands to read (1-based). If None, all bands are read.
+
+        Returns:
+            Array of shape (bands, height, width) of the clipped window
+        """
+        stat = os.stat(path)
+        file_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+        with rio_open(path) as src:
+            row_off = min(max(int(window.row_off), 0), src.height)
+            col_off = min(max(int(window.col_off), 0), src.width)
+            height = max(min(int(window.row_off + window.height), src.height) - row_off,
+                         0)
+            width = max(min(int(window.col_off + window.width), src.width) - col_off, 0)
+            if indexes is None:
+                indexes = src.indexes
+            elif isinstance(indexes, int):
+                indexes = [indexes]
+            data = np.empty((len(indexes), height, width),
+                            dtype=src.dtypes[indexes[0] - 1])
+
+            for i, band in enumerate(indexes):
+                block_height, block_width = src.block_shapes[band - 1]
+                for block_row in range(row_off // block_height,
+                                       (row_off + height - 1) // block_height + 1):
+                    for block_col in range(col_off // block_width,
+                                           (col_off + width - 1) // block_width + 1):
+                        key = (*file_key, band, block_row, block_col)
+                        block = self.get(key)
+                        if block is None:
+                            block = src.read(band, window=src.block_window(
+                                band, block_row, block_col))
+                            self.put(key, block, block.nbytes)
+
+                        # Copy the overlap of the block and the window
+                        top, left = block_row * block_height, block_col * block_width
+                        r0, r1 = max(row_off, top), min(row_off + height,
+                                                        top + block.shape[0])
+                        c0, c1 = max(col_off, left), min(col_off + width,
+                                                         left + block.shape[1])
+                        rows = slice(r0 - row_off, r1 - row_off)
+                        cols = slice(c0 - col_off, c1 - col_off)
+                        data[i, rows, cols] = block[r0 - top:r1 - top,
+                                                    c0 - left:c1 - left]
+        return data
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of the block requests answered from the cache.
+        """
+        requests = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / requests if requests else 0.0
+
+
+# Block cache shared by all raster datasets of the process, which enable it
+raster_block_cache = RasterBlockCache()
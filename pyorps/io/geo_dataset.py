@@ -1,16 +1,21 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from os.path import splitext, isfile
 from typing import Union, Optional, Any
 
 import geopandas as gpd
-from numpy import ndarray, dtype
+from numpy import ndarray, dtype, iinfo, finfo
+from rasterio.crs import CRS
+from rasterio.enums import Resampling
 from rasterio.transform import Affine
 from rasterio import open as rio_open
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
 
-# Changed from flat import to relative import from the same io module
-from .vector_loader import load_from_wfs
 # Changed to relative import from the core module
 from ..core.types import BboxType, InputDataType, GeometryMaskType
+from .mosaic import is_mosaic_source
+from .raster_store import is_raster_store
 
 
 class GeoDataset(ABC):
@@ -142,13 +147,16 @@ class WFSVectorDataset(LocalVectorDataset):
                              f"\nPlease provide a dictionary with a valid 'url' and "
                              f"'layer' key-value pairs!")
         else:
+            # Deferred, so that local datasets do not import the WFS client stack
+            from .vector_loader import load_from_wfs
 
             self.data = load_from_wfs(
                 url=self.file_source["url"],
                 layer=self.file_source["layer"],
                 bbox=self.bbox,
                 filter_params=kwargs.get("filter_params"),
-                auto_match=kwargs.get("auto_match", True)
+                auto_match=kwargs.get("auto_match", True),
+                cache=kwargs.get("cache")
             )
         self.post_loading()
 
@@ -160,17 +168,147 @@ class WFSVectorDataset(LocalVectorDataset):
             self.data = self.data.clip(self.mask, keep_geom_type=True)
 
 
+class ParquetVectorDataset(LocalVectorDataset):
+    """
+    Vector dataset in a GeoParquet vector store (see create_vector_store). Only the
+    row groups intersecting the bbox or mask and only the requested columns are read.
+    Further keyword arguments of load_data are passed to read_vector_store.
+    """
+    def load_data(self, columns: Optional[list[str]] = None, **kwargs):
+        from .vector_store import read_vector_store, total_bounds
+
+        region = self.bbox if self.bbox is not None else self.mask
+        bounds = total_bounds(region) if region is not None else None
+        self.data = read_vector_store(self.file_source, bounds=bounds, columns=columns,
+                                      **kwargs)
+        if self.bbox is None and self.mask is not None:
+            mask = self.mask
+            if isinstance(mask, (gpd.GeoDataFrame, gpd.GeoSeries)):
+                mask = mask.union_all()
+            self.data = self.data.loc[self.data.intersects(mask)].reset_index(drop=True)
+        self.post_loading()
+
+
 class RasterDataset(GeoDataset, ABC):
     crs: str
     transform: Affine
     shape: tuple[int, int]
     count: int
     dtype: dtype
+    # Crs given by the user, which must match the crs of sources that cannot be
+    # reprojected on the fly
+    target_crs: Optional[str] = None
+
+    def check_target_crs(self, source_crs: Any) -> None:
+        """
+        Check that the target crs equals the crs of a source, which cannot be
+        reprojected on the fly.
+
+        Parameters:
+            source_crs: The crs of the source
+
+        Raises:
+            ValueError: If a target crs is given, which differs from the crs of the
+                source
+        """
+        if (self.target_crs is not None and source_crs is not None and
+                CRS.from_user_input(self.target_crs) !=
+                CRS.from_user_input(source_crs)):
+            raise ValueError(f"{type(self).__name__} cannot reproject "
+                             f"{self.file_source} from {source_crs} to "
+                             f"{self.target_crs}. Please reproject the source or do "
+                             f"not pass a crs.")
 
 
 class LocalRasterDataset(RasterDataset):
-    def load_data(self, **kwargs):
+    """
+    Raster dataset of a local raster file. If the given crs differs from the crs of
+    the file, the raster is reprojected on the fly through a WarpedVRT with nearest
+    neighbour resampling, which keeps the cost categories. Windows read with
+    read_window then only warp the pixels of the window.
+    """
+    read_kwargs: Optional[dict[str, Any]] = None
+    # RasterBlockCache (see pyorps.io.block_cache) used by read_window
+    block_cache: Optional[Any] = None
+    # Whether the raster is reprojected on the fly
+    is_warped: bool = False
+
+    def __init__(self,
+                 file_source: Any,
+                 crs: Optional[str] = None):
+        super().__init__(file_source, crs)
+        # The crs attribute is replaced by the crs of the file when it is loaded
+        self.target_crs = crs
+
+    @contextmanager
+    def open(self):
+        """
+        Open the raster file, reprojected to the target crs if it differs from the
+        crs of the file.
+
+        Returns:
+            Context manager of the rasterio dataset or WarpedVRT
+        """
         with rio_open(self.file_source) as src:
+            if (self.target_crs is None or src.crs is None or
+                    CRS.from_user_input(self.target_crs) == src.crs):
+                yield src
+                return
+            # Pixels outside the source raster get the highest (forbidden) cost,
+            # unless the file defines a nodata value
+            nodata = src.nodata
+            if nodata is None:
+                data_type = dtype(src.dtypes[0])
+                nodata = iinfo(data_type).max if data_type.kind in "ui" else \
+                    finfo(data_type).max
+            with WarpedVRT(src, crs=self.target_crs, resampling=Resampling.nearest,
+                           nodata=nodata) as vrt:
+                yield vrt
+
+    def load_metadata(self, **kwargs):
+        """
+        Read crs, transform, shape, count and dtype without reading the raster data.
+        The data of a window can then be read with read_window.
+
+        Parameters:
+            **kwargs: Keyword arguments of rasterio's read used by read_window (e.g.
+                indexes to select the bands)
+        """
+        self.read_kwargs = kwargs
+        with self.open() as src:
+            self.is_warped = isinstance(src, WarpedVRT)
+            indexes = kwargs.get("indexes", src.indexes)
+            if not isinstance(indexes, (list, tuple)):
+                indexes = [indexes]
+            self.crs = src.crs
+            self.transform = src.transform
+            self.count = len(indexes)
+            self.shape = (src.height, src.width)
+            self.dtype = dtype(src.dtypes[indexes[0] - 1])
+
+    def read_window(self, window: Window) -> ndarray:
+        """
+        Read the data of a window of the raster file. If a block cache is set, the
+        window is assembled from the cached blocks of the file.
+
+        Parameters:
+            window: The window to read
+
+        Returns:
+            Array of shape (bands, height, width)
+        """
+        read_kwargs = self.read_kwargs or {}
+        if (self.block_cache is not None and set(read_kwargs) <= {"indexes"} and
+                not self.is_warped):
+            return self.block_cache.read_window(self.file_source, window,
+                                                read_kwargs.get("indexes"))
+        with self.open() as src:
+            data = src.read(window=window, **read_kwargs)
+        return data if data.ndim == 3 else data[None]
+
+    def load_data(self, **kwargs):
+        with self.open() as src:
+            self.is_warped = isinstance(src, WarpedVRT)
             self.data = src.read(**kwargs)
             self.crs = src.crs
             self.transform = src.transform
@@ -187,6 +325,134 @@ class LocalRasterDataset(RasterDataset):
             self.dtype = self.data.dtype
 
 
+class MosaicRasterDataset(LocalRasterDataset):
+    """
+    Raster dataset of many tiles, given as a directory, a glob pattern, a VRT file or
+    a list of raster files (see pyorps.io.mosaic). The footprints of the tiles are
+    indexed in an R-tree and windows only read the tiles they intersect, in parallel
+    threads. The tiles are not reprojected, so a crs differing from the crs of the
+    tiles raises a ValueError.
+    """
+    tile_index: Optional[Any] = None
+    nodata: Optional[float] = None
+
+    def __init__(self,
+                 file_source: Any,
+                 crs: Optional[str] = None,
+                 max_workers: int = 8):
+        super().__init__(file_source, crs)
+        self.max_workers = max_workers
+
+    def load_metadata(self, **kwargs):
+        from .mosaic import TileIndex, find_tiles
+
+        self.read_kwargs = kwargs
+        if self.tile_index is None:
+            self.tile_index = TileIndex(find_tiles(self.file_source))
+        self.check_target_crs(self.tile_index.crs)
+        indexes = kwargs.get("indexes", list(range(1, self.tile_index.count + 1)))
+        self.crs = self.tile_index.crs
+        self.transform = self.tile_index.transform
+        self.count = 1 if isinstance(indexes, int) else len(indexes)
+        self.shape = self.tile_index.shape
+        self.dtype = self.tile_index.dtype
+        self.nodata = self.tile_index.nodata
+
+    def read_window(self, window: Window) -> ndarray:
+        if self.tile_index is None:
+            self.load_metadata()
+        return self.tile_index.read_window(window,
+                                           (self.read_kwargs or {}).get("indexes"),
+                                           max_workers=self.max_workers,
+                                           block_cache=self.block_cache)
+
+    def load_data(self, **kwargs):
+        self.load_metadata(**kwargs)
+        self.data = self.read_window(Window(0, 0, self.shape[1], self.shape[0]))
+
+
+class RasterStoreDataset(LocalRasterDataset):
+    """
+    Raster dataset of a chunked raster store (see pyorps.io.raster_store). Windows are
+    assembled from the memory-mapped chunks and the precomputed statistics of the
+    raster are available as statistics without reading the raster. The store is not
+    reprojected, so a crs differing from the crs of the store raises a ValueError.
+    """
+    store: Optional[Any] = None
+    statistics: Optional[Any] = None
+    nodata: Optional[float] = None
+
+    def load_metadata(self, **kwargs):
+        from .raster_store import RasterStore
+
+        self.read_kwargs = kwargs
+        if self.store is None:
+            self.store = RasterStore(self.file_source)
+        self.check_target_crs(self.store.crs)
+        indexes = kwargs.get("indexes", list(range(1, self.store.count + 1)))
+        self.crs = self.store.crs
+        self.transform = self.store.transform
+        self.count = 1 if isinstance(indexes, int) else len(indexes)
+        self.shape = self.store.shape
+        self.dtype = self.store.dtype
+        self.nodata = self.store.nodata
+        # Band 1 of the statistics belongs to the first selected band
+        self.statistics = self.store.statistics.select_bands(indexes)
+
+    def read_window(self, window: Window) -> ndarray:
+        if self.store is None:
+            self.load_metadata()
+        return self.store.read_window(window, (self.read_kwargs or {}).get("indexes"))
+
+    def load_data(self, **kwargs):
+        self.load_metadata(**kwargs)
+        self.data = self.read_window(Window(0, 0, self.shape[1], self.shape[0]))
+
+
+class MemmapRasterDataset(RasterDataset):
+    """
+    Raster dataset, whose data is memory-mapped from a .npy file in the pyorps raster
+    format or from an uncompressed GeoTIFF (see pyorps.io.memmap_raster). The data is
+    a read-only view of the file, so windows of the raster are not copied and all
+    processes share the pages of the file.
+    """
+    nodata: Optional[float] = None
+
+    def __init__(self,
+                 file_source: Any,
+                 crs: Optional[str] = None,
+                 transform: Optional[Affine] = None):
+        super().__init__(file_source, crs)
+        self.target_crs = crs
+        self.transform = transform
+
+    def load_data(self, indexes: Optional[Union[int, list[int]]] = None, **kwargs):
+        from .memmap_raster import open_memmap_raster
+
+        data, metadata = open_memmap_raster(self.file_source)
+        if indexes is not None:
+            bands = [indexes] if isinstance(indexes, int) else list(indexes)
+            first = bands[0] - 1
+            if bands == list(range(bands[0], bands[0] + len(bands))):
+                # Consecutive bands are selected without copying
+                data = data[first:first + len(bands)]
+            else:
+                data = data[[band - 1 for band in bands]]
+        self.check_target_crs(metadata["crs"])
+        self.data = data
+        # Rasters without a crs in their sidecar file or GeoTIFF get the given crs
+        self.crs = metadata["crs"] if metadata["crs"] is not None else self.target_crs
+        self.transform = self.transform or metadata["transform"]
+        if self.transform is None:
+            raise ValueError(f"No transform found for {self.file_source}. Please "
+                             f"provide a transform or write a sidecar file with "
+                             f"write_memmap_raster.")
+        self.nodata = metadata["nodata"]
+        self.count = data.shape[0]
+        self.shape = (data.shape[1], data.shape[2])
+        self.dtype = data.dtype
+
+
 class InMemoryRasterDataset(RasterDataset):
     def __init__(self,
                  file_source: Any,
@@ -278,15 +544,21 @@ def _determine_data_type(file_source: Any) -> str:
             and "layer" in file_source):
         return "vector"
 
+    # Check for chunked raster stores and mosaics of raster tiles (directory, glob
+    # pattern, VRT or file list)
+    if is_raster_store(file_source) or is_mosaic_source(file_source):
+        return "raster"
+
     # Check file extension for local files
     if isinstance(file_source, str):
         if isfile(file_source):
             ext = splitext(file_source)[1].lower()
             # Vector file extensions
-            if ext in [".shp", ".geojson", ".json", ".gpkg", ".gml", ".kml"]:
+            if ext in [".shp", ".geojson", ".json", ".gpkg", ".gml", ".kml",
+                       ".parquet", ".geoparquet"]:
                 return "vector"
             # Raster file extensions
-            elif ext in [".tif", ".tiff", ".jp2", ".img", ".bil", ".dem"]:
+            elif ext in [".tif", ".tiff", ".jp2", ".img", ".bil", ".dem", ".npy"]:
                 return "raster"
         else:
             raise FileNotFoundError(f"File {file_source} not found.")
@@ -308,6 +580,11 @@ def _create_vector_dataset(file_source: Any,
           "layer" in file_source):
         return WFSVectorDataset(file_source, crs, bbox=bbox, mask=mask)
 
+    # GeoParquet vector store
+    elif isinstance(file_source, str) and \
+            splitext(file_source)[1].lower() in [".parquet", ".geoparquet"]:
+        return ParquetVectorDataset(file_source, crs, bbox=bbox, mask=mask)
+
     # Local file
     elif isinstance(file_source, str):
         return LocalVectorDataset(file_source, crs, bbox=bbox, mask=mask)
@@ -327,6 +604,22 @@ def _create_raster_dataset(file_source: Any,
                              "InMemoryRasterDataset")
         return InMemoryRasterDataset(file_source, crs, transform=transform)
 
+    # Raster dataset that has already been created (e.g. a MemmapRasterDataset)
+    elif isinstance(file_source, RasterDataset):
+        return file_source
+
+    # Chunked raster store
+    elif is_raster_store(file_source):
+        return RasterStoreDataset(file_source, crs)
+
+    # Mosaic of raster tiles
+    elif is_mosaic_source(file_source):
+        return MosaicRasterDataset(file_source, crs)
+
+    # Memory-mapped raster in the pyorps raster format
+    elif isinstance(file_source, str) and splitext(file_source)[1].lower() == ".npy":
+        return MemmapRasterDataset(file_source, crs, transform=transform)
+
     # Local file
     elif isinstance(file_source, str):
         return LocalRasterDataset(file_source, crs)
@@ -0,0 +1,236 @@
+"""
+Memory-mapped raster files.
+
+A memory-mapped raster is not read into memory. Its pixels are mapped into the address
+space of the process and loaded from the page cache of the operating system when they
+are accessed. Windows of the raster are views without copies, and all processes using
+the same file share its pages instead of holding their own copy of the raster.
+
+Two formats can be mapped:
+
+1. The pyorps raster format: a .npy file with the pixels in the shape (bands, height,
+   width) and a JSON sidecar file "<name>.npy.json" with crs, transform and nodata.
+   write_memmap_raster and convert_to_memmap_raster create these files.
+2. Uncompressed, striped GeoTIFF files, whose strips are stored contiguously (e.g.
+   written by rasterio or gdal_translate without compression and tiling).
+"""
+import json
+import struct
+from os.path import splitext
+from typing import Any, Optional
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.crs import CRS
+from rasterio.transform import Affine
+
+# TIFF tags needed to locate the pixels of a striped GeoTIFF
+_STRIP_OFFSETS = 273
+_STRIP_BYTE_COUNTS = 279
+
+# Formats of the TIFF field types (type id: (struct format, size in bytes))
+_TIFF_TYPES = {1: ("B", 1), 3: ("H", 2), 4: ("I", 4), 16: ("Q", 8)}
+
+
+def sidecar_path(path: str) -> str:
+    """
+    Return the path of the JSON sidecar file of a pyorps raster file.
+
+    Parameters:
+        path: Path of the .npy file
+
+    Returns:
+        Path of the sidecar file
+    """
+    return f"{path}.json"
+
+
+def write_memmap_raster(
+        path: str,
+        data: np.ndarray,
+        crs: Any,
+        transform: Affine,
+        nodata: Optional[float] = None
+) -> None:
+    """
+    Write a raster in the pyorps raster format, which can be memory-mapped.
+
+    Parameters:
+        path: Path of the .npy file
+        data: Raster of shape (bands, height, width) or (height, width)
+        crs: Coordinate reference system of the raster
+        transform: Affine transformation of the raster
+        nodata: No data value of the raster
+    """
+    if data.ndim == 2:
+        data = data[None]
+    np.save(path, np.ascontiguousarray(data), allow_pickle=False)
+    _write_sidecar(path, crs, transform, nodata)
+
+
+def convert_to_memmap_raster(source: str, path: str) -> None:
+    """
+    Convert a raster file that rasterio can read into the pyorps raster format. The
+    raster is copied block by block and never held in memory completely.
+
+    Parameters:
+        source: Path of the raster file
+        path: Path of the .npy file
+    """
+    with rio_open(source) as src:
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=src.dtypes[0],
+                                         shape=(src.count, src.height, src.width))
+        for _, window in src.block_windows(1):
+            rows, cols = window.toslices()
+            data[:, rows, cols] = src.read(window=window)
+        data.flush()
+        del data
+        _write_sidecar(path, src.crs, src.transform, src.nodata)
+
+
+def open_memmap_raster(path: str) -> tuple[np.ndarray, dict[str, Any]]:
+    """
+    Memory-map a raster in the pyorps raster format or an uncompressed GeoTIFF.
+
+    Parameters:
+        path: Path of the .npy file or the GeoTIFF file
+
+    Returns:
+        Read-only array of shape (bands, height, width), which is backed by the file,
+        and a dictionary with crs, transform and nodata of the raster
+
+    Raises:
+        ValueError: If the raster can not be memory-mapped
+    """
+    if splitext(path)[1].lower() == ".npy":
+        data = np.load(path, mmap_mode="r", allow_pickle=False)
+        if data.ndim == 2:
+            data = data[None]
+        try:
+            with open(sidecar_path(path)) as f:
+                sidecar = json.load(f)
+        except FileNotFoundError:
+            metadata = {"crs": None, "transform": None, "nodata": None}
+        else:
+            metadata = {
+                "crs": CRS.from_user_input(sidecar["crs"]) if sidecar["crs"] else None,
+                "transform": Affine(*sidecar["transform"][:6]),
+                "nodata": sidecar.get("nodata"),
+            }
+        return data, metadata
+    return _memmap_geotiff(path)
+
+
+def _write_sidecar(path: str, crs: Any, transform: Affine,
+                   nodata: Optional[float]) -> None:
+    """Write the JSON sidecar file with the georeferencing of a raster."""
+    sidecar = {
+        "crs": CRS.from_user_input(crs).to_wkt() if crs is not None else None,
+        "transform": list(transform)[:6],
+        "nodata": None if nodata is None else float(nodata),
+    }
+    with open(sidecar_path(path), "w") as f:
+        json.dump(sidecar, f)
+
+
+def _memmap_geotiff(path: str) -> tuple[np.ndarray, dict[str, Any]]:
+    """
+    Memory-map the pixels of an uncompressed, striped GeoTIFF.
+
+    Parameters:
+        path: Path of the GeoTIFF file
+
+    Returns:
+        Read-only array of shape (bands, height, width) and a dictionary with crs,
+        transform and nodata of the raster
+
+    Raises:
+        ValueError: If the GeoTIFF is compressed, tiled or its strips are not stored
+            contiguously
+    """
+    with rio_open(path) as src:
+        if src.driver != "GTiff":
+            raise ValueError(f"{path} is not a GeoTIFF file.")
+        if src.compression is not None:
+            raise ValueError(f"{path} is compressed ({src.compression.value}) and can "
+                             f"not be memory-mapped.")
+        if src.profile.get("tiled", False):
+            raise ValueError(f"{path} is tiled and can not be memory-mapped.")
+        if len(set(src.dtypes)) > 1:
+            raise ValueError(f"The bands of {path} have different data types.")
+        count, height, width = src.count, src.height, src.width
+        band_interleaved = count > 1 and src.interleaving.name == "band"
+        metadata = {"crs": src.crs, "transform": src.transform, "nodata": src.nodata}
+        data_type = np.dtype(src.dtypes[0])
+
+    byte_order, offsets, byte_counts = _read_strip_layout(path)
+    data_type = data_type.newbyteorder(byte_order)
+    # The strips must follow each other without gaps to form a single array
+    expected = offsets[0] + np.concatenate(([0], np.cumsum(byte_counts[:-1])))
+    size = count * height * width * data_type.itemsize
+    if not np.array_equal(offsets, expected) or int(byte_counts.sum()) != size:
+        raise ValueError(f"The strips of {path} are not stored contiguously and can "
+                         f"not be memory-mapped.")
+
+    if band_interleaved:
+        data = np.memmap(path, dtype=data_type, mode="r", offset=int(offsets[0]),
+                         shape=(count, height, width))
+    else:
+        data = np.memmap(path, dtype=data_type, mode="r", offset=int(offsets[0]),
+                         shape=(height, width, count)).transpose(2, 0, 1)
+    return data, metadata
+
+
+def _read_strip_layout(path: str) -> tuple[str, np.ndarray, np.ndarray]:
+    """
+    Read the byte order, the strip offsets and the strip byte counts of the first
+    image of a (Big)TIFF file.
+
+    Parameters:
+        path: Path of the TIFF file
+
+    Returns:
+        Byte order ("<" or ">"), strip offsets and strip byte counts
+    """
+    with open(path, "rb") as f:
+        header = f.read(16)
+        byte_order = {b"II": "<", b"MM": ">"}.get(header[:2])
+        if byte_order is None:
+            raise ValueError(f"{path} is not a TIFF file.")
+        version = struct.unpack(f"{byte_order}H", header[2:4])[0]
+        if version == 42:
+            ifd_offset = struct.unpack(f"{byte_order}I", header[4:8])[0]
+            count_format, pointer_format, inline_size = "H", "I", 4
+        elif version == 43:
+            ifd_offset = struct.unpack(f"{byte_order}Q", header[8:16])[0]
+            count_format, pointer_format, inline_size = "Q", "Q", 8
+        else:
+            raise ValueError(f"{path} is not a TIFF file.")
+
+        f.seek(ifd_offset)
+        count_size = struct.calcsize(count_format)
+        n_entries = struct.unpack(f"{byte_order}{count_format}", f.read(count_size))[0]
+        # Tag, field type, number of values and the values or a pointer to them
+        entry_size = 4 + 2 * inline_size
+        entries = f.read(n_entries * entry_size)
+
+        values = {}
+        for i in range(n_entries):
+            entry = entries[i * entry_size:(i + 1) * entry_size]
+            tag, field_type, n_values = struct.unpack(
+                f"{byte_order}HH{pointer_format}", entry[:4 + inline_size])
+            if tag not in (_STRIP_OFFSETS, _STRIP_BYTE_COUNTS):
+                continue
+            value_format, value_size = _TIFF_TYPES[field_type]
+            raw = entry[4 + inline_size:]
+            if n_values * value_size > inline_size:
+                pointer = struct.unpack(f"{byte_order}{pointer_format}", raw)[0]
+                f.seek(pointer)
+                raw = f.read(n_values * value_size)
+            values[tag] = np.array(struct.unpack(
+                f"{byte_order}{n_values}{value_format}", raw[:n_values * value_size]),
+                dtype=np.int64)
+
+    if _STRIP_OFFSETS not in values or _STRIP_BYTE_COUNTS not in values:
+        raise ValueError(f"{path} is not a striped TIFF file.")
+    return byte_order, values[_STRIP_OFFSETS], values[_STRIP_BYTE_COUNTS]
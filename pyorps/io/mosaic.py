@@ -0,0 +1,219 @@
+"""
+Virtual mosaics of raster tiles.
+
+Land-use and cost rasters are often published as many tiles. A TileIndex reads the
+footprints of all tiles of a directory, a glob pattern, a list of files or the sources
+of a GDAL VRT file and indexes them in an R-tree (shapely STRtree) on the pixel grid
+of the mosaic. A window of the mosaic is then assembled from the tiles it intersects,
+which are read in parallel threads. The tiles are never merged into a single file.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob, has_magic
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+from defusedxml import ElementTree
+from rasterio import open as rio_open
+from rasterio.transform import Affine
+from rasterio.windows import Window
+from shapely import STRtree, box
+
+# File extensions of tiles in mosaic directories
+TILE_EXTENSIONS = (".tif", ".tiff", ".jp2", ".img", ".bil", ".dem")
+
+
+def is_mosaic_source(file_source: Any) -> bool:
+    """
+    Return whether a source describes a mosaic: a directory, a glob pattern, a VRT
+    file or a list of raster files.
+
+    Parameters:
+        file_source: The source of the dataset
+
+    Returns:
+        True for mosaic sources
+    """
+    if isinstance(file_source, (list, tuple)):
+        return len(file_source) > 0 and all(isinstance(f, str) for f in file_source)
+    if not isinstance(file_source, str):
+        return False
+    return (os.path.isdir(file_source) or file_source.lower().endswith(".vrt") or
+            (has_magic(file_source) and not os.path.isfile(file_source)))
+
+
+def find_tiles(file_source: Union[str, Sequence[str]]) -> list[str]:
+    """
+    Return the tile files of a mosaic source.
+
+    Parameters:
+        file_source: Directory, glob pattern, VRT file or list of raster files
+
+    Returns:
+        Paths of the tiles
+
+    Raises:
+        FileNotFoundError: If the source does not contain any tiles
+    """
+    if isinstance(file_source, (list, tuple)):
+        tiles = list(file_source)
+    elif file_source.lower().endswith(".vrt"):
+        tiles = vrt_source_files(file_source)
+    elif os.path.isdir(file_source):
+        tiles = sorted(os.path.join(file_source, name)
+                       for name in os.listdir(file_source)
+                       if name.lower().endswith(TILE_EXTENSIONS))
+    else:
+        tiles = sorted(glob(file_source, recursive=True))
+    if not tiles:
+        raise FileNotFoundError(f"No raster tiles found for {file_source}.")
+    return tiles
+
+
+def vrt_source_files(vrt_path: str) -> list[str]:
+    """
+    Return the source files of a GDAL VRT mosaic in the order of their appearance.
+
+    Parameters:
+        vrt_path: Path of the VRT file
+
+    Returns:
+        Paths of the source files (relative paths are resolved against the VRT file)
+    """
+    root = ElementTree.parse(vrt_path).getroot()
+    directory = os.path.dirname(os.path.abspath(vrt_path))
+    files = []
+    for element in root.iter("SourceFilename"):
+        path = element.text.strip()
+        if element.get("relativeToVRT", "0") == "1":
+            path = os.path.join(directory, path)
+        if path not in files:
+            files.append(path)
+    return files
+
+
+class TileIndex:
+    """
+    R-tree of the footprints of the tiles of a mosaic on the pixel grid of the mosaic.
+
+    All tiles must share crs, resolution, data type and band count, and must be
+    aligned to the same pixel grid.
+    """
+
+    def __init__(self, tiles: Sequence[str]):
+        """
+        Parameters:
+            tiles: Paths of the tiles
+        """
+        self.tiles = list(tiles)
+        bounds = []
+        for i, path in enumerate(self.tiles):
+            with rio_open(path) as src:
+                if i == 0:
+                    self.crs = src.crs
+                    self.resolution = src.res
+                    self.count = src.count
+                    self.dtype = np.dtype(src.dtypes[0])
+                    self.nodata = src.nodata
+                elif (src.crs != self.crs or src.count != self.count or
+                      np.dtype(src.dtypes[0]) != self.dtype or
+                      not np.allclose(src.res, self.resolution)):
+                    raise ValueError(f"Tile {path} does not match the crs, resolution, "
+                                     f"data type or band count of {self.tiles[0]}.")
+                bounds.append(tuple(src.bounds))
+        bounds = np.array(bounds)
+
+        res_x, res_y = self.resolution
+        left, top = bounds[:, 0].min(), bounds[:, 3].max()
+        self.transform = Affine(res_x, 0.0, left, 0.0, -res_y, top)
+
+        # Pixel offsets and sizes of the tiles in the mosaic
+        cols = (bounds[:, 0] - left) / res_x
+        rows = (top - bounds[:, 3]) / res_y
+        widths = (bounds[:, 2] - bounds[:, 0]) / res_x
+        heights = (bounds[:, 3] - bounds[:, 1]) / res_y
+        pixels = np.stack([rows, cols, heights, widths], axis=1)
+        self.pixel_windows = np.round(pixels).astype(np.int64)
+        if not np.allclose(pixels, self.pixel_windows, atol=1e-3):
+            raise ValueError("The tiles are not aligned to a common pixel grid.")
+
+        rows, cols, heights, widths = self.pixel_windows.T
+        self.shape = (int((rows + heights).max()), int((cols + widths).max()))
+        self.tree = STRtree(box(cols, rows, cols + widths, rows + heights))
+
+    def query(self, window: Window) -> list[int]:
+        """
+        Return the indices of the tiles overlapping a window of the mosaic.
+
+        Parameters:
+            window: Window of the mosaic
+
+        Returns:
+            Sorted indices of the tiles
+        """
+        col_off, row_off = window.col_off, window.row_off
+        candidates = self.tree.query(box(col_off, row_off, col_off + window.width,
+                                         row_off + window.height))
+        result = []
+        for i in sorted(candidates):
+            row, col, height, width = self.pixel_windows[i]
+            if (row < row_off + window.height and row + height > row_off and
+                    col < col_off + window.width and col + width > col_off):
+                result.append(int(i))
+        return result
+
+    def read_window(self,
+                    window: Window,
+                    indexes: Optional[Union[int, Sequence[int]]] = None,
+                    max_workers: int = 8,
+                    block_cache: Optional[Any] = None) -> np.ndarray:
+        """
+        Read a window of the mosaic from the tiles it overlaps. Pixels not covered by
+        a tile are set to the nodata value of the tiles or, if the tiles have no nodata
+        value, to the maximum of the data type, so that gaps between the tiles are
+        forbidden. Where tiles overlap, the later tile of the index wins.
+
+        Parameters:
+            window: Window of the mosaic
+            indexes: Bands to read (1-based). If None, all bands are read.
+            max_workers: Number of threads reading tiles in parallel
+            block_cache: RasterBlockCache used to read the tiles
+
+        Returns:
+            Array of shape (bands, height, width)
+        """
+        if indexes is None:
+            indexes = list(range(1, self.count + 1))
+        elif isinstance(indexes, int):
+            indexes = [indexes]
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        fill = self.nodata
+        if fill is None:
+            data_type = np.dtype(self.dtype)
+            fill = (np.iinfo(data_type).max if data_type.kind in "ui" else
+                    np.finfo(data_type).max)
+        data = np.full((len(indexes), height, width), fill, dtype=self.dtype)
+
+        def read_tile(i: int) -> tuple[tuple[slice, slice], np.ndarray]:
+            row, col, tile_height, tile_width = self.pixel_windows[i]
+            r0, r1 = max(row_off, row), min(row_off + height, row + tile_height)
+            c0, c1 = max(col_off, col), min(col_off + width, col + tile_width)
+            tile_window = Window(c0 - col, r0 - row, c1 - c0, r1 - r0)
+            if block_cache is not None:
+                tile_data = block_cache.read_window(self.tiles[i], tile_window, indexes)
+            else:
+                with rio_open(self.tiles[i]) as src:
+                    tile_data = src.read(indexes, window=tile_window)
+            target = (slice(r0 - row_off, r1 - row_off),
+                      slice(c0 - col_off, c1 - col_off))
+            return target, tile_data
+
+        tiles = self.query(window)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tiles)))) \
+                as executor:
+            # map keeps the order of the tiles, so overlaps are resolved
+            # deterministically
+            for (rows, cols), tile_data in executor.map(read_tile, tiles):
+                data[:, rows, cols] = tile_data
+        return data
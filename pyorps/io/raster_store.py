@@ -0,0 +1,411 @@
+"""
+Chunked raster store with precomputed statistics.
+
+A raster store is a directory with the raster split into square chunks, each stored as
+a memory-mappable .npy file, and a sidecar file "store.json" with the georeferencing
+and the statistics of the raster:
+
+- global minimum and maximum of every band
+- the sorted cost categories (unique values) of every band of integer rasters
+- the number of forbidden cells (cells with the forbidden value) of every band
+- minimum and maximum of every chunk, which bound the values of any window
+- the decimation factors of the pyramid levels, which are stored as .npy files with
+  the minimum of every block of cells (a lower bound of the costs for coarse routing)
+
+The statistics are computed once while the store is created, so consumers read them
+from RasterStatistics without scanning the raster again.
+
+    store/
+        store.json
+        chunks/<row>_<col>.npy
+        pyramid/<factor>.npy
+"""
+import json
+import os
+from typing import Any, Optional, Union
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.crs import CRS
+from rasterio.transform import Affine
+from rasterio.windows import Window
+
+from pyorps.io.raster_writer import overview_factors
+
+# Name of the sidecar file of a raster store
+STORE_FILE = "store.json"
+
+# Unique values are only kept for rasters with at most this many categories
+MAX_CATEGORIES = 4096
+
+
+def is_raster_store(path: Any) -> bool:
+    """
+    Return whether a path is the directory of a raster store.
+
+    Parameters:
+        path: The path to check
+
+    Returns:
+        True if the directory contains a store.json sidecar file
+    """
+    return isinstance(path, str) and os.path.isfile(os.path.join(path, STORE_FILE))
+
+
+class RasterStatistics:
+    """
+    Precomputed statistics of a raster store.
+    """
+
+    def __init__(self,
+                 minimum: np.ndarray,
+                 maximum: np.ndarray,
+                 categories: Optional[list[np.ndarray]],
+                 forbidden_value: Optional[float],
+                 forbidden_count: np.ndarray,
+                 chunk_size: int,
+                 chunk_min: np.ndarray,
+                 chunk_max: np.ndarray,
+                 pyramid_factors: list[int]):
+        """
+        Parameters:
+            minimum: Minimum of every band
+            maximum: Maximum of every band
+            categories: Sorted unique values of every band or None if the raster is
+                not categorical
+            forbidden_value: Value of forbidden cells
+            forbidden_count: Number of forbidden cells of every band
+            chunk_size: Width and height of the chunks in pixels
+            chunk_min: Minimum of every chunk with shape (bands, chunk rows, chunk
+                columns)
+            chunk_max: Maximum of every chunk with the shape of chunk_min
+            pyramid_factors: Decimation factors of the pyramid levels
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.categories = categories
+        self.forbidden_value = forbidden_value
+        self.forbidden_count = forbidden_count
+        self.chunk_size = chunk_size
+        self.chunk_min = chunk_min
+        self.chunk_max = chunk_max
+        self.pyramid_factors = pyramid_factors
+
+    def chunk_slices(self, window: Window) -> tuple[slice, slice]:
+        """
+        Return the slices of the rows and columns of the chunks overlapping a window.
+        """
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        return (slice(row_off // self.chunk_size,
+                      (row_off + int(window.height) - 1) // self.chunk_size + 1),
+                slice(col_off // self.chunk_size,
+                      (col_off + int(window.width) - 1) // self.chunk_size + 1))
+
+    def window_min(self, window: Window, band: int = 1) -> float:
+        """
+        Return a lower bound of the values of a window: the minimum of the chunks it
+        overlaps.
+
+        Parameters:
+            window: The window of the raster
+            band: The band (1-based)
+
+        Returns:
+            Lower bound of the values of the window
+        """
+        rows, cols = self.chunk_slices(window)
+        return self.chunk_min[band - 1, rows, cols].min()
+
+    def window_max(self, window: Window, band: int = 1) -> float:
+        """
+        Return an upper bound of the values of a window: the maximum of the chunks it
+        overlaps.
+
+        Parameters:
+            window: The window of the raster
+            band: The band (1-based)
+
+        Returns:
+            Upper bound of the values of the window
+        """
+        rows, cols = self.chunk_slices(window)
+        return self.chunk_max[band - 1, rows, cols].max()
+
+    def select_bands(self, indexes: Union[int, list[int]]) -> "RasterStatistics":
+        """
+        Return the statistics of selected bands in the order of the selection.
+
+        Parameters:
+            indexes: Bands to select (1-based)
+
+        Returns:
+            The RasterStatistics of the selected bands
+        """
+        bands = [i - 1 for i in ([indexes] if isinstance(indexes, int) else indexes)]
+        return RasterStatistics(
+            minimum=self.minimum[bands],
+            maximum=self.maximum[bands],
+            categories=None if self.categories is None else
+            [self.categories[b] for b in bands],
+            forbidden_value=self.forbidden_value,
+            forbidden_count=self.forbidden_count[bands],
+            chunk_size=self.chunk_size,
+            chunk_min=self.chunk_min[bands],
+            chunk_max=self.chunk_max[bands],
+            pyramid_factors=self.pyramid_factors,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the statistics as JSON serializable dictionary.
+        """
+        return {
+            "min": self.minimum.tolist(),
+            "max": self.maximum.tolist(),
+            "categories": None if self.categories is None else
+            [c.tolist() for c in self.categories],
+            "forbidden_value": self.forbidden_value,
+            "forbidden_count": self.forbidden_count.tolist(),
+            "chunk_size": self.chunk_size,
+            "chunk_min": self.chunk_min.tolist(),
+            "chunk_max": self.chunk_max.tolist(),
+            "pyramid_factors": self.pyramid_factors,
+        }
+
+    @classmethod
+    def from_dict(cls, statistics: dict[str, Any], data_type: np.dtype
+                  ) -> "RasterStatistics":
+        """
+        Create the statistics from the dictionary of the sidecar file.
+
+        Parameters:
+            statistics: The dictionary created by to_dict
+            data_type: Data type of the raster
+
+        Returns:
+            The RasterStatistics
+        """
+        categories = statistics["categories"]
+        return cls(
+            minimum=np.array(statistics["min"], dtype=data_type),
+            maximum=np.array(statistics["max"], dtype=data_type),
+            categories=None if categories is None else
+            [np.array(c, dtype=data_type) for c in categories],
+            forbidden_value=statistics["forbidden_value"],
+            forbidden_count=np.array(statistics["forbidden_count"], dtype=np.int64),
+            chunk_size=statistics["chunk_size"],
+            chunk_min=np.array(statistics["chunk_min"], dtype=data_type),
+            chunk_max=np.array(statistics["chunk_max"], dtype=data_type),
+            pyramid_factors=statistics["pyramid_factors"],
+        )
+
+
+def create_raster_store(
+        source: Union[str, np.ndarray],
+        store_path: str,
+        crs: Any = None,
+        transform: Optional[Affine] = None,
+        nodata: Optional[float] = None,
+        chunk_size: int = 512,
+        forbidden_value: Optional[float] = None
+) -> RasterStatistics:
+    """
+    Create a raster store from a raster file or an array. Raster files are processed
+    chunk by chunk and never held in memory completely.
+
+    Parameters:
+        source: Path of a raster file that rasterio can read or an array of shape
+            (bands, height, width) or (height, width)
+        store_path: Directory of the raster store
+        crs: Coordinate reference system of an array source
+        transform: Affine transformation of an array source (the identity if None)
+        nodata: No data value of an array source
+        chunk_size: Width and height of the chunks (a power of two)
+        forbidden_value: Value of forbidden cells. Defaults to the maximum of the data
+            type for integer rasters.
+
+    Returns:
+        The statistics of the raster
+    """
+    if chunk_size <= 0 or chunk_size & (chunk_size - 1):
+        raise ValueError(f"chunk_size must be a power of two, got {chunk_size}.")
+
+    if isinstance(source, str):
+        with rio_open(source) as src:
+            crs, transform, nodata = src.crs, src.transform, src.nodata
+            count, height, width = src.count, src.height, src.width
+            data_type = np.dtype(src.dtypes[0])
+
+        def read(window: Window) -> np.ndarray:
+            with rio_open(source) as src:
+                return src.read(window=window)
+    else:
+        data = source if source.ndim == 3 else source[None]
+        count, height, width = data.shape
+        transform = transform if transform is not None else Affine.identity()
+        data_type = data.dtype
+
+        def read(window: Window) -> np.ndarray:
+            rows, cols = window.toslices()
+            return data[:, rows, cols]
+
+    if forbidden_value is None and data_type.kind in "ui":
+        forbidden_value = int(np.iinfo(data_type).max)
+    fill = np.iinfo(data_type).max if data_type.kind in "ui" else np.inf
+    factors = [f for f in overview_factors(height, width, chunk_size)
+               if f <= chunk_size]
+
+    os.makedirs(os.path.join(store_path, "chunks"), exist_ok=True)
+    os.makedirs(os.path.join(store_path, "pyramid"), exist_ok=True)
+    pyramid = {f: np.lib.format.open_memmap(
+        os.path.join(store_path, "pyramid", f"{f}.npy"), mode="w+", dtype=data_type,
+        shape=(count, -(-height // f), -(-width // f))) for f in factors}
+
+    n_rows, n_cols = -(-height // chunk_size), -(-width // chunk_size)
+    chunk_min = np.empty((count, n_rows, n_cols), dtype=data_type)
+    chunk_max = np.empty((count, n_rows, n_cols), dtype=data_type)
+    forbidden_count = np.zeros(count, dtype=np.int64)
+    categories = [np.empty(0, dtype=data_type) for _ in range(count)] \
+        if data_type.kind in "ui" else None
+
+    for row in range(n_rows):
+        for col in range(n_cols):
+            window = Window(col * chunk_size, row * chunk_size,
+                            min(chunk_size, width - col * chunk_size),
+                            min(chunk_size, height - row * chunk_size))
+            chunk = np.ascontiguousarray(read(window))
+            np.save(os.path.join(store_path, "chunks", f"{row}_{col}.npy"), chunk)
+
+            chunk_min[:, row, col] = chunk.min(axis=(1, 2))
+            chunk_max[:, row, col] = chunk.max(axis=(1, 2))
+            if forbidden_value is not None:
+                forbidden_count += (chunk == forbidden_value).sum(axis=(1, 2))
+            if categories is not None:
+                for band in range(count):
+                    categories[band] = np.union1d(categories[band],
+                                                  np.unique(chunk[band]))
+                if max(len(c) for c in categories) > MAX_CATEGORIES:
+                    categories = None
+
+            # Minimum of every block of the pyramid levels
+            for f, level in pyramid.items():
+                h, w = chunk.shape[1:]
+                padded = np.full((count, -(-h // f) * f, -(-w // f) * f), fill,
+                                 dtype=data_type)
+                padded[:, :h, :w] = chunk
+                blocks = padded.reshape(count, padded.shape[1] // f, f,
+                                        padded.shape[2] // f, f).min(axis=(2, 4))
+                r0, c0 = row * chunk_size // f, col * chunk_size // f
+                level[:, r0:r0 + blocks.shape[1], c0:c0 + blocks.shape[2]] = blocks
+    for level in pyramid.values():
+        level.flush()
+
+    statistics = RasterStatistics(
+        minimum=chunk_min.min(axis=(1, 2)),
+        maximum=chunk_max.max(axis=(1, 2)),
+        categories=categories,
+        forbidden_value=forbidden_value,
+        forbidden_count=forbidden_count,
+        chunk_size=chunk_size,
+        chunk_min=chunk_min,
+        chunk_max=chunk_max,
+        pyramid_factors=factors,
+    )
+    sidecar = {
+        "crs": CRS.from_user_input(crs).to_wkt() if crs is not None else None,
+        "transform": list(transform)[:6],
+        "nodata": None if nodata is None else float(nodata),
+        "shape": [height, width],
+        "count": count,
+        "dtype": data_type.str,
+        "statistics": statistics.to_dict(),
+    }
+    with open(os.path.join(store_path, STORE_FILE), "w") as f:
+        json.dump(sidecar, f)
+    return statistics
+
+
+class RasterStore:
+    """
+    Read access to a raster store. The chunks are memory-mapped, so windows are
+    assembled from the pages of the chunk files.
+    """
+
+    def __init__(self, store_path: str):
+        """
+        Parameters:
+            store_path: Directory of the raster store
+        """
+        self.store_path = store_path
+        with open(os.path.join(store_path, STORE_FILE)) as f:
+            sidecar = json.load(f)
+        self.crs = CRS.from_user_input(sidecar["crs"]) if sidecar["crs"] else None
+        self.transform = Affine(*sidecar["transform"])
+        self.nodata = sidecar["nodata"]
+        self.shape = tuple(sidecar["shape"])
+        self.count = sidecar["count"]
+        self.dtype = np.dtype(sidecar["dtype"])
+        self.statistics = RasterStatistics.from_dict(sidecar["statistics"], self.dtype)
+        self._chunks = {}
+
+    def chunk(self, row: int, col: int) -> np.ndarray:
+        """
+        Return the memory-mapped chunk of a chunk row and column.
+        """
+        chunk = self._chunks.get((row, col))
+        if chunk is None:
+            chunk = np.load(os.path.join(self.store_path, "chunks", f"{row}_{col}.npy"),
+                            mmap_mode="r")
+            self._chunks[(row, col)] = chunk
+        return chunk
+
+    def read_window(self, window: Window,
+                    indexes: Optional[Union[int, list[int]]] = None) -> np.ndarray:
+        """
+        Read a window of the raster from the chunks it overlaps.
+
+        Parameters:
+            window: The window to read
+            indexes: Bands to read (1-based). If None, all bands are read.
+
+        Returns:
+            Array of shape (bands, height, width)
+        """
+        if indexes is None:
+            bands = list(range(self.count))
+        else:
+            bands = [i - 1 for i in
+                     ([indexes] if isinstance(indexes, int) else indexes)]
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        size = self.statistics.chunk_size
+        data = np.empty((len(bands), height, width), dtype=self.dtype)
+
+        rows, cols = self.statistics.chunk_slices(window)
+        for row in range(rows.start, rows.stop):
+            for col in range(cols.start, cols.stop):
+                chunk = self.chunk(row, col)
+                top, left = row * size, col * size
+                r0, r1 = max(row_off, top), min(row_off + height, top + chunk.shape[1])
+                c0, c1 = max(col_off, left), min(col_off + width, left + chunk.shape[2])
+                data[:, r0 - row_off:r1 - row_off, c0 - col_off:c1 - col_off] = \
+                    chunk[bands, r0 - top:r1 - top, c0 - left:c1 - left]
+        return data
+
+    def read_pyramid(self, factor: int) -> np.ndarray:
+        """
+        Return a pyramid level, in which every cell holds the minimum of a block of
+        factor x factor cells of the raster.
+
+        Parameters:
+            factor: Decimation factor of the level (see statistics.pyramid_factors)
+
+        Returns:
+            Memory-mapped array of shape (bands, ceil(height / factor), ceil(width /
+            factor))
+        """
+        if factor not in self.statistics.pyramid_factors:
+            raise ValueError(f"The store has no pyramid level {factor}. Available "
+                             f"levels: {self.statistics.pyramid_factors}")
+        return np.load(os.path.join(self.store_path, "pyramid", f"{factor}.npy"),
+                       mmap_mode="r")
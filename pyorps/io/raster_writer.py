@@ -0,0 +1,137 @@
+"""
+Writing of GeoTIFF files that are efficient inputs for windowed reads.
+
+write_geotiff stores rasters with internal tiles, so a search window only decodes the
+tiles it overlaps, compresses them losslessly with a predictor and can add overviews
+for coarse reads of the raster. Overviews of cost rasters are resampled with "mode" by
+default, which keeps the cost categories instead of averaging them. With cog=True the
+file is written as Cloud Optimized GeoTIFF (tiles and overviews ordered for HTTP range
+requests).
+"""
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.enums import Resampling
+from rasterio.io import MemoryFile
+from rasterio.shutil import copy as rio_copy
+from rasterio.transform import Affine
+
+# Compression methods, which support a predictor
+PREDICTOR_COMPRESSIONS = ("deflate", "zstd", "lzw", "lzma")
+
+
+def overview_factors(height: int, width: int, blocksize: int = 256) -> list[int]:
+    """
+    Return the decimation factors of overviews down to an overview that fits into a
+    single block.
+
+    Parameters:
+        height: Height of the raster in pixels
+        width: Width of the raster in pixels
+        blocksize: Size of the internal tiles in pixels
+
+    Returns:
+        Overview factors (2, 4, 8, ...)
+    """
+    factors = []
+    factor = 2
+    while max(height, width) / (factor / 2) > blocksize:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def write_geotiff(
+        path: str,
+        data: np.ndarray,
+        crs: Any,
+        transform: Affine,
+        nodata: Optional[float] = None,
+        tiled: bool = True,
+        blocksize: int = 256,
+        compress: Optional[str] = "deflate",
+        predictor: Union[str, int, None] = "auto",
+        overviews: Union[str, Sequence[int], None] = None,
+        overview_resampling: str = "mode",
+        bigtiff: str = "IF_SAFER",
+        cog: bool = False
+) -> None:
+    """
+    Write a raster as GeoTIFF with internal tiles, compression and overviews.
+
+    Parameters:
+        path: Path of the GeoTIFF file
+        data: Raster of shape (bands, height, width) or (height, width)
+        crs: Coordinate reference system of the raster
+        transform: Affine transformation of the raster
+        nodata: No data value of the raster
+        tiled: Whether to store the raster in internal tiles instead of strips
+        blocksize: Width and height of the tiles (a multiple of 16, e.g. 256 or 512)
+        compress: Compression method (e.g. "deflate", "zstd", "lzw") or None
+        predictor: Predictor of the compression. "auto" uses horizontal differencing
+            (2) for integer and floating point prediction (3) for float rasters. None
+            disables the predictor.
+        overviews: Overview factors, "auto" for factors down to a single tile (see
+            overview_factors) or None for no overviews
+        overview_resampling: Resampling method of the overviews (e.g. "mode" for cost
+            categories, "nearest" or "average")
+        bigtiff: BIGTIFF creation option of GDAL ("IF_SAFER", "IF_NEEDED", "YES" or
+            "NO")
+        cog: Whether to write a Cloud Optimized GeoTIFF
+    """
+    if data.ndim == 2:
+        data = data[None]
+    count, height, width = data.shape
+
+    profile = {
+        "driver": "GTiff",
+        "height": height,
+        "width": width,
+        "count": count,
+        "dtype": data.dtype,
+        "crs": crs,
+        "transform": transform,
+        "nodata": nodata,
+        "BIGTIFF": bigtiff,
+    }
+    if tiled or cog:
+        profile.update(tiled=True, blockxsize=blocksize, blockysize=blocksize)
+    if compress is not None:
+        profile["compress"] = compress
+        if predictor == "auto":
+            predictor = 3 if np.issubdtype(data.dtype, np.floating) else 2
+        if predictor is not None and compress.lower() in PREDICTOR_COMPRESSIONS:
+            profile["predictor"] = predictor
+
+    if overviews == "auto":
+        overviews = overview_factors(height, width, blocksize)
+    resampling = Resampling[overview_resampling]
+
+    if not cog:
+        with rio_open(path, "w", **profile) as dst:
+            dst.write(data)
+            if overviews:
+                dst.build_overviews(list(overviews), resampling)
+                dst.update_tags(ns="rio_overview", resampling=overview_resampling)
+        return
+
+    # The COG driver can only copy datasets, therefore the raster and its overviews
+    # are written to memory first
+    with MemoryFile() as memory_file:
+        with memory_file.open(**profile) as dst:
+            dst.write(data)
+            if overviews:
+                dst.build_overviews(list(overviews), resampling)
+        with memory_file.open() as src:
+            options = {
+                "BLOCKSIZE": blocksize,
+                "BIGTIFF": bigtiff,
+                "COMPRESS": compress.upper() if compress is not None else "NONE",
+                "OVERVIEWS": "FORCE_USE_EXISTING" if overviews else "NONE",
+                "OVERVIEW_RESAMPLING": overview_resampling.upper(),
+            }
+            if "predictor" in profile:
+                options["PREDICTOR"] = "YES" if profile["predictor"] == 2 else \
+                    "FLOATING_POINT"
+            rio_copy(src, path, driver="COG", **options)
@@ -15,6 +15,7 @@ from shapely.ops import unary_union
 from ..core.types import BboxType, GeometryMaskType
 from ..core.exceptions import (WFSLayerNotFoundError, WFSConnectionError,
                                WFSResponseParsingError, WFSError)
+from .wfs_cache import WFSResponseCache
 
 
 def load_from_wfs(
@@ -24,7 +25,8 @@ def load_from_wfs(
         mask: Optional[GeometryMaskType] = None,
         filter_params: Optional[dict] = None,
         auto_match: bool = True,
-        max_workers: int = 4
+        max_workers: int = 4,
+        cache: Optional[WFSResponseCache] = None
 ) -> Optional[gpd.GeoDataFrame]:
     """
     Load data from a Web Feature Service (WFS) using chunked loading.
@@ -39,6 +41,7 @@ def load_from_wfs(
         auto_match: Whether to attempt finding similar layer names if exact match not
                 found
         max_workers: Maximum number of parallel threads to use
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         Loaded GeoDataFrame or None if no data could be loaded
@@ -48,7 +51,7 @@ def load_from_wfs(
     """
     # Find the correct layer name
     if auto_match:
-        layer = _resolve_layer(url, layer)
+        layer = _resolve_layer(url, layer, cache=cache)
 
     # If mask is provided but no bbox, get bbox from mask
     if bbox is None and mask is not None:
@@ -57,14 +60,15 @@ def load_from_wfs(
     # If no bounding box is provided, try to load the entire dataset directly
     if bbox is None:
         # Try to load the entire dataset first
-        gdf, limit_reached = _try_direct_load(url, layer, filter_params, mask)
+        gdf, limit_reached = _try_direct_load(url, layer, filter_params, mask,
+                                              cache=cache)
 
         # If we successfully loaded the entire dataset without hitting limits
         if gdf is not None and not limit_reached:
             return gdf
 
         # If we hit a limit or failed, try to get a bounding box and use chunked loading
-        bbox = _get_extent_from_capabilities(url, layer)
+        bbox = _get_extent_from_capabilities(url, layer, cache=cache)
 
         # If we still don't have a bbox but got some data, use the data's extent
         if bbox is None and gdf is not None and not gdf.empty:
@@ -75,7 +79,31 @@ def load_from_wfs(
             raise WFSError("Could not determine data extent for chunked loading.")
 
     # Load data using parallel chunked approach
-    return _load_data_in_parallel(url, layer, bbox, filter_params, max_workers, mask)
+    return _load_data_in_parallel(url, layer, bbox, filter_params, max_workers, mask,
+                                  cache=cache)
+
+
+def _get(url: str, params: dict, cache: Optional[WFSResponseCache] = None
+         ) -> requests.Response:
+    """
+    Send a GET request to the WFS service or answer it from the cache.
+
+    Args:
+        url: The base URL of the WFS service
+        params: Query parameters of the request
+        cache: Optional on-disk cache of the WFS responses
+
+    Returns:
+        The response
+
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    if cache is not None:
+        return cache.get(url, params)
+    response = requests.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    return response
 
 
 def _get_bbox_from_mask(mask) -> tuple[float, float, float, float]:
@@ -170,7 +198,8 @@ def _try_direct_load(
         url: str,
         layer: str,
         filter_params: Optional[dict] = None,
-        mask=None
+        mask=None,
+        cache: Optional[WFSResponseCache] = None
 ) -> tuple[Optional[gpd.GeoDataFrame], bool]:
     """
     Try to load the entire dataset directly without chunking.
@@ -180,6 +209,7 @@ def _try_direct_load(
         layer: Name of the layer to retrieve
         filter_params: Additional WFS parameters to filter results
         mask: Optional geometry mask to limit the query
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         tuple of (GeoDataFrame or None, boolean indicating if a server limit was
@@ -213,8 +243,7 @@ def _try_direct_load(
             params.update(filter_params)
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            response = _get(url, params, cache)
 
             content_type = response.headers.get('Content-Type', '').lower()
 
@@ -245,13 +274,15 @@ def _try_direct_load(
     return None, False
 
 
-def _resolve_layer(url: str, requested_layer: str) -> str:
+def _resolve_layer(url: str, requested_layer: str,
+                   cache: Optional[WFSResponseCache] = None) -> str:
     """
     Find the correct layer name, using fuzzy matching if necessary.
 
     Args:
         url: The base URL of the WFS service
         requested_layer: The layer name to find or match
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         The exact layer name if found, or the best matching layer name
@@ -259,7 +290,7 @@ def _resolve_layer(url: str, requested_layer: str) -> str:
     Raises:
         WFSLayerNotFoundError: If no matching layer can be found
     """
-    available_layers = _get_available_layers(url)
+    available_layers = _get_available_layers(url, cache=cache)
 
     if not available_layers:
         raise WFSLayerNotFoundError("No layers found in WFS service")
@@ -277,12 +308,14 @@ def _resolve_layer(url: str, requested_layer: str) -> str:
                                 f"layers available.")
 
 
-def _get_available_layers(url: str) -> list[str]:
+def _get_available_layers(url: str,
+                          cache: Optional[WFSResponseCache] = None) -> list[str]:
     """
     Get available layers from a WFS service.
 
     Args:
         url: The base URL of the WFS service
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         list of available layer names from the WFS service
@@ -298,8 +331,7 @@ def _get_available_layers(url: str) -> list[str]:
     }
 
     try:
-        response = requests.get(url, params=capabilities_params, timeout=30)
-        response.raise_for_status()
+        response = _get(url, capabilities_params, cache)
     except requests.RequestException as e:
         raise WFSConnectionError(f"Failed to connect to WFS service: {e}")
 
@@ -370,7 +402,9 @@ def _find_best_matching_layer(target_name: str,
 
 
 def _get_extent_from_capabilities(url: str,
-                                  layer: str) -> Optional[tuple[float,
+                                  layer: str,
+                                  cache: Optional[WFSResponseCache] = None
+                                  ) -> Optional[tuple[float,
                                                                 float,
                                                                 float,
                                                                 float]]:
@@ -380,6 +414,7 @@ def _get_extent_from_capabilities(url: str,
     Args:
         url: The base URL of the WFS service
         layer: Name of the layer
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         Bounding box as (minx, miny, maxx, maxy) or None if extent not found
@@ -395,8 +430,7 @@ def _get_extent_from_capabilities(url: str,
     }
 
     try:
-        response = requests.get(url, params=capabilities_params, timeout=30)
-        response.raise_for_status()
+        response = _get(url, capabilities_params, cache)
     except requests.RequestException as e:
         raise WFSConnectionError(f"Failed to connect to WFS service: {e}")
 
@@ -522,7 +556,8 @@ def _load_data_in_parallel(
         bbox: tuple[float, float, float, float],
         filter_params: Optional[dict] = None,
         max_workers: int = 4,
-        mask=None
+        mask=None,
+        cache: Optional[WFSResponseCache] = None
 ) -> Optional[gpd.GeoDataFrame]:
     """
     Load WFS data in chunks using parallel processing.
@@ -534,6 +569,7 @@ def _load_data_in_parallel(
         filter_params: Additional WFS parameters to filter results
         max_workers: Maximum number of parallel threads to use
         mask: Optional geometry mask to limit the query
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         Combined GeoDataFrame with all data or None if no data found
@@ -575,8 +611,8 @@ def _load_data_in_parallel(
             future_to_chunk_info = {}
             for chunk_info in filtered_batch:
                 chunk = chunk_info[0]
-                future = executor.submit(_fetch_wfs_data, url, layer,
-                                         chunk, filter_params)
+                future = executor.submit(_fetch_wfs_data, url, layer, chunk,
+                                         filter_params, cache)
                 future_to_chunk_info[future] = chunk_info
 
             # Process results as they complete
@@ -655,7 +691,8 @@ def _fetch_wfs_data(
         url: str,
         layer: str,
         bbox: tuple[float, float, float, float],
-        filter_params: Optional[dict] = None
+        filter_params: Optional[dict] = None,
+        cache: Optional[WFSResponseCache] = None
 ) -> Optional[gpd.GeoDataFrame]:
     """
     Fetch WFS data for a specific bounding box.
@@ -665,6 +702,7 @@ def _fetch_wfs_data(
         layer: Name of the layer
         bbox: Bounding box to query as (minx, miny, maxx, maxy)
         filter_params: Additional WFS parameters to filter results
+        cache: Optional on-disk cache of the WFS responses
 
     Returns:
         GeoDataFrame with data or None if no data found or error occurred
@@ -698,8 +736,7 @@ def _fetch_wfs_data(
             params.update(filter_params)
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            response = _get(url, params, cache)
 
             content_type = response.headers.get('Content-Type', '').lower()
 
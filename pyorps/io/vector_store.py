@@ -0,0 +1,182 @@
+"""
+Spatially indexed local store for vector base data.
+
+create_vector_store ingests a shapefile, a GeoPackage, a WFS pull or a GeoDataFrame
+once into a GeoParquet file. The features are sorted along a Hilbert curve, so every
+row group covers a compact region, and a bbox covering column is written, whose
+statistics hold the bounds of every row group. read_vector_store only reads the row
+groups whose bounds intersect the requested bounds and only the requested columns.
+
+pyarrow is an optional dependency of pyorps and only needed for the vector store.
+"""
+import json
+from typing import Any, Optional
+
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import box
+
+from pyorps.core.types import InputDataType, BboxType, GeometryMaskType
+
+# Name of the bbox covering column of the GeoParquet file
+BBOX_COLUMN = "bbox"
+
+
+def _import_parquet() -> Any:
+    """
+    Import pyarrow.parquet.
+
+    Returns:
+        The pyarrow.parquet module
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("The vector store requires pyarrow. Please install it "
+                          "with 'pip install pyarrow' or "
+                          "'pip install pyorps[store]'.") from e
+    return pq
+
+
+def create_vector_store(
+        source: InputDataType,
+        store_path: str,
+        crs: Optional[str] = None,
+        bbox: Optional[BboxType] = None,
+        mask: Optional[GeometryMaskType] = None,
+        row_group_size: int = 4096,
+        **load_kwargs
+) -> str:
+    """
+    Ingest a vector source into a GeoParquet file with spatially sorted row groups.
+
+    Parameters:
+        source: Vector source (file path, WFS dictionary with url and layer, or
+            GeoDataFrame)
+        store_path: Path of the GeoParquet file to write
+        crs: Coordinate reference system to convert the data to
+        bbox: Bounding box to limit the ingested data
+        mask: Mask to limit the ingested data
+        row_group_size: Number of features per row group
+        **load_kwargs: Keyword arguments for the load function of the source dataset
+
+    Returns:
+        The path of the written GeoParquet file
+    """
+    _import_parquet()
+    from pyorps.io.geo_dataset import initialize_geo_dataset
+
+    dataset = initialize_geo_dataset(source, crs, bbox, mask)
+    dataset.load_data(**load_kwargs)
+    data = dataset.data
+    if isinstance(data, gpd.GeoSeries):
+        data = gpd.GeoDataFrame(geometry=data)
+
+    # Sort the features along a Hilbert curve to get compact row groups
+    if len(data) > 0:
+        order = np.argsort(data.geometry.hilbert_distance(), kind="stable")
+        data = data.iloc[order]
+    data = data.reset_index(drop=True)
+
+    data.to_parquet(store_path, write_covering_bbox=True,
+                    row_group_size=row_group_size)
+    return store_path
+
+
+def row_group_bounds(store_path: str) -> np.ndarray:
+    """
+    Read the bounds of all row groups from the statistics of the bbox column.
+
+    Parameters:
+        store_path: Path of the GeoParquet file
+
+    Returns:
+        Array with one row (xmin, ymin, xmax, ymax) per row group. Row groups without
+        statistics get infinite bounds.
+    """
+    pq = _import_parquet()
+    metadata = pq.ParquetFile(store_path).metadata
+    fields = ("xmin", "ymin", "xmax", "ymax")
+    bounds = np.tile([-np.inf, -np.inf, np.inf, np.inf],
+                     (metadata.num_row_groups, 1))
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            path = column.path_in_schema.split(".")
+            if len(path) != 2 or path[0] != BBOX_COLUMN or path[1] not in fields:
+                continue
+            statistics = column.statistics
+            if statistics is None or not statistics.has_min_max:
+                continue
+            k = fields.index(path[1])
+            bounds[i, k] = statistics.min if k < 2 else statistics.max
+    return bounds
+
+
+def read_vector_store(
+        store_path: str,
+        bounds: Optional[tuple[float, float, float, float]] = None,
+        columns: Optional[list[str]] = None,
+        **read_kwargs
+) -> gpd.GeoDataFrame:
+    """
+    Read the features of a vector store.
+
+    Parameters:
+        store_path: Path of the GeoParquet file
+        bounds: Only features intersecting these bounds (xmin, ymin, xmax, ymax) are
+            read. Row groups which do not intersect are skipped.
+        columns: Attribute columns to read. The geometry is always read. If None, all
+            columns are read.
+        **read_kwargs: Keyword arguments for pyarrow.parquet.ParquetFile.
+            read_row_groups (e.g. use_threads)
+
+    Returns:
+        GeoDataFrame of the features
+    """
+    pq = _import_parquet()
+    parquet_file = pq.ParquetFile(store_path)
+    geo_metadata = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+    geometry_column = geo_metadata["primary_column"]
+
+    if columns is None:
+        columns = [name for name in parquet_file.schema_arrow.names
+                   if name not in (BBOX_COLUMN, geometry_column)]
+    columns = [c for c in columns if c not in (BBOX_COLUMN, geometry_column)]
+    columns.append(geometry_column)
+
+    row_groups = list(range(parquet_file.metadata.num_row_groups))
+    if bounds is not None:
+        group_bounds = row_group_bounds(store_path)
+        xmin, ymin, xmax, ymax = bounds
+        intersects = ((group_bounds[:, 0] <= xmax) & (group_bounds[:, 2] >= xmin) &
+                      (group_bounds[:, 1] <= ymax) & (group_bounds[:, 3] >= ymin))
+        row_groups = [int(i) for i in np.flatnonzero(intersects)]
+
+    table = parquet_file.read_row_groups(row_groups, columns=columns, **read_kwargs)
+    data = gpd.GeoDataFrame.from_arrow(table)
+    if bounds is not None:
+        data = data.loc[data.intersects(box(*bounds))].reset_index(drop=True)
+    return data
+
+
+def total_bounds(geometry: Any) -> tuple[float, float, float, float]:
+    """
+    Return the bounds of a bbox or mask.
+
+    Parameters:
+        geometry: Tuple (xmin, ymin, xmax, ymax), shapely geometry, GeoSeries or
+            GeoDataFrame
+
+    Returns:
+        The bounds (xmin, ymin, xmax, ymax)
+    """
+    if isinstance(geometry, (tuple, list)) and len(geometry) == 4:
+        return tuple(float(v) for v in geometry)
+    if hasattr(geometry, "total_bounds"):
+        return tuple(float(v) for v in geometry.total_bounds)
+    return tuple(float(v) for v in geometry.bounds)
@@ -0,0 +1,257 @@
+"""
+On-disk cache of WFS responses.
+
+Every request (GetCapabilities and the GetFeature request of every chunk) is keyed by
+its url and query parameters, i.e. the layer, the WFS version, the bbox of the chunk
+and the filter parameters. Responses younger than the time to live are answered from
+disk. Older responses are revalidated with the ETag and Last-Modified headers of the
+cached response, so an unchanged chunk only costs a 304 response instead of a
+download. With stale_while_revalidate, stale responses are returned at once and
+revalidated in a background thread. In offline mode, and whenever the service cannot
+be reached, cached responses of any age are used. OWS service exceptions, which WFS
+services may return with status 200, are never cached.
+"""
+import json
+import os
+from threading import Lock, Thread
+from time import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from pyorps.utils.caching import content_hash
+
+# Headers stored with a cached response
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# Root elements of OWS service exception documents
+_EXCEPTION_ELEMENTS = (b"ExceptionReport", b"ServiceExceptionReport")
+
+
+class WFSResponseCache:
+    """
+    On-disk cache of WFS responses with time to live and conditional revalidation.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            ttl: float = 7 * 24 * 3600,
+            stale_while_revalidate: bool = False,
+            offline: bool = False,
+            timeout: float = 30
+    ):
+        """
+        Parameters:
+            directory: Directory holding the cached responses. Created if it does not
+                exist.
+            ttl: Time to live of a cached response in seconds
+            stale_while_revalidate: Whether stale responses are returned at once and
+                revalidated in the background
+            offline: Whether only cached responses are used
+            timeout: Timeout of the requests in seconds
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = offline
+        self.timeout = timeout
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "downloads": 0,
+                      "stale": 0, "exceptions": 0}
+        self._lock = Lock()
+        self._revalidating = set()
+        self._threads = []
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[dict] = None) -> str:
+        """
+        Create the key of a request.
+
+        Parameters:
+            url: The base URL of the WFS service
+            params: Query parameters of the request
+
+        Returns:
+            The key
+        """
+        items = tuple(sorted((str(k).upper(), str(v))
+                             for k, v in (params or {}).items()))
+        return content_hash(url, items)
+
+    @staticmethod
+    def is_service_exception(response: requests.Response) -> bool:
+        """
+        Check whether a response holds an OWS service exception instead of data.
+
+        Parameters:
+            response: The response
+
+        Returns:
+            Whether the content type or the root element of the body mark a service
+            exception
+        """
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "se_xml" in content_type:
+            return True
+        if "xml" not in content_type and "gml" not in content_type:
+            return False
+        # The root element follows the XML declaration at the start of the body
+        head = response.content[:1024]
+        return any(element in head for element in _EXCEPTION_ELEMENTS)
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return f"{base}.body", f"{base}.json"
+
+    def _read(self, key: str) -> Optional[tuple[dict, bytes]]:
+        body_path, metadata_path = self._paths(key)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return metadata, body
+
+    def _write(self, key: str, metadata: dict, body: Optional[bytes] = None) -> None:
+        # The metadata is written last and marks a complete entry
+        body_path, metadata_path = self._paths(key)
+        tmp_suffix = f".tmp-{os.getpid()}-{id(metadata)}"
+        if body is not None:
+            with open(body_path + tmp_suffix, "wb") as f:
+                f.write(body)
+            os.replace(body_path + tmp_suffix, body_path)
+        with open(metadata_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(metadata_path + tmp_suffix, metadata_path)
+
+    @staticmethod
+    def _to_response(url: str, metadata: dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(metadata["headers"])
+        response._content = body
+        return response
+
+    def get(self, url: str, params: Optional[dict] = None) -> requests.Response:
+        """
+        Return the response of a GET request from the cache or from the service.
+
+        Parameters:
+            url: The base URL of the WFS service
+            params: Query parameters of the request
+
+        Returns:
+            The response
+
+        Raises:
+            requests.RequestException: If the request fails and no cached response
+                exists or the service returns an error status
+        """
+        key = self.make_key(url, params)
+        cached = self._read(key)
+
+        if cached is not None:
+            metadata, body = cached
+            if self.offline or time() - metadata["stored_at"] < self.ttl:
+                self._count("hits")
+                return self._to_response(url, metadata, body)
+            if self.stale_while_revalidate:
+                self._count("stale")
+                self._revalidate_in_background(key, url, params, metadata)
+                return self._to_response(url, metadata, body)
+        elif self.offline:
+            self._count("misses")
+            raise requests.ConnectionError(f"Offline and no cached response for "
+                                           f"{url} with {params}")
+        else:
+            self._count("misses")
+
+        try:
+            return self._fetch(key, url, params, cached)
+        except requests.ConnectionError:
+            if cached is None:
+                raise
+            # The service cannot be reached, the stale response is better than none
+            self._count("stale")
+            return self._to_response(url, *cached)
+
+    def _fetch(self, key: str, url: str, params: Optional[dict],
+               cached: Optional[tuple[dict, bytes]]) -> requests.Response:
+        """
+        Download or revalidate a response and update the cache.
+        """
+        headers = {}
+        if cached is not None:
+            stored_headers = cached[0]["headers"]
+            if "ETag" in stored_headers:
+                headers["If-None-Match"] = stored_headers["ETag"]
+            if "Last-Modified" in stored_headers:
+                headers["If-Modified-Since"] = stored_headers["Last-Modified"]
+
+        response = requests.get(url, params=params, headers=headers,
+                                timeout=self.timeout)
+
+        if response.status_code == 304 and cached is not None:
+            metadata, body = cached
+            metadata["stored_at"] = time()
+            self._write(key, metadata)
+            self._count("revalidated")
+            return self._to_response(url, metadata, body)
+
+        response.raise_for_status()
+        if self.is_service_exception(response):
+            self._count("exceptions")
+            return response
+        metadata = {
+            "stored_at": time(),
+            "headers": {h: response.headers[h] for h in _STORED_HEADERS
+                        if h in response.headers},
+        }
+        self._write(key, metadata, response.content)
+        self._count("downloads")
+        return response
+
+    def _revalidate_in_background(self, key: str, url: str, params: Optional[dict],
+                                  metadata: dict) -> None:
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def _revalidate():
+            try:
+                cached = self._read(key)
+                self._fetch(key, url, params, cached)
+            except (requests.RequestException, OSError):
+                pass
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        thread = Thread(target=_revalidate, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def wait(self) -> None:
+        """
+        Wait for all background revalidations to finish.
+        """
+        while self._threads:
+            self._threads.pop().join()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith((".body", ".json")):
+                os.remove(os.path.join(self.directory, name))
@@ -8,11 +8,18 @@ This module provides:
 4. Utility functions for creating test data and processing rasters
 """
 
-# Raster handling and processing
-from .handler import RasterHandler
+from .._lazy import attach_lazy_attributes
 
-# Rasterization functionality
-from .rasterizer import GeoRasterizer
+# Attributes are imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    # Raster handling and processing
+    ".handler": ["RasterHandler"],
+
+    # Rasterization functionality
+    ".rasterizer": ["GeoRasterizer"],
+    ".rasterization_cache": ["RasterizationCache"],
+    ".tiled_rasterization": ["rasterize_tiled"],
+})
 
 __all__ = [
     # Raster handling
@@ -20,4 +27,6 @@ __all__ = [
 
     # Rasterization
     "GeoRasterizer",
+    "RasterizationCache",
+    "rasterize_tiled",
 ]
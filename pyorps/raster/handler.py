@@ -8,7 +8,8 @@ from rasterio.windows import Window, transform as transform_window
 from rasterio.transform import from_origin, rowcol, Affine, xy as transform_xy
 from pyproj import Transformer
 
-from pyorps.io.geo_dataset import RasterDataset
+from pyorps.io.geo_dataset import RasterDataset, InMemoryRasterDataset
+from pyorps.io.raster_writer import write_geotiff
 from pyorps.core.types import CoordinateTuple, CoordinateList
 
 
@@ -24,6 +25,10 @@ class RasterHandler:
     window: Window
     window_transform: Affine
     data: np.ndarray
+    # Precomputed statistics of the raster (e.g. of a raster store) or None
+    statistics: Optional[Any] = None
+    # Value of the cells outside the buffer geometry if the mask has been applied
+    outside_value: Optional[Any] = None
 
     def __init__(self,
                  raster_source: RasterDataset,
@@ -97,7 +102,60 @@ class RasterHandler:
             bands: List of bands to modify if apply_mask is True (1-based). If None, all
                 bands are modified
         """
+        self._init_search_space(source_coords, target_coords, search_space_buffer_m,
+                                input_crs)
+        min_row, min_col = self.window.row_off, self.window.col_off
+        max_row = min_row + self.window.height
+        max_col = min_col + self.window.width
 
+        # Extract the windowed data
+        # For datasets without loaded data, only the window is read from the file
+        # For direct data input, we need to slice the array
+        if self.raster_dataset.data is None:
+            self.data = self.raster_dataset.read_window(self.window)
+        elif isinstance(self.raster_dataset.data, np.ndarray):
+            # Handle different dimensions
+            if len(self.raster_dataset.data.shape) == 3:  # (bands, height, width)
+                self.data = self.raster_dataset.data[:,
+                                                     min_row:max_row,
+                                                     min_col:max_col]
+            elif len(self.raster_dataset.data.shape) == 2:  # (height, width)
+                self.data = self.raster_dataset.data[min_row:max_row, min_col:max_col]
+                # Ensure data has shape (bands, height, width)
+                self.data = np.expand_dims(self.data, axis=0)
+        else:
+            # This shouldn't happen with current implementation
+            raise ValueError("Data must be a numpy array")
+
+        # Read-only rasters (e.g. placed in shared memory) must not be masked in
+        # place, therefore only the window is copied
+        if apply_mask and not self.data.flags.writeable:
+            self.data = self.data.copy()
+
+        # Apply mask if requested
+        if apply_mask:
+            self.apply_geometry_mask(self.buffer_geometry, outside_value, bands)
+
+        self.statistics = getattr(self.raster_dataset, "statistics", None)
+
+    def _init_search_space(
+            self,
+            source_coords: Union[CoordinateTuple, CoordinateList],
+            target_coords: Union[CoordinateTuple, CoordinateList],
+            search_space_buffer_m: Optional[float] = None,
+            input_crs: Optional[str] = None
+    ):
+        """
+        Set the buffer geometry of the search space and the window of the raster
+        covering it.
+
+        Parameters:
+            source_coords: Source point(s) as (x, y) tuple or list of tuples
+            target_coords: Target point(s) as (x, y) tuple or list of tuples
+            search_space_buffer_m: Buffer distance in map units (typically meters)
+            input_crs: CRS of the input coordinates (e.g., 'EPSG:4326'). If None,
+                assumes same as raster
+        """
         # Transform coordinates if needed
         raster_crs = self.raster_dataset.crs
         transformed_source_coords = self._transform_coords(source_coords, input_crs,
@@ -139,7 +197,10 @@ class RasterHandler:
             # Create a convex hull from all points and buffer it
             multi_point = MultiPoint(all_points)
             buffer_geom = multi_point.convex_hull
-        if search_space_buffer_m is None:
+        if search_space_buffer_m is None and self.raster_dataset.data is None:
+            self.search_space_buffer_m = self._estimate_buffer_width_from_window(
+                source_coords, target_coords)
+        elif search_space_buffer_m is None:
             self.search_space_buffer_m = self.estimate_buffer_width(source_coords,
                                                                     target_coords)
         else:
@@ -170,26 +231,62 @@ class RasterHandler:
         # Get window-specific transform (crucial for correct coordinate transformations)
         self.window_transform = transform_window(self.window, transform)
 
-        # Extract the windowed data
-        # For file input, data was already read with window
-        # For direct data input, we need to slice the array
-        if isinstance(self.raster_dataset.data, np.ndarray):
-            # Handle different dimensions
-            if len(self.raster_dataset.data.shape) == 3:  # (bands, height, width)
-                self.data = self.raster_dataset.data[:,
-                                                     min_row:max_row,
-                                                     min_col:max_col]
-            elif len(self.raster_dataset.data.shape) == 2:  # (height, width)
-                self.data = self.raster_dataset.data[min_row:max_row, min_col:max_col]
-                # Ensure data has shape (bands, height, width)
-                self.data = np.expand_dims(self.data, axis=0)
-        else:
-            # This shouldn't happen with current implementation
-            raise ValueError("Data must be a numpy array")
+    @classmethod
+    def search_space(
+            cls,
+            raster_source: RasterDataset,
+            source_coords: Union[CoordinateTuple, CoordinateList],
+            target_coords: Union[CoordinateTuple, CoordinateList],
+            search_space_buffer_m: Optional[float] = None,
+            input_crs: Optional[str] = None
+    ) -> tuple[Polygon, Window]:
+        """
+        Return the buffer geometry and the window of the search space of a query
+        without reading or masking the raster data.
 
-        # Apply mask if requested
-        if apply_mask:
-            self.apply_geometry_mask(self.buffer_geometry, outside_value, bands)
+        Parameters:
+            raster_source: The raster dataset
+            source_coords: Source point(s) as (x, y) tuple or list of tuples
+            target_coords: Target point(s) as (x, y) tuple or list of tuples
+            search_space_buffer_m: Buffer distance in map units (typically meters)
+            input_crs: CRS of the input coordinates. If None, assumes same as raster
+
+        Returns:
+            The buffer geometry and the window of the search space
+        """
+        handler = cls.__new__(cls)
+        handler.raster_dataset = raster_source
+        handler._init_search_space(source_coords, target_coords, search_space_buffer_m,
+                                   input_crs)
+        return handler.buffer_geometry, handler.window
+
+    @property
+    def categories(self) -> Optional[np.ndarray]:
+        """
+        Cost categories of the first band of the window, taken from the precomputed
+        statistics of the raster (including the value of the masked cells) instead of
+        the unique values of the window. None if the raster has no statistics.
+        """
+        if self.statistics is None or self.statistics.categories is None:
+            return None
+        categories = self.statistics.categories[0]
+        if self.outside_value is not None:
+            categories = np.union1d(categories, [self.outside_value])
+        return categories.astype(self.data.dtype)
+
+    @property
+    def min_value(self) -> Optional[float]:
+        """
+        Lower bound of the values of the first band of the window, taken from the
+        precomputed minima of the chunks of the raster. None if the raster has no
+        statistics.
+        """
+        if self.statistics is None:
+            return None
+        min_value = self.statistics.window_min(self.window)
+        if self.outside_value is not None:
+            min_value = min(min_value, self.outside_value)
+        return min_value
 
     @staticmethod
     def _transform_coords(
@@ -228,13 +325,50 @@ class RasterHandler:
                 result.append((x, y))
             return result
 
+    def _estimate_buffer_width_from_window(
+            self,
+            source_coords: Union[CoordinateTuple, CoordinateList],
+            target_coords: Union[CoordinateTuple, CoordinateList],
+            max_buffer: float = 4000
+    ) -> int:
+        """
+        Estimate the buffer width for a dataset without loaded data. Only the window
+        around the coordinates extended by the maximum buffer width is read.
+
+        Parameters:
+            source_coords: (x, y) coordinates of the source point(s)
+            target_coords: (x, y) coordinates of the target point(s)
+            max_buffer: Maximum buffer width to consider (meters)
+
+        Returns:
+            Estimated optimal buffer width in meters
+        """
+        points, _ = RasterHandler.max_distance_pair(source_coords, target_coords)
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        transform = self.raster_dataset.transform
+        min_row, min_col = rowcol(transform, min(xs) - max_buffer, max(ys) + max_buffer)
+        max_row, max_col = rowcol(transform, max(xs) + max_buffer, min(ys) - max_buffer)
+        min_row, min_col = max(0, min_row), max(0, min_col)
+        max_row = min(self.raster_dataset.shape[0], max_row)
+        max_col = min(self.raster_dataset.shape[1], max_col)
+        window = Window(min_col, min_row, max_col - min_col, max_row - min_row)
+
+        window_dataset = InMemoryRasterDataset(self.raster_dataset.read_window(window),
+                                               self.raster_dataset.crs,
+                                               transform_window(window, transform))
+        return self.estimate_buffer_width(source_coords, target_coords,
+                                          max_buffer=max_buffer,
+                                          raster_dataset=window_dataset)
+
     def estimate_buffer_width(
             self,
             source_coords: Union[CoordinateTuple, CoordinateList],
             target_coords: Union[CoordinateTuple, CoordinateList],
             min_buffer: float = 200,
             max_buffer: float = 4000,
-            sample_radius: float = 50
+            sample_radius: float = 50,
+            raster_dataset: Optional[RasterDataset] = None
     ):
         """
         Estimate an appropriate buffer width for path finding based on terrain
@@ -247,11 +381,15 @@ class RasterHandler:
             max_buffer: Maximum buffer width to consider (meters)
             sample_radius: Radius for sampling around the straight line to assess
                 terrain complexity
+            raster_dataset: Raster dataset to sample. If None, the raster dataset of
+                the handler is used.
 
         Returns:
             Estimated optimal buffer width in meters
         """
-        forbidden_value = np.iinfo(self.raster_dataset.dtype).max
+        if raster_dataset is None:
+            raster_dataset = self.raster_dataset
+        forbidden_value = np.iinfo(raster_dataset.dtype).max
         points, euclidean_dist = RasterHandler.max_distance_pair(source_coords,
                                                                  target_coords)
         s, t = points
@@ -261,15 +399,15 @@ class RasterHandler:
         x_samples = np.linspace(s[0], t[0], num_samples).astype(int)
         y_samples = np.linspace(s[1], t[1], num_samples).astype(int)
 
-        rows, cols = rowcol(self.raster_dataset.transform,
+        rows, cols = rowcol(raster_dataset.transform,
                             list(x_samples), list(y_samples))
 
         # Convert bounds to pixel coordinates
-        height, width = self.raster_dataset.shape
+        height, width = raster_dataset.shape
         x_samples = np.clip(rows, 0, width - 1)
         y_samples = np.clip(cols, 0, height - 1)
 
-        raster_array = self.raster_dataset.data[self.raster_dataset.count - 1]
+        raster_array = raster_dataset.data[raster_dataset.count - 1]
         # Sample costs along the line
         line_costs = raster_array[y_samples, x_samples]
 
@@ -383,6 +521,7 @@ class RasterHandler:
         # Set default outside value if needed
         if outside_value is None:
             outside_value = np.iinfo(self.data.dtype).max
+        self.outside_value = outside_value
 
         # Create a mask using rasterization
         mask = rasterize(
@@ -477,26 +616,19 @@ class RasterHandler:
 
         return np.array(list(zip(xs_corrected, ys_corrected)))
 
-    def save_section_as_raster(self, output_path: str):
+    def save_section_as_raster(self, output_path: str, **geotiff_options):
         """
         Save the section as a new raster file with proper geo referencing.
 
         Parameters:
             output_path: Path for the output raster file
+            **geotiff_options: Options of pyorps.io.raster_writer.write_geotiff (e.g.
+                blocksize, compress, overviews or cog). By default, the section is
+                written with 256x256 tiles and DEFLATE compression.
         """
-        # Create a new raster file with the same properties as the section
-        with rio_open(
-                output_path,
-                'w',
-                driver='GTiff',
-                height=self.window.height,
-                width=self.window.width,
-                count=self.raster_dataset.count,
-                dtype=self.data.dtype,
-                crs=self.raster_dataset.crs,
-                transform=self.window_transform  # Use the section-specific transform
-        ) as dst:
-            dst.write(self.data)
+        # The section-specific transform places the section in the raster
+        write_geotiff(output_path, self.data, self.raster_dataset.crs,
+                      self.window_transform, **geotiff_options)
 
 
 def create_test_tiff(
@@ -0,0 +1,274 @@
+"""
+Content-addressed cache of rasterized datasets.
+
+Rasterizing vector data applies the cost assumptions, sorts and burns the complete
+GeoDataFrame. The RasterizationCache stores the resulting raster as an .npy file with
+its transform and crs in a .json sidecar. The key covers everything the raster
+depends on: the content of the source file (or the WFS query or the in-memory
+GeoDataFrame), the content of the cost assumptions, the rasterization parameters and
+the chain of datasets used to modify the raster. Repeated studies with unchanged
+inputs start from the cached raster. The least recently used rasters are evicted once
+the size limit of the cache directory is exceeded.
+"""
+import json
+import os
+from hashlib import blake2b
+from typing import Any, Optional
+
+import numpy as np
+from pandas import DataFrame, util as pd_util
+from geopandas import GeoDataFrame, GeoSeries
+from rasterio.crs import CRS
+from rasterio.transform import Affine
+from shapely.geometry.base import BaseGeometry
+
+from pyorps.core.cost_assumptions import CostAssumptions
+from pyorps.io.geo_dataset import GeoDataset, InMemoryRasterDataset, RasterDataset
+from pyorps.utils.caching import MemoryCache, content_hash
+
+# Content hashes of files by path, modification time and size, so unchanged files are
+# only read once
+_file_hashes = MemoryCache(max_entries=4096)
+
+
+def file_hash(path: str, chunk_size: int = 2 ** 20) -> str:
+    """
+    Calculate a hash of the content of a file.
+
+    Parameters:
+        path: Path to the file
+        chunk_size: Number of bytes read at once
+
+    Returns:
+        Hexadecimal hash string
+    """
+    h = blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_files(path: str) -> list[tuple[str, str]]:
+    """
+    Return the files holding the data of a file or directory source.
+
+    A file comes with the files of the same name and another extension (e.g. the .dbf,
+    .shx, .prj and .cpg files of a shapefile), a directory (e.g. a GeoParquet dataset
+    or a raster store) with all files it contains.
+
+    Parameters:
+        path: Path to the file or directory
+
+    Returns:
+        Sorted pairs of the name of each file relative to the source (the extension
+        for the files of a file source) and its path
+    """
+    if os.path.isdir(path):
+        return sorted((os.path.relpath(os.path.join(root, name), path),
+                       os.path.join(root, name))
+                      for root, _, names in os.walk(path) for name in names)
+    directory, name = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(name)[0]
+    return sorted((entry.name[len(stem):], entry.path)
+                  for entry in os.scandir(directory)
+                  if entry.name.startswith(stem + ".") and entry.is_file())
+
+
+def _cached_file_hash(path: str) -> str:
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    return _file_hashes.get_or_create(key, lambda: file_hash(path), lambda _: 0)
+
+
+def fingerprint(value: Any) -> Any:
+    """
+    Convert an input of the rasterization to a stable, hashable description of its
+    content.
+
+    Existing files and directories are described by the hashes of the content of all
+    their source_files, GeoDataFrames by the hash of their rows and geometries, cost
+    assumptions by their cost values and GeoDatasets by their source, crs, bbox and
+    mask.
+
+    Parameters:
+        value: The input
+
+    Returns:
+        A nested tuple describing the content of the input
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if os.path.isfile(value) or os.path.isdir(value):
+            return "files", tuple((name, _cached_file_hash(path))
+                                  for name, path in source_files(value))
+        return value
+    if isinstance(value, dict):
+        return "dict", tuple(sorted(((repr(fingerprint(k)), fingerprint(v))
+                                     for k, v in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(fingerprint(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return "ndarray", content_hash(value)
+    if isinstance(value, (GeoDataFrame, GeoSeries)):
+        geometry = value.geometry if isinstance(value, GeoDataFrame) else value
+        attributes = value.drop(columns=value.geometry.name) \
+            if isinstance(value, GeoDataFrame) else DataFrame(index=value.index)
+        return ("geodataframe", str(value.crs),
+                content_hash(pd_util.hash_pandas_object(attributes).to_numpy(),
+                             b"".join(wkb or b"" for wkb in geometry.to_wkb())))
+    if isinstance(value, DataFrame):
+        return "dataframe", content_hash(pd_util.hash_pandas_object(value).to_numpy())
+    if isinstance(value, BaseGeometry):
+        return "geometry", value.wkb_hex
+    if isinstance(value, CostAssumptions):
+        return ("cost_assumptions", fingerprint(value.cost_assumptions),
+                value.main_feature, tuple(value.side_features))
+    if isinstance(value, GeoDataset):
+        return (type(value).__name__, fingerprint(value.file_source), str(value.crs),
+                fingerprint(getattr(value, "bbox", None)),
+                fingerprint(getattr(value, "mask", None)))
+    return type(value).__name__, repr(value)
+
+
+class RasterizationCache:
+    """
+    On-disk cache of rasterized datasets keyed by the content of their inputs.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 ** 32):
+        """
+        Parameters:
+            directory: Directory holding the cached rasters. Created if it does not
+                exist.
+            max_bytes: Maximum total size of all cached rasters in bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+            dataset: Any,
+            cost_assumptions: Any,
+            rasterize_parameters: Optional[dict[str, Any]] = None,
+            datasets_to_modify: Optional[list[dict[str, Any]]] = None
+    ) -> str:
+        """
+        Create the key of a rasterized dataset.
+
+        Parameters:
+            dataset: The rasterized dataset or its source
+            cost_assumptions: The cost assumptions (file path, dictionary or
+                CostAssumptions). Files and dictionaries are loaded, so equal cost
+                values give equal keys.
+            rasterize_parameters: Parameters of GeoRasterizer.rasterize (e.g.
+                resolution_in_m, geometry_buffer_m, bounding_box)
+            datasets_to_modify: Parameters of the calls of
+                GeoRasterizer.modify_raster_from_dataset in their order
+
+        Returns:
+            The key
+        """
+        if cost_assumptions is not None and \
+                not isinstance(cost_assumptions, CostAssumptions):
+            cost_assumptions = CostAssumptions(cost_assumptions)
+        return content_hash(fingerprint(dataset), fingerprint(cost_assumptions),
+                            fingerprint(rasterize_parameters or {}),
+                            fingerprint(datasets_to_modify or []))
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return f"{base}.npy", f"{base}.json"
+
+    def get(self, key: str) -> Optional[RasterDataset]:
+        """
+        Return the cached raster dataset of key.
+
+        The raster is opened as copy-on-write memory map, so modifications do not
+        change the cached file.
+
+        Parameters:
+            key: Key of the raster
+
+        Returns:
+            The cached raster dataset or None if the key is not cached
+        """
+        data_path, metadata_path = self._paths(key)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            data = np.load(data_path, mmap_mode="c")
+            os.utime(metadata_path)
+        except (FileNotFoundError, ValueError, OSError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        crs = CRS.from_wkt(metadata["crs"]) if metadata["crs"] else None
+        return InMemoryRasterDataset(data, crs, Affine(*metadata["transform"]))
+
+    def put(self, key: str, raster_dataset: RasterDataset) -> None:
+        """
+        Store a raster dataset and evict the least recently used rasters if the size
+        limit is exceeded. Rasters larger than the size limit are not stored.
+
+        Parameters:
+            key: Key of the raster
+            raster_dataset: The rasterized dataset
+        """
+        data = np.asarray(raster_dataset.data)
+        if data.nbytes > self.max_bytes:
+            return
+        data_path, metadata_path = self._paths(key)
+        crs = raster_dataset.crs
+        metadata = {
+            "crs": CRS.from_user_input(crs).to_wkt() if crs is not None else None,
+            "transform": list(raster_dataset.transform)[:6],
+        }
+        # The metadata is written last and marks a complete entry
+        tmp_suffix = f".tmp-{os.getpid()}"
+        with open(data_path + tmp_suffix, "wb") as f:
+            np.save(f, data)
+        os.replace(data_path + tmp_suffix, data_path)
+        with open(metadata_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(metadata_path + tmp_suffix, metadata_path)
+        self.stats["writes"] += 1
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used rasters until the cache fits its size limit.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            data_path, metadata_path = self._paths(name[:-5])
+            try:
+                size = os.path.getsize(data_path) + os.path.getsize(metadata_path)
+                entries.append((os.path.getmtime(metadata_path), size, name[:-5]))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # The metadata is removed first, so the entry is never read incomplete
+            for path in reversed(self._paths(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """
+        Remove all cached rasters.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith((".npy", ".json")):
+                os.remove(os.path.join(self.directory, name))
@@ -1,20 +1,32 @@
 
-from typing import Union, Optional
+from typing import Union, Optional, Any, TYPE_CHECKING
 from copy import deepcopy
+from inspect import signature
 
 import numpy as np
 from geopandas import GeoDataFrame
-from rasterio import open as rio_open
 from rasterio.features import rasterize, geometry_mask
 from rasterio.transform import Affine, from_bounds
+from shapely import get_num_coordinates, total_bounds
 from shapely.geometry import Polygon, box
 
 # Changed to relative imports from other modules
 from pyorps.io.geo_dataset import (initialize_geo_dataset, VectorDataset, 
-                                   RasterDataset, InMemoryRasterDataset, GeoDataset)
+                                   RasterDataset, InMemoryRasterDataset, GeoDataset,
+                                   ParquetVectorDataset)
 from pyorps.core.types import (InputDataType, CostAssumptionsType, BboxType, 
                                GeometryMaskType)
 from pyorps.core.cost_assumptions import CostAssumptions
+from pyorps.io.raster_writer import write_geotiff
+from pyorps.utils.caching import MemoryCache, content_hash
+
+if TYPE_CHECKING:
+    # The rasterization cache is only imported when it is used
+    from pyorps.raster.rasterization_cache import RasterizationCache
+
+# Process-wide cache of the reprojected, clipped and buffered GeoDataFrames of the
+# datasets used in GeoRasterizer.modify_raster_from_dataset with use_cache=True
+prepared_dataset_cache = MemoryCache(max_bytes=2 ** 30)
 
 
 class GeoRasterizer:
@@ -61,6 +73,12 @@ class GeoRasterizer:
             self.cost_manager = CostAssumptions(cost_assumptions)
 
         if self.base_dataset.data is None:
+            # Only read the columns the cost assumptions are based on from a vector
+            # store
+            if isinstance(self.base_dataset, ParquetVectorDataset) and \
+                    "columns" not in kwargs and self.cost_manager.main_feature:
+                kwargs["columns"] = [self.cost_manager.main_feature,
+                                     *self.cost_manager.side_features]
             self.base_dataset.load_data(**kwargs)
 
         if isinstance(self.base_dataset, RasterDataset):
@@ -193,7 +211,10 @@ class GeoRasterizer:
             save_path: Optional[str] = None,
             dtype: str = "uint16",
             geometry_buffer_m: float = 0,
-            bounding_box: Optional[Polygon] = None
+            bounding_box: Optional[Polygon] = None,
+            cache: Optional["RasterizationCache"] = None,
+            tile_size: Optional[int] = None,
+            processes: Optional[int] = None
     ) -> RasterDataset:
         """
         Rasterize the base dataset based on a specified field.
@@ -206,6 +227,14 @@ class GeoRasterizer:
             dtype: Data type for the output raster
             geometry_buffer_m: Buffer to apply to the dataset geometries
             bounding_box: Bounding box to define the rasterization extent
+            cache: RasterizationCache to reuse the raster of an earlier run with the
+                same base dataset, cost assumptions and parameters
+            tile_size: If given, the raster is rasterized in tiles of tile_size x
+                tile_size cells in a pool of worker processes (see
+                pyorps.raster.tiled_rasterization). The result is the same as without
+                tiles.
+            processes: Number of worker processes of the tiled rasterization. If None,
+                the number of CPUs is used.
 
         Returns:
             tuple of (raster_data, transform)
@@ -216,6 +245,24 @@ class GeoRasterizer:
         if self.base_dataset is None or self.base_dataset.data is None:
             raise ValueError("No base dataset loaded to rasterize")
 
+        cache_key = None
+        if cache is not None:
+            parameters = self.rasterize_parameters(
+                field_name=field_name, resolution_in_m=resolution_in_m,
+                fill_value=fill_value, dtype=dtype,
+                geometry_buffer_m=geometry_buffer_m, bounding_box=bounding_box
+            )
+            cache_key = cache.make_key(self.base_dataset, self.cost_manager,
+                                       parameters)
+            raster_dataset = cache.get(cache_key)
+            if raster_dataset is not None:
+                self.raster = raster_dataset.data
+                self.transform = raster_dataset.transform
+                self.raster_dataset = raster_dataset
+                if save_path is not None:
+                    self.save_raster(save_path)
+                return self.raster_dataset
+
         # Add cost field
         if field_name == 'cost':
             self.cost_manager.apply_to_geodataframe(self.base_data)
@@ -247,19 +294,6 @@ class GeoRasterizer:
 
             # Create a transformation object to convert between coordinate systems
             self.transform = from_bounds(*buffered.total_bounds, *out_shape[::-1])
-
-            # Create a generator of shapes (geometry, value) pairs for rasterization
-            geometry_field_name = zip(buffered['geometry'], buffered[field_name])
-            shapes = ((geom, value) for geom, value in geometry_field_name)
-
-            # Rasterize the shapes into a 2D array
-            self.raster = rasterize(
-                shapes,
-                out_shape=out_shape,
-                fill=fill_value,
-                dtype=dtype,
-                transform=self.transform
-            )
         else:
             # Calculate the output shape based on the bounding box
             out_shape = self._calculate_out_shape_from_bounding_box(bounding_box,
@@ -268,37 +302,64 @@ class GeoRasterizer:
             # Create a transformation object
             self.transform = from_bounds(*bounding_box.bounds, *out_shape[::-1])
 
-            # Create initial raster with fill value
+        if tile_size is not None:
+            from pyorps.raster.tiled_rasterization import rasterize_tiled
+
+            # The shapes are sorted by value, so higher cost values are burned last
+            self.raster = rasterize_tiled(buffered['geometry'].values,
+                                          buffered[field_name].values, out_shape,
+                                          self.transform, fill_value, dtype,
+                                          tile_size=tile_size, processes=processes)
+        else:
+            # Create a generator of shapes (geometry, value) pairs for rasterization
+            geometry_field_name = zip(buffered['geometry'], buffered[field_name])
+            shapes = ((geom, value) for geom, value in geometry_field_name)
+
+            # Rasterize the shapes into a 2D array in a single pass. The shapes are
+            # sorted by value and later shapes overwrite earlier ones, so higher cost
+            # values have priority.
             self.raster = rasterize(
-                [(bounding_box, fill_value)],
+                shapes,
                 out_shape=out_shape,
                 fill=fill_value,
                 dtype=dtype,
                 transform=self.transform
             )
 
-            # Override with dataset values
-            for unique_value in buffered[field_name].unique():
-                value_geoms = buffered.loc[buffered[field_name] == unique_value]
-                geoms_field_name = zip(value_geoms['geometry'], value_geoms[field_name])
-                shapes = ((geom, value) for geom, value in geoms_field_name)
-                rasterize(
-                    shapes,
-                    out_shape=out_shape,
-                    fill=fill_value,
-                    out=self.raster,
-                    dtype=dtype,
-                    transform=self.transform
-                )
-
         self.raster_dataset = InMemoryRasterDataset(self.raster,
                                                     self.crs,
                                                     self.transform)
+        if cache_key is not None:
+            cache.put(cache_key, self.raster_dataset)
+
         # Write the rasterized data to a new raster file if a save path is provided
         if save_path is not None:
             self.save_raster(save_path)
         return self.raster_dataset
 
+    @staticmethod
+    def rasterize_parameters(**kwargs) -> dict[str, Any]:
+        """
+        Complete keyword arguments of rasterize with its default values.
+
+        The parameters define the rasterized output and form a part of the key of
+        a RasterizationCache. save_path, cache and the options of the tiled
+        rasterization (tile_size and processes), which do not change the output, are
+        not included.
+
+        Parameters:
+            **kwargs: Keyword arguments of rasterize
+
+        Returns:
+            Dictionary with all parameters of rasterize defining its output
+        """
+        parameters = {name: parameter.default for name, parameter
+                      in signature(GeoRasterizer.rasterize).parameters.items()
+                      if name not in ("self", "save_path", "cache", "tile_size",
+                                      "processes")}
+        parameters.update({k: v for k, v in kwargs.items() if k in parameters})
+        return parameters
+
     def _calculate_out_shape_from_bounding_box(
             self,
             bounding_box: Polygon,
@@ -406,7 +467,9 @@ class GeoRasterizer:
             ignore_value: Optional[float] = 65535,
             multiply: bool = False) -> np.ndarray:
         """
-        Modifies the raster cells inside the polygons of a GeoDataFrame.
+        Modifies the raster cells inside the polygons of a GeoDataFrame. The masks are
+        only computed in the window of the raster covering the bounds of the polygons,
+        so the effort scales with the modified area instead of the raster size.
 
         Parameters:
             gdf: The GeoDataFrame containing polygons to use for masking
@@ -420,31 +483,65 @@ class GeoRasterizer:
         if self.raster is None or self.transform is None:
             raise ValueError("No raster data available to modify")
 
+        # Only the cells in the window of the bounds of the geometries are modified
+        window = self._geometry_window(gdf['geometry'].values)
+        if window is None:
+            return self.raster
+        rows, cols = window
+        raster = self.raster[..., rows, cols]
+
         # Create a mask from the geometries in the GeoDataFrame
         mask_array = geometry_mask(
             gdf['geometry'].values,
-            transform=self.transform,
+            transform=self.transform * Affine.translation(cols.start, rows.start),
             invert=True,  # Invert the mask to keep the area inside the polygons
-            out_shape=self.raster.shape
+            out_shape=raster.shape[-2:]
         )
 
         if ignore_value is None:
-            ignore_value_mask = np.ones_like(self.raster, dtype=bool)
+            mask = mask_array
         else:
-            ignore_value_mask = self.raster != ignore_value
-
-        mask = mask_array & ignore_value_mask
+            mask = mask_array & (raster != ignore_value)
 
         # Modify the raster values based on the specified parameters
         if multiply:
             # Set the raster cells to a multiple of the existing values
-            self.raster[mask] = self.raster[mask] * value
+            raster[mask] = raster[mask] * value
         else:
             # Set the raster cells to the new value
-            self.raster[mask] = value
+            raster[mask] = value
 
         return self.raster
 
+    def _geometry_window(
+            self,
+            geometries: np.ndarray
+    ) -> Optional[tuple[slice, slice]]:
+        """
+        Return the rows and columns of the raster cells overlapping the bounds of
+        geometries.
+
+        Parameters:
+            geometries: Array of geometries in the crs of the raster
+
+        Returns:
+            Slices of the rows and columns or None if the geometries do not overlap
+            the raster
+        """
+        min_x, min_y, max_x, max_y = total_bounds(geometries)
+        if np.isnan(min_x):
+            return None
+        cols, rows = ~self.transform * (np.array([min_x, max_x, min_x, max_x]),
+                                        np.array([min_y, min_y, max_y, max_y]))
+        height, width = self.raster.shape[-2:]
+        row_start, row_stop = max(int(np.floor(rows.min())), 0), \
+            min(int(np.ceil(rows.max())), height)
+        col_start, col_stop = max(int(np.floor(cols.min())), 0), \
+            min(int(np.ceil(cols.max())), width)
+        if row_start >= row_stop or col_start >= col_stop:
+            return None
+        return slice(row_start, row_stop), slice(col_start, col_stop)
+
     def modify_raster_from_dataset(
             self,
             input_data: InputDataType,
@@ -458,6 +555,7 @@ class GeoRasterizer:
             zone_field: Optional[str] = None,
             forbidden_zone: Optional[str] = None,
             forbidden_value: int = 65535,
+            use_cache: bool = False,
             **kwargs
     ) -> np.ndarray:
         """
@@ -477,6 +575,13 @@ class GeoRasterizer:
             zone_field: Field name for zones in the dataset
             forbidden_zone: Zone value that should be treated as forbidden
             forbidden_value: Value to use for forbidden areas
+            use_cache: If True, the loaded, reprojected, clipped and buffered
+                GeoDataFrame is kept in the process-wide prepared_dataset_cache, keyed
+                by the source, crs, bbox, mask and buffer. File sources are keyed by
+                the content of all their files (e.g. the .dbf of a shapefile), which
+                is only hashed again when their modification time or size changes.
+                Studies which only vary the cost assumptions skip loading and the
+                geometry operations.
             **kwargs: Additional keyword arguments, passed to the loading function
                 of the GeoDataset
 
@@ -493,14 +598,34 @@ class GeoRasterizer:
         if mask is None:
             mask = self.mask
 
-        dataset = initialize_geo_dataset(input_data, crs=self.crs, bbox=bbox,
-                                         mask=mask,
-                                         transform=transform)
-        dataset.load_data(**kwargs)
-        gdf = dataset.data
-
-        # Apply buffer if needed
-        gdf = self.create_buffer(gdf, geometry_buffer_m)
+        gdf = None
+        cache_key = None
+        if use_cache:
+            from pyorps.raster.rasterization_cache import fingerprint
+
+            cache_key = content_hash(fingerprint(input_data), str(self.crs),
+                                     fingerprint(bbox), fingerprint(mask),
+                                     fingerprint(transform), float(geometry_buffer_m),
+                                     fingerprint(kwargs))
+            gdf = prepared_dataset_cache.get(cache_key)
+            if gdf is not None:
+                # The cost assumptions are written into the GeoDataFrame
+                gdf = gdf.copy()
+
+        if gdf is None:
+            dataset = initialize_geo_dataset(input_data, crs=self.crs, bbox=bbox,
+                                             mask=mask,
+                                             transform=transform)
+            dataset.load_data(**kwargs)
+            gdf = dataset.data
+
+            # Apply buffer if needed
+            gdf = self.create_buffer(gdf, geometry_buffer_m)
+            if cache_key is not None:
+                prepared = gdf.copy()
+                nbytes = (prepared.memory_usage(deep=True).sum() +
+                          16 * get_num_coordinates(prepared.geometry.values).sum())
+                prepared_dataset_cache.put(cache_key, prepared, int(nbytes))
         if isinstance(cost_assumptions, float) or isinstance(cost_assumptions, int):
             self._modify_raster_from_dataset_simple_cost_assumptions(gdf,
                                                                      cost_assumptions,
@@ -520,23 +645,10 @@ class GeoRasterizer:
                 value_geoms = gdf.loc[gdf['cost'] == unique_value]
                 if value_geoms.empty:
                     continue
-                geometry_field_names = zip(value_geoms['geometry'], value_geoms['cost'])
-                shapes = ((geom, value) for geom, value in geometry_field_names)
-
-                # Create a mask from the geometries in the GeoDataFrame
-                mask_array = geometry_mask(
-                    shapes,
-                    transform=self.transform,
-                    invert=True,  # Invert the mask to keep the area inside the polygons
-                    out_shape=self.raster.shape
-                )
-                if ignore_value is None:
-                    ignore_value_mask = np.ones_like(self.raster, dtype=bool)
-                else:
-                    ignore_value_mask = self.raster != ignore_value
-
-                mask = mask_array & ignore_value_mask
-                self.raster[mask] = unique_value
+                # Set the cells inside the geometries of the cost value, masked in
+                # the window of the geometries only
+                self.modify_raster_with_geodataframe(value_geoms, unique_value,
+                                                     ignore_value=ignore_value)
         return self.raster
 
     def _modify_raster_from_dataset_simple_cost_assumptions(
@@ -597,37 +709,22 @@ class GeoRasterizer:
                 multiply=multiply
             )
 
-    def save_raster(self, save_path: str) -> None:
+    def save_raster(self, save_path: str, **geotiff_options) -> None:
         """
         Save the rasterized data to a file.
 
         Parameters:
             save_path: Path to save the raster file
+            **geotiff_options: Options of pyorps.io.raster_writer.write_geotiff (e.g.
+                blocksize, compress, overviews or cog). By default, the raster is
+                written with 256x256 tiles and DEFLATE compression.
         """
         if self.raster is None or self.transform is None:
             msg = "No raster data available to save. Call rasterize() first."
             raise ValueError(msg)
 
-        with rio_open(
-                save_path,
-                'w',
-                # Specify the output format as GeoTIFF
-                driver='GTiff',
-                # Height of the raster
-                height=self.raster_dataset.shape[0],
-                # Width of the raster
-                width=self.raster_dataset.shape[1],
-                # Number of bands in the output raster
-                count=1,
-                # Data type of the raster
-                dtype=self.raster_dataset.dtype,
-                # Coordinate reference system of the raster
-                crs=self.raster_dataset.crs,
-                # Transformation for the raster
-                transform=self.raster_dataset.transform
-        ) as dst:
-            # Write the raster data to the first band
-            dst.write(self.raster_dataset.data, 1)
+        write_geotiff(save_path, self.raster_dataset.data, self.raster_dataset.crs,
+                      self.raster_dataset.transform, **geotiff_options)
 
     def shrink_raster(self, exclude_value: int) -> np.ndarray:
         """
@@ -0,0 +1,173 @@
+"""
+Tiled rasterization of vector data in a pool of worker processes.
+
+The output grid is split into square tiles. An STRtree of the geometries selects the
+geometries intersecting each tile, and the tiles are rasterized independently in
+worker processes. The geometries are sent to each worker once (as WKB) and the workers
+write their tiles directly into the output raster, which is allocated in shared memory
+and copied once into process memory at the end.
+Within a tile the geometries are burned in the order of the input, so later geometries
+overwrite earlier ones exactly as in a single rasterio.features.rasterize call over the
+whole grid.
+"""
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import shapely
+from rasterio.features import rasterize
+from rasterio.transform import Affine
+from rasterio.windows import Window, bounds as window_bounds, transform as \
+    window_transform
+
+from pyorps.utils.shared_array import (SharedArray, SharedArrayHandle,
+                                       attach_shared_array, spawn_process_pool)
+
+# State of a worker process, set once by the pool initializer
+_worker_state: dict[str, Any] = {}
+
+
+def tile_windows(out_shape: tuple[int, int], tile_size: int) -> list[Window]:
+    """
+    Split a raster into square tiles, row by row.
+
+    Parameters:
+        out_shape: Shape (rows, columns) of the raster
+        tile_size: Width and height of the tiles in cells
+
+    Returns:
+        Windows of the tiles (the tiles of the last row and column may be smaller)
+    """
+    height, width = out_shape
+    return [Window(col, row, min(tile_size, width - col), min(tile_size, height - row))
+            for row in range(0, height, tile_size)
+            for col in range(0, width, tile_size)]
+
+
+def rasterize_tiled(
+        geometries: Sequence[Any],
+        values: Sequence[float],
+        out_shape: tuple[int, int],
+        transform: Affine,
+        fill: float,
+        dtype: str,
+        tile_size: int = 1024,
+        processes: Optional[int] = None
+) -> np.ndarray:
+    """
+    Rasterize geometries tile by tile in a pool of worker processes. The result equals
+    rasterio.features.rasterize(zip(geometries, values), ...) over the whole grid.
+
+    Parameters:
+        geometries: Geometries in the order they are burned (later geometries have
+            priority)
+        values: Value of each geometry
+        out_shape: Shape (rows, columns) of the output raster
+        transform: Affine transformation of the output raster
+        fill: Value of the cells outside the geometries
+        dtype: Data type of the output raster
+        tile_size: Width and height of the tiles in cells
+        processes: Number of worker processes. If None, the number of CPUs is used.
+            With 1, the tiles are rasterized in the calling process.
+
+    Returns:
+        The rasterized array of shape out_shape
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    values = np.asarray(values).astype(dtype)
+    valid = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+    geometries, values = geometries[valid], values[valid]
+
+    tiles = tile_windows(out_shape, tile_size)
+    tile_boxes = shapely.box(*np.array([window_bounds(w, transform)
+                                        for w in tiles]).T)
+    tile_ids, geometry_ids = shapely.STRtree(geometries).query(tile_boxes)
+    # Sorting by tile and geometry keeps the burn order of the geometries in a tile
+    order = np.lexsort((geometry_ids, tile_ids))
+    tile_ids, geometry_ids = tile_ids[order], geometry_ids[order]
+    starts = np.searchsorted(tile_ids, np.arange(len(tiles) + 1))
+    jobs = [(tiles[i], geometry_ids[starts[i]:starts[i + 1]])
+            for i in range(len(tiles)) if starts[i + 1] > starts[i]]
+
+    if processes == 1 or len(jobs) <= 1:
+        raster = np.full(out_shape, fill, dtype=dtype)
+        for window, ids in jobs:
+            rows, cols = window.toslices()
+            raster[rows, cols] = _rasterize_window(window, geometries[ids], values[ids],
+                                                   transform, fill, dtype)
+        return raster
+
+    with SharedArray(out_shape, dtype) as shared:
+        shared.array.fill(fill)
+        with spawn_process_pool(processes, _init_worker,
+                                (shared.handle, shapely.to_wkb(geometries), values,
+                                 transform, fill)) as executor:
+            list(executor.map(_rasterize_tile, *zip(*jobs)))
+        return shared.release(copy=True)
+
+
+def _rasterize_window(
+        window: Window,
+        geometries: np.ndarray,
+        values: np.ndarray,
+        transform: Affine,
+        fill: float,
+        dtype: str
+) -> np.ndarray:
+    """
+    Rasterize geometries into a window of the output raster.
+
+    Parameters:
+        window: Window of the tile
+        geometries: Geometries intersecting the tile in burn order
+        values: Value of each geometry
+        transform: Affine transformation of the output raster
+        fill: Value of the cells outside the geometries
+        dtype: Data type of the output raster
+
+    Returns:
+        The rasterized tile
+    """
+    return rasterize(zip(geometries, values),
+                     out_shape=(int(window.height), int(window.width)),
+                     fill=fill,
+                     dtype=dtype,
+                     transform=window_transform(window, transform))
+
+
+def _init_worker(
+        handle: SharedArrayHandle,
+        wkb: np.ndarray,
+        values: np.ndarray,
+        transform: Affine,
+        fill: float
+) -> None:
+    """
+    Attach the worker process to the shared output raster and decode the geometries.
+
+    Parameters:
+        handle: Handle of the shared output raster
+        wkb: Geometries as WKB
+        values: Value of each geometry
+        transform: Affine transformation of the output raster
+        fill: Value of the cells outside the geometries
+    """
+    shm, raster = attach_shared_array(handle)
+    _worker_state.update(shm=shm, raster=raster, geometries=shapely.from_wkb(wkb),
+                         values=values, transform=transform, fill=fill)
+
+
+def _rasterize_tile(window: Window, geometry_ids: np.ndarray) -> None:
+    """
+    Rasterize a tile and write it into the shared output raster.
+
+    Parameters:
+        window: Window of the tile
+        geometry_ids: Indices of the geometries intersecting the tile in burn order
+    """
+    state = _worker_state
+    rows, cols = window.toslices()
+    raster = state["raster"]
+    raster[rows, cols] = _rasterize_window(window, state["geometries"][geometry_ids],
+                                           state["values"][geometry_ids],
+                                           state["transform"], state["fill"],
+                                           raster.dtype)
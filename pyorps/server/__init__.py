@@ -0,0 +1,21 @@
+"""
+Local routing server keeping rasters and graphs warm in memory, and its client.
+
+Start the server with a JSON configuration of the datasets:
+
+    python -m pyorps.server --config routing_server.json
+"""
+
+from .._lazy import attach_lazy_attributes
+
+# Attributes are imported from their submodules on first access
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    ".routing_server": ["RoutingServer", "RoutingRequestHandler"],
+    ".client": ["RoutingClient"],
+})
+
+__all__ = [
+    "RoutingServer",
+    "RoutingRequestHandler",
+    "RoutingClient",
+]
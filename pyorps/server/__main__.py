@@ -0,0 +1,39 @@
+"""
+Command line entry point of the routing server.
+"""
+import argparse
+
+from pyorps.server.routing_server import RoutingServer
+
+
+def main(args: list[str] = None) -> None:
+    """
+    Load the configured datasets and serve requests until interrupted.
+
+    Parameters:
+        args: Command line arguments. If None, sys.argv is used.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pyorps.server",
+        description="Local routing server keeping rasters and graphs in memory."
+    )
+    parser.add_argument("--config", required=True,
+                        help="JSON file with the datasets to serve")
+    parser.add_argument("--host", help="Host name to bind to")
+    parser.add_argument("--port", type=int, help="Port to bind to")
+    parser.add_argument("--max-path-finders", type=int,
+                        help="Maximum number of cached PathFinders")
+    parsed = parser.parse_args(args)
+
+    server = RoutingServer.from_config(parsed.config, host=parsed.host,
+                                       port=parsed.port,
+                                       max_path_finders=parsed.max_path_finders)
+    print(f"Serving routes on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
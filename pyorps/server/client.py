@@ -0,0 +1,121 @@
+"""
+Thin client for the local routing server.
+"""
+import json
+from typing import Any, Optional, Union
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+from pyorps.core.exceptions import RoutingServerError
+from pyorps.core.types import CoordinateTuple
+
+
+class RoutingClient:
+    """
+    Client sending route and cost matrix requests to a RoutingServer.
+    """
+
+    def __init__(self, url: str = "http://127.0.0.1:8765", timeout: float = 300.0):
+        """
+        Parameters:
+            url: Base URL of the routing server
+            timeout: Timeout of a single request in seconds
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def health(self) -> dict[str, Any]:
+        """
+        Check whether the server is running.
+        """
+        return self._request("GET", "/health")
+
+    def datasets(self) -> dict[str, Any]:
+        """
+        Return the names, shapes and crs of the datasets loaded by the server.
+        """
+        return self._request("GET", "/datasets")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the cache statistics of the server.
+        """
+        return self._request("GET", "/stats")
+
+    def route(
+            self,
+            dataset: str,
+            source: Union[CoordinateTuple, list[CoordinateTuple]],
+            target: Union[CoordinateTuple, list[CoordinateTuple]],
+            **options
+    ) -> list[dict[str, Any]]:
+        """
+        Find the route(s) between source and target coordinates.
+
+        Parameters:
+            dataset: Name of the dataset configured on the server
+            source: Source coordinate or list of source coordinates
+            target: Target coordinate or list of target coordinates
+            **options: algorithm, pairwise, calculate_metrics, search_space_buffer_m,
+                neighborhood_str, graph_api or ignore_max_cost
+
+        Returns:
+            List of paths as dictionaries (path_coords, total_length, total_cost,
+            length_by_category, runtimes, ...)
+        """
+        request = {"dataset": dataset, "source": source, "target": target, **options}
+        return self._request("POST", "/route", request)["paths"]
+
+    def cost_matrix(
+            self,
+            dataset: str,
+            sources: list[CoordinateTuple],
+            targets: list[CoordinateTuple],
+            **options
+    ) -> np.ndarray:
+        """
+        Calculate the costs of the shortest paths between sources and targets.
+
+        Parameters:
+            dataset: Name of the dataset configured on the server
+            sources: List of source coordinates
+            targets: List of target coordinates
+            **options: algorithm or PathFinder options
+
+        Returns:
+            Array with one row per source and one column per target (inf if a target
+            cannot be reached)
+        """
+        request = {"dataset": dataset, "sources": sources, "targets": targets,
+                   **options}
+        costs = self._request("POST", "/cost_matrix", request)["costs"]
+        return np.array([[np.inf if c is None else c for c in row] for row in costs],
+                        dtype=np.float64)
+
+    def _request(self, method: str, endpoint: str,
+                 body: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        Send a request to the server and decode its JSON response.
+
+        Parameters:
+            method: HTTP method
+            endpoint: Path of the endpoint
+            body: JSON-compatible request body
+
+        Returns:
+            The decoded response
+        """
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        request = Request(self.url + endpoint, data=data, method=method,
+                          headers={"Content-Type": "application/json"})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except (ValueError, AttributeError):
+                message = str(e)
+            raise RoutingServerError(message, e.code) from e
@@ -0,0 +1,471 @@
+"""
+Local routing server that keeps rasters and graphs warm in memory.
+
+A script run pays the raster loading, the import of the graph library, the numba
+compilation and the graph construction before its first query. The RoutingServer pays
+these costs once: the configured rasters (and cost assumptions) are loaded at start-up
+and the PathFinders of recent queries, including their search windows and graphs, are
+kept in an LRU cache with a memory budget. A query whose search space lies inside the
+search space of a cached PathFinder is answered by that PathFinder, so repeated queries
+for the same region are answered without any setup work.
+
+The server speaks JSON over HTTP and only uses the standard library:
+
+    GET  /health        Liveness check
+    GET  /datasets      Names, shapes and crs of the loaded rasters
+    GET  /stats         Cache statistics
+    POST /route         Route between source and target coordinates
+    POST /cost_matrix   Costs of the shortest paths between sources and targets
+"""
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Optional
+
+import numpy as np
+
+from pyorps.core.exceptions import NoPathFoundError, RoutingServerError
+from pyorps.core.path import Path, PathCollection
+from pyorps.graph.path_finder import PathFinder, get_graph_api_class
+from pyorps.io.geo_dataset import (RasterDataset, VectorDataset,
+                                   initialize_geo_dataset)
+from pyorps.raster.handler import RasterHandler
+from pyorps.raster.rasterizer import GeoRasterizer
+from pyorps.utils.caching import MemoryCache
+
+# Options of a request that define the search window and the graph of a PathFinder
+PATH_FINDER_OPTIONS = ("search_space_buffer_m", "neighborhood_str", "graph_api",
+                       "ignore_max_cost")
+
+
+class RoutingServer:
+    """
+    Routing server holding loaded rasters and an LRU cache of warmed PathFinders.
+
+    The routing logic is available through the methods route and cost_matrix, which
+    take and return JSON-compatible dictionaries. serve_forever and start expose these
+    methods over HTTP.
+    """
+
+    def __init__(
+            self,
+            datasets: dict[str, dict[str, Any]],
+            host: str = "127.0.0.1",
+            port: int = 8765,
+            max_path_finders: int = 32,
+            max_cache_bytes: int = 2 ** 31
+    ):
+        """
+        Load all configured datasets.
+
+        Parameters:
+            datasets: Mapping of dataset names to dataset configurations. Each
+                configuration needs a "source" (a raster or vector dataset source) and
+                can define "crs", "cost_assumptions", "datasets_to_modify",
+                "rasterize" (keyword arguments for GeoRasterizer.rasterize) and the
+                defaults for the PathFinder options "search_space_buffer_m",
+                "neighborhood_str", "graph_api" and "ignore_max_cost".
+            host: Host name the HTTP server binds to
+            port: Port the HTTP server binds to. Use 0 to pick a free port.
+            max_path_finders: Maximum number of PathFinders kept in the cache
+            max_cache_bytes: Memory budget of the cached search windows and graphs in
+                bytes
+        """
+        self.host = host
+        self.port = port
+        self.max_path_finders = max_path_finders
+        self.max_cache_bytes = max_cache_bytes
+
+        self.datasets: dict[str, RasterDataset] = {}
+        self.defaults: dict[str, dict[str, Any]] = {}
+        for name, config in datasets.items():
+            self.datasets[name] = self._load_dataset(config)
+            self.defaults[name] = {k: config[k] for k in PATH_FINDER_OPTIONS
+                                   if k in config}
+            # Import the graph library at start-up instead of with the first query
+            get_graph_api_class(self.defaults[name].get("graph_api", "networkit"))
+
+        self._path_finders = MemoryCache(max_bytes=max_cache_bytes,
+                                         max_entries=max_path_finders)
+        self._stats_lock = Lock()
+        self.stats = {"requests": 0, "hits": 0, "misses": 0}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[Thread] = None
+
+    @classmethod
+    def from_config(cls, config_path: str, **kwargs) -> "RoutingServer":
+        """
+        Create a RoutingServer from a JSON configuration file.
+
+        The file contains the "datasets" mapping and optionally "host", "port",
+        "max_path_finders" and "max_cache_bytes". Keyword arguments overwrite the
+        values of the file.
+
+        Parameters:
+            config_path: Path to the JSON configuration file
+            **kwargs: Values overwriting the configuration file
+
+        Returns:
+            The RoutingServer
+        """
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        config.update({k: v for k, v in kwargs.items() if v is not None})
+        return cls(**config)
+
+    @staticmethod
+    def _load_dataset(config: dict[str, Any]) -> RasterDataset:
+        """
+        Load (and rasterize or modify) a configured dataset once.
+
+        Parameters:
+            config: Configuration of the dataset
+
+        Returns:
+            The loaded RasterDataset with read-only data
+        """
+        dataset = initialize_geo_dataset(config["source"], config.get("crs"))
+        cost_assumptions = config.get("cost_assumptions")
+        datasets_to_modify = config.get("datasets_to_modify") or []
+
+        if isinstance(dataset, VectorDataset):
+            if cost_assumptions is None:
+                raise ValueError("Cost assumptions must be provided when using vector "
+                                 "data")
+            geo_rasterizer = GeoRasterizer(dataset, cost_assumptions)
+            geo_rasterizer.rasterize(**config.get("rasterize", {}))
+        else:
+            dataset.load_data()
+            if cost_assumptions is None and not datasets_to_modify:
+                geo_rasterizer = None
+            else:
+                geo_rasterizer = GeoRasterizer(dataset, cost_assumptions)
+
+        if geo_rasterizer is not None:
+            for params in datasets_to_modify:
+                geo_rasterizer.modify_raster_from_dataset(**params)
+            dataset = geo_rasterizer.raster_dataset
+
+        # Search windows are views of the loaded raster and must never modify it
+        dataset.data.flags.writeable = False
+        return dataset
+
+    def route(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Find the route(s) between the source and target coordinates of a request.
+
+        Parameters:
+            request: Dictionary with "dataset", "source" and "target" and optionally
+                "algorithm", "pairwise", "calculate_metrics" and PathFinder options
+
+        Returns:
+            Dictionary with a list of JSON-compatible paths under "paths"
+        """
+        source = self._coordinates(request, "source")
+        target = self._coordinates(request, "target")
+        path_finder = self._get_path_finder(request, source, target)
+        try:
+            result = path_finder.query_route(
+                source, target,
+                algorithm=request.get("algorithm", "dijkstra"),
+                calculate_metrics=request.get("calculate_metrics", True),
+                pairwise=request.get("pairwise", False)
+            )
+        except NoPathFoundError as e:
+            raise RoutingServerError(str(e), HTTPStatus.UNPROCESSABLE_ENTITY)
+        paths = [result] if isinstance(result, Path) else list(result)
+        return {"paths": [self._path_to_dict(path) for path in paths]}
+
+    def cost_matrix(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Calculate the costs of the shortest paths between sources and targets.
+
+        Parameters:
+            request: Dictionary with "dataset", "sources" and "targets" and optionally
+                "algorithm" and PathFinder options
+
+        Returns:
+            Dictionary with the matrix under "costs" (rows for sources, columns for
+            targets, None if a target cannot be reached)
+        """
+        sources = self._coordinates(request, "sources")
+        targets = self._coordinates(request, "targets")
+        path_finder = self._get_path_finder(request, sources, targets)
+        costs = path_finder.cost_matrix(sources, targets,
+                                        algorithm=request.get("algorithm",
+                                                              "dijkstra"))
+        return {"costs": [[float(c) if np.isfinite(c) else None for c in row]
+                          for row in costs]}
+
+    def dataset_info(self) -> dict[str, Any]:
+        """
+        Describe the loaded datasets.
+
+        Returns:
+            Dictionary with the shape, crs, transform and PathFinder defaults of every
+            dataset
+        """
+        return {name: {"shape": list(dataset.data.shape),
+                       "crs": str(dataset.crs),
+                       "transform": list(dataset.transform)[:6],
+                       "defaults": self.defaults[name]}
+                for name, dataset in self.datasets.items()}
+
+    def cache_stats(self) -> dict[str, Any]:
+        """
+        Return the statistics of the PathFinder cache.
+
+        Returns:
+            Dictionary with the number of requests, hits, misses, evictions, the
+            number and the size of the cached PathFinders
+        """
+        with self._stats_lock:
+            return {**self.stats,
+                    "evictions": self._path_finders.stats["evictions"],
+                    "cached_path_finders": len(self._path_finders),
+                    "max_path_finders": self.max_path_finders,
+                    "cached_bytes": self._path_finders.nbytes,
+                    "max_cache_bytes": self.max_cache_bytes}
+
+    def _get_path_finder(self, request: dict[str, Any], source: Any,
+                         target: Any) -> PathFinder:
+        """
+        Return a cached PathFinder whose search space contains the search space of
+        the query or create and cache a new one.
+
+        Parameters:
+            request: The request defining the dataset and the PathFinder options
+            source: Normalized source coordinates
+            target: Normalized target coordinates
+
+        Returns:
+            PathFinder with a raster handler and a graph covering the query
+        """
+        name = request.get("dataset")
+        if name not in self.datasets:
+            raise RoutingServerError(f"Unknown dataset: {name}", HTTPStatus.NOT_FOUND)
+        options = dict(self.defaults[name])
+        options.update({k: request[k] for k in PATH_FINDER_OPTIONS if k in request})
+        dataset = self.datasets[name]
+        geometry, window = RasterHandler.search_space(
+            dataset, source, target, options.get("search_space_buffer_m"))
+        prefix = (name, tuple(sorted(options.items())))
+
+        match = self._path_finders.find(
+            lambda key, cached: key[:2] == prefix and
+            cached.raster_handler.buffer_geometry.covers(geometry))
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["hits" if match is not None else "misses"] += 1
+        if match is not None:
+            return match[1]
+
+        path_finder = PathFinder(dataset.data, source, target,
+                                 transform=dataset.transform, crs=dataset.crs,
+                                 **options)
+        # The graph is created before caching, so its size counts for the budget
+        key = prefix + (tuple(window.flatten()), geometry.wkb)
+        self._path_finders.put(key, path_finder,
+                               PathFinder._estimate_graph_nbytes(path_finder.graph_api))
+        return path_finder
+
+    @staticmethod
+    def _coordinates(request: dict[str, Any], field: str) -> Any:
+        """
+        Read and normalize the coordinates of a request field.
+
+        Parameters:
+            request: The request
+            field: Name of the field holding the coordinates
+
+        Returns:
+            A coordinate tuple or a list of coordinate tuples
+        """
+        value = request.get(field)
+        if not value:
+            raise RoutingServerError(f"Missing field: {field}")
+        try:
+            if isinstance(value[0], (list, tuple)):
+                return [(float(x), float(y)) for x, y in value]
+            x, y = value
+            return float(x), float(y)
+        except (TypeError, ValueError):
+            raise RoutingServerError(f"Invalid coordinates in field: {field}")
+
+    @staticmethod
+    def _path_to_dict(path: Path) -> dict[str, Any]:
+        """
+        Convert a Path to a JSON-compatible dictionary.
+
+        Parameters:
+            path: The path
+
+        Returns:
+            Dictionary with the path information
+        """
+        def _float_or_none(value):
+            return None if value is None else float(value)
+
+        length_by_category = None
+        if path.length_by_category is not None:
+            length_by_category = {str(k): float(v)
+                                  for k, v in path.length_by_category.items()}
+        return {
+            "path_id": path.path_id,
+            "source": [float(c) for c in path.source],
+            "target": [float(c) for c in path.target],
+            "algorithm": path.algorithm,
+            "graph_api": path.graph_api,
+            "path_coords": np.asarray(path.path_coords, dtype=float).tolist(),
+            "euclidean_distance": float(path.euclidean_distance),
+            "search_space_buffer_m": _float_or_none(path.search_space_buffer_m),
+            "neighborhood": str(path.neighborhood),
+            "total_length": _float_or_none(path.total_length),
+            "total_cost": _float_or_none(path.total_cost),
+            "length_by_category": length_by_category,
+            "runtimes": {k: float(v) for k, v in path.runtimes.items()},
+        }
+
+    def _create_http_server(self) -> ThreadingHTTPServer:
+        """
+        Create the HTTP server and update the port if a free port was requested.
+
+        Returns:
+            The ThreadingHTTPServer
+        """
+        handler = type("BoundRoutingRequestHandler", (RoutingRequestHandler,),
+                       {"routing_server": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._httpd.server_address[1]
+        return self._httpd
+
+    def serve_forever(self) -> None:
+        """
+        Serve HTTP requests until the process is interrupted.
+        """
+        httpd = self._create_http_server()
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
+
+    def start(self) -> "RoutingServer":
+        """
+        Serve HTTP requests in a background thread.
+
+        Returns:
+            The RoutingServer
+        """
+        httpd = self._create_http_server()
+        self._thread = Thread(target=httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """
+        Stop a server started with start.
+        """
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the HTTP server.
+        """
+        return f"http://{self.host}:{self.port}"
+
+
+class RoutingRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP request handler translating JSON requests to RoutingServer calls.
+    """
+    routing_server: RoutingServer = None
+
+    def do_GET(self) -> None:  # noqa
+        """
+        Answer the GET endpoints /health, /datasets and /stats.
+        """
+        endpoints = {
+            "/health": lambda: {"status": "ok"},
+            "/datasets": self.routing_server.dataset_info,
+            "/stats": self.routing_server.cache_stats,
+        }
+        self._dispatch(endpoints, with_body=False)
+
+    def do_POST(self) -> None:  # noqa
+        """
+        Answer the POST endpoints /route and /cost_matrix.
+        """
+        endpoints = {
+            "/route": self.routing_server.route,
+            "/cost_matrix": self.routing_server.cost_matrix,
+        }
+        self._dispatch(endpoints, with_body=True)
+
+    def _dispatch(self, endpoints: dict[str, Any], with_body: bool) -> None:
+        """
+        Call the endpoint of the request path and send its result as JSON.
+
+        Parameters:
+            endpoints: Mapping of request paths to callables
+            with_body: Whether the callable takes the decoded request body
+        """
+        endpoint = endpoints.get(self.path.split("?")[0].rstrip("/"))
+        try:
+            if endpoint is None:
+                raise RoutingServerError(f"Unknown endpoint: {self.path}",
+                                         HTTPStatus.NOT_FOUND)
+            if with_body:
+                result = endpoint(self._read_json())
+            else:
+                result = endpoint()
+            self._send_json(HTTPStatus.OK, result)
+        except RoutingServerError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:  # noqa
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _read_json(self) -> dict[str, Any]:
+        """
+        Read and decode the JSON body of the request.
+
+        Returns:
+            The decoded request body
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise RoutingServerError(f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise RoutingServerError("The request body must be a JSON object")
+        return request
+
+    def _send_json(self, status: int, body: dict[str, Any]) -> None:
+        """
+        Send a JSON response.
+
+        Parameters:
+            status: HTTP status code
+            body: JSON-compatible response body
+        """
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa
+        """
+        Suppress the logging of every request.
+        """
@@ -7,32 +7,37 @@ This module provides:
 3. Utilities for working with raster indices and graph construction
 """
 
-# Import traversal functions
-from .traversal import (
-    # Core path functions
-    calculate_path_metrics_numba,
-    intermediate_steps_numba,
+from .._lazy import attach_lazy_attributes
 
-    # Graph construction helpers
-    construct_edges,
-    get_max_number_of_edges,
+# The traversal functions are imported on first access, which compiles or loads the
+# numba kernels
+__getattr__, __dir__ = attach_lazy_attributes(__name__, {
+    ".traversal": [
+        # Core path functions
+        "calculate_path_metrics_numba",
+        "intermediate_steps_numba",
 
-    # Distance calculations
-    euclidean_distances_numba,
-    get_cost_factor_numba,
+        # Graph construction helpers
+        "construct_edges",
+        "get_max_number_of_edges",
 
-    # Index manipulation
-    ravel_index,
-    calculate_region_bounds,
+        # Distance calculations
+        "euclidean_distances_numba",
+        "get_cost_factor_numba",
 
-    # Node validation
-    is_valid_node,
-    find_valid_nodes,
+        # Index manipulation
+        "ravel_index",
+        "calculate_region_bounds",
 
-    # Path analysis
-    get_outgoing_edges,
-    calculate_segment_length
-)
+        # Node validation
+        "is_valid_node",
+        "find_valid_nodes",
+
+        # Path analysis
+        "get_outgoing_edges",
+        "calculate_segment_length",
+    ],
+})
 
 __all__ = [
     # Core path functions
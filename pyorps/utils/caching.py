@@ -0,0 +1,307 @@
+"""
+Generic caching helpers: content hashes, a memory-budgeted in-process LRU cache and a
+size-limited on-disk array cache.
+
+The DiskArrayCache stores every entry as a directory of .npy files that are opened as
+memory maps on retrieval. Entries are written to a temporary directory and renamed
+into place, so concurrent processes never read partially written entries. The
+modification time of an entry is updated on every hit and the least recently used
+entries are evicted once the size limit of the cache directory is exceeded.
+"""
+import os
+import shutil
+from collections import OrderedDict
+from hashlib import blake2b
+from tempfile import mkdtemp
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Calculate a hash of the content of numpy arrays and other hashable values.
+
+    Arrays are hashed by their dtype, shape and data, all other values by their repr.
+
+    Parameters:
+        *parts: Arrays and values defining the content
+
+    Returns:
+        Hexadecimal hash string
+    """
+    h = blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(f"ndarray{part.dtype.str}{part.shape}".encode())
+            h.update(np.ascontiguousarray(part).data)
+        else:
+            h.update(f"{type(part).__name__}:{part!r}".encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class MemoryCache:
+    """
+    Thread-safe least recently used cache of objects with a memory budget.
+
+    The size of every entry is given when it is stored. The least recently used
+    entries are evicted once the total size exceeds the budget or the number of
+    entries exceeds max_entries.
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 31, max_entries: Optional[int] = None):
+        """
+        Parameters:
+            max_bytes: Memory budget of all entries in bytes
+            max_entries: Maximum number of entries. If None, only the memory budget
+                limits the cache.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = Lock()
+        # Locks of the keys, whose objects are being created by get_or_create
+        self._key_locks: dict[Hashable, Lock] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the object stored under key or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def find(self, predicate: Callable[[Hashable, Any], bool]
+             ) -> Optional[tuple[Hashable, Any]]:
+        """
+        Return the most recently used entry for which predicate(key, value) is true.
+        A found entry counts as hit; no miss is counted if no entry matches.
+
+        Parameters:
+            predicate: Function of the key and the object of an entry
+
+        Returns:
+            Tuple of key and object or None if no entry matches
+        """
+        with self._lock:
+            entries = [(key, entry[0])
+                       for key, entry in reversed(self._entries.items())]
+        for key, value in entries:
+            if predicate(key, value):
+                with self._lock:
+                    if key in self._entries:
+                        self.stats["hits"] += 1
+                        self._entries.move_to_end(key)
+                return key, value
+        return None
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        """
+        Store value under key and evict the least recently used entries if the memory
+        budget is exceeded. Values larger than the budget are not stored.
+
+        Parameters:
+            key: Key of the entry
+            value: Object to store
+            nbytes: Size of the object in bytes
+        """
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def get_or_create(self, key: Hashable, create: Callable[[], Any],
+                      nbytes: Callable[[Any], int]) -> Any:
+        """
+        Return the object stored under key or create and store it. Concurrent calls
+        for the same key create the object only once; the other calls wait for it.
+
+        Parameters:
+            key: Key of the entry
+            create: Function creating the object
+            nbytes: Function returning the size of the created object in bytes
+
+        Returns:
+            The cached or created object
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, Lock())
+        try:
+            with key_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None:
+                    # Created by a concurrent call in the meantime
+                    return entry[0]
+                value = create()
+                self.put(key, value, nbytes(value))
+                return value
+        finally:
+            with self._lock:
+                if self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def _evict(self) -> None:
+        while self._entries and (self._nbytes > self.max_bytes or (
+                self.max_entries is not None and
+                len(self._entries) > self.max_entries)):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.stats["evictions"] += 1
+
+    def resize(self, max_bytes: int) -> None:
+        """
+        Change the memory budget and evict entries if necessary.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of all entries in bytes.
+        """
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+class DiskArrayCache:
+    """
+    Size-limited least recently used cache of named numpy arrays on disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 ** 30):
+        """
+        Parameters:
+            directory: Directory holding the cache entries. Created if it does not
+                exist.
+            max_bytes: Maximum total size of all entries in bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str, mmap_mode: Optional[str] = "r"
+            ) -> Optional[dict[str, np.ndarray]]:
+        """
+        Return the arrays stored under key.
+
+        Parameters:
+            key: Key of the entry
+            mmap_mode: Memory map mode for numpy.load. None loads the arrays into
+                memory.
+
+        Returns:
+            Dictionary of the stored arrays or None if the key is not cached
+        """
+        path = self._entry_path(key)
+        try:
+            arrays = {name[:-4]: np.load(os.path.join(path, name), mmap_mode=mmap_mode)
+                      for name in os.listdir(path) if name.endswith(".npy")}
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            arrays = None
+        with self._lock:
+            self.stats["hits" if arrays else "misses"] += 1
+        return arrays or None
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Store arrays under key and evict the least recently used entries if the size
+        limit is exceeded.
+
+        Parameters:
+            key: Key of the entry
+            arrays: Dictionary of the arrays to store
+        """
+        size = sum(array.nbytes for array in arrays.values())
+        if size > self.max_bytes:
+            return
+        tmp_path = mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            # Another process stored the same entry in the meantime
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        with self._lock:
+            self.stats["writes"] += 1
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits its size limit.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = self._entry_path(name)
+            if name.startswith(".tmp-") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self.stats["evictions"] += 1
+
+    def size(self) -> int:
+        """
+        Total size of all entries in bytes.
+        """
+        return sum(f.stat().st_size
+                   for entry in os.scandir(self.directory)
+                   if entry.is_dir() and not entry.name.startswith(".tmp-")
+                   for f in os.scandir(entry.path))
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        for entry in os.scandir(self.directory):
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
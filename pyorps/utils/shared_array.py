@@ -0,0 +1,115 @@
+"""
+Numpy arrays in shared memory for pools of worker processes.
+
+The parent process allocates a SharedArray and passes its handle to the initializer of
+a pool created with spawn_process_pool. The initializer attaches the worker to the
+array with attach_shared_array, so the workers read and write the array without
+copying it. The parent process owns the shared memory block and unlinks it when the
+SharedArray is released.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import sys
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Name, shape and data type of a shared array, passed to the worker processes
+SharedArrayHandle = tuple[str, tuple[int, ...], str]
+
+
+class SharedArray:
+    """
+    Numpy array in a shared memory block, which is owned by the creating process.
+
+    Used as context manager, the block is released when the context is left. Views of
+    the array must not be kept beyond the release.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: Any):
+        """
+        Parameters:
+            shape: Shape of the array
+            dtype: Data type of the array
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        self._shm = SharedMemory(create=True, size=max(nbytes, 1))
+        self.array: Optional[np.ndarray] = np.ndarray(shape, dtype=dtype,
+                                                      buffer=self._shm.buf)
+
+    @property
+    def handle(self) -> SharedArrayHandle:
+        """
+        Handle of the array for attach_shared_array in the worker processes.
+        """
+        return self._shm.name, self.array.shape, self.array.dtype.str
+
+    def release(self, copy: bool = False) -> Optional[np.ndarray]:
+        """
+        Close and unlink the shared memory block.
+
+        Parameters:
+            copy: Whether a copy of the array is returned
+
+        Returns:
+            The copy of the array in process memory or None if copy is False
+        """
+        if self.array is None:
+            return None
+        result = self.array.copy() if copy else None
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+        return result
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def attach_shared_array(handle: SharedArrayHandle) -> tuple[SharedMemory, np.ndarray]:
+    """
+    Attach a worker process to a shared array of the parent process.
+
+    Parameters:
+        handle: Handle of the SharedArray
+
+    Returns:
+        The shared memory block, which must be kept alive as long as the array is
+        used, and the array
+    """
+    name, shape, dtype = handle
+    # The parent process owns the shared memory block and unlinks it. Before Python
+    # 3.13, the block is registered again with the resource tracker, which spawned
+    # workers share with the parent, so the registration is a no-op.
+    if sys.version_info >= (3, 13):
+        shm = SharedMemory(name=name, track=False)
+    else:
+        shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def spawn_process_pool(
+        max_workers: Optional[int],
+        initializer: Callable[..., None],
+        initargs: tuple
+) -> ProcessPoolExecutor:
+    """
+    Create a pool of spawned worker processes. Spawned workers do not inherit the
+    threading state of numba and the open datasets of the parent process.
+
+    Parameters:
+        max_workers: Number of worker processes. If None, the number of CPUs is used.
+        initializer: Function setting up the state of each worker
+        initargs: Arguments of the initializer
+
+    Returns:
+        The process pool
+    """
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=get_context("spawn"),
+                               initializer=initializer, initargs=initargs)
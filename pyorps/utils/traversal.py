@@ -11,6 +11,12 @@ from typing import Tuple, Union
 import numpy as np
 import numba as nb
 
+# The kernels are cached on disk. By default, numba caches next to this file and falls
+# back to a user-wide directory if site-packages is read-only. numba's own
+# NUMBA_CACHE_DIR environment variable relocates the cache, e.g. to a writable volume
+# of a container prepared with "python -m pyorps.utils.warmup". pyorps does not change
+# the numba configuration, which is shared by all numba users of the process.
+
 # Define Numba types for clarity and performance optimization
 pyint_type = nb.types.intp
 int8_type = nb.types.int8
@@ -29,6 +35,11 @@ uint32_1d_array = nb.types.Array(uint32_type, 1, 'A')
 float64_1d_array = nb.types.Array(float64_type, 1, 'A')
 uint16_1d_array_c = nb.types.Array(uint16_type, 1, 'C')
 float64_1d_array_c = nb.types.Array(float64_type, 1, 'C')
+int64_1d_array = nb.types.Array(nb.types.int64, 1, 'A')
+int8_1d_array = nb.types.Array(int8_type, 1, 'A')
+
+# Number of segment chunks accumulated separately in calculate_path_metrics_numba
+METRICS_CHUNKS = 64
 
 
 @nb.njit(int8_2d_array(int8_type, int8_type), cache=True, parallel=True,
@@ -473,30 +484,27 @@ def calculate_segment_length(abs_dr: int, abs_dc: int) -> float:
 
 
 @nb.njit(nb.types.Tuple((float64_type, uint16_1d_array_c, float64_1d_array_c))
-        (uint16_2d_array, uint32_1d_array),
-    fastmath=True, parallel=True)
-def calculate_path_metrics_numba(raster:uint16_2d_array,
-                                 path_indices: uint32_1d_array
-                                 ) -> nb.types.Tuple((float64_type,
-                                                      uint16_1d_array_c,
-                                                      float64_1d_array_c)):
+        (uint16_2d_array, uint32_1d_array, uint16_1d_array_c),
+    cache=True, fastmath=True, parallel=True)
+def calculate_path_metrics_categories_numba(raster: uint16_2d_array,
+                                            path_indices: uint32_1d_array,
+                                            categories_array: uint16_1d_array_c
+                                            ) -> nb.types.Tuple((float64_type,
+                                                                 uint16_1d_array_c,
+                                                                 float64_1d_array_c)):
     """
-    Calculate comprehensive metrics for a power line path.
-
-    This function analyzes an optimal path found by the routing algorithm to
-    provide detailed statistics about path length, terrain traversed, and cost
-    distribution. This information is essential for power line planning and
-    cost estimation.
+    Calculate the path metrics of calculate_path_metrics_numba (see below) with
+    known cost categories, e.g. the precomputed categories of a raster store. This
+    avoids finding the unique values of the raster for every path.
 
     Parameters:
         raster (np.ndarray): 2D cost raster representing terrain/construction costs
         path_indices (np.ndarray): Array of linear indices representing the path
+        categories_array (np.ndarray): Sorted cost categories, which must contain
+            all values of the raster cells traversed by the path
 
     Returns:
         Tuple[float, np.ndarray, np.ndarray]: Total length, categories, lengths
-
-    References:
-        [1]
     """
     # Get raster dimensions for coordinate conversion
     rows, cols = raster.shape
@@ -508,8 +516,6 @@ def calculate_path_metrics_numba(raster:uint16_2d_array,
         path_2d[i, 0] = path_indices[i] // cols  # Row coordinate
         path_2d[i, 1] = path_indices[i] % cols   # Column coordinate
 
-    # Identify unique cost categories in the raster
-    categories_array = np.sort(np.unique(raster))
     num_categories = len(categories_array)
 
     # Create efficient mapping from category values to array indices
@@ -521,74 +527,106 @@ def calculate_path_metrics_numba(raster:uint16_2d_array,
     for i in range(num_categories):
         category_to_index[categories_array[i] - min_category] = i
 
-    # Thread-local storage to avoid race conditions in parallel processing
-    num_threads = nb.get_num_threads()
-    thread_local_lengths = np.zeros((num_threads, num_categories),
-                                    dtype=np.float64)
-    thread_local_total_lengths = np.zeros(num_threads, dtype=np.float64)
-
-    # Process each path segment in parallel for performance
-    for i in nb.prange(n_segments):
-        thread_id = nb.get_thread_id()
-
-        # Get segment endpoints
-        row, col = path_2d[i, 0], path_2d[i, 1]
-        next_row, next_col = path_2d[i + 1, 0], path_2d[i + 1, 1]
-
-        # Calculate step direction and segment length
-        dr = next_row - row
-        dc = next_col - col
-        abs_dr = abs(dr)
-        abs_dc = abs(dc)
-
-        segment_length = calculate_segment_length(abs_dr, abs_dc)
-        thread_local_total_lengths[thread_id] += segment_length
-
-        # Get all cells traversed by this segment (including intermediates)
-        intermediates = intermediate_steps_numba(np.int8(dr), np.int8(dc))
-        all_cells = np.empty((intermediates.shape[0] + 2, 2), dtype=np.int64)
-
-        # Source cell
-        all_cells[0, 0] = row
-        all_cells[0, 1] = col
-
-        # Intermediate cells
-        for j in range(intermediates.shape[0]):
-            all_cells[j + 1, 0] = row + intermediates[j, 0]
-            all_cells[j + 1, 1] = col + intermediates[j, 1]
-
-        # Target cell
-        all_cells[-1, 0] = next_row
-        all_cells[-1, 1] = next_col
-
-        # Distribute segment length proportionally among traversed cells
-        cell_length = segment_length / all_cells.shape[0]
-
-        # Accumulate length for each terrain category
-        for j in range(all_cells.shape[0]):
-            r, c = all_cells[j, 0], all_cells[j, 1]
-            if 0 <= r < rows and 0 <= c < cols:
-                category = raster[r, c]
-                if min_category <= category <= max_category:
-                    map_idx = category - min_category
-                    idx = category_to_index[map_idx]
-                    if idx >= 0:
-                        thread_local_lengths[thread_id, idx] += cell_length
-
-    # Combine results from all threads
+    # Separate accumulators per chunk of segments avoid race conditions in parallel
+    # processing. Unlike thread ids, a fixed number of chunks keeps the kernel
+    # cacheable.
+    n_chunks = max(min(n_segments, METRICS_CHUNKS), 1)
+    chunk_lengths = np.zeros((n_chunks, num_categories), dtype=np.float64)
+    chunk_total_lengths = np.zeros(n_chunks, dtype=np.float64)
+
+    # Process the path segments in parallel for performance
+    for chunk in nb.prange(n_chunks):
+        for i in range(chunk, n_segments, n_chunks):
+            # Get segment endpoints
+            row, col = path_2d[i, 0], path_2d[i, 1]
+            next_row, next_col = path_2d[i + 1, 0], path_2d[i + 1, 1]
+
+            # Calculate step direction and segment length
+            dr = next_row - row
+            dc = next_col - col
+            abs_dr = abs(dr)
+            abs_dc = abs(dc)
+
+            segment_length = calculate_segment_length(abs_dr, abs_dc)
+            chunk_total_lengths[chunk] += segment_length
+
+            # Get all cells traversed by this segment (including intermediates)
+            intermediates = intermediate_steps_numba(np.int8(dr), np.int8(dc))
+            all_cells = np.empty((intermediates.shape[0] + 2, 2), dtype=np.int64)
+
+            # Source cell
+            all_cells[0, 0] = row
+            all_cells[0, 1] = col
+
+            # Intermediate cells
+            for j in range(intermediates.shape[0]):
+                all_cells[j + 1, 0] = row + intermediates[j, 0]
+                all_cells[j + 1, 1] = col + intermediates[j, 1]
+
+            # Target cell
+            all_cells[-1, 0] = next_row
+            all_cells[-1, 1] = next_col
+
+            # Distribute segment length proportionally among traversed cells
+            cell_length = segment_length / all_cells.shape[0]
+
+            # Accumulate length for each terrain category
+            for j in range(all_cells.shape[0]):
+                r, c = all_cells[j, 0], all_cells[j, 1]
+                if 0 <= r < rows and 0 <= c < cols:
+                    category = raster[r, c]
+                    if min_category <= category <= max_category:
+                        map_idx = category - min_category
+                        idx = category_to_index[map_idx]
+                        if idx >= 0:
+                            chunk_lengths[chunk, idx] += cell_length
+
+    # Combine results from all chunks
     total_length = 0.0
-    for i in range(num_threads):
-        total_length += thread_local_total_lengths[i]
+    for i in range(n_chunks):
+        total_length += chunk_total_lengths[i]
 
     lengths_array = np.zeros(num_categories, dtype=np.float64)
-    for i in range(num_threads):
+    for i in range(n_chunks):
         for j in range(num_categories):
-            lengths_array[j] += thread_local_lengths[i, j]
+            lengths_array[j] += chunk_lengths[i, j]
 
     return total_length, categories_array, lengths_array
 
 
-@nb.njit(fastmath=True, parallel=True)
+@nb.njit(nb.types.Tuple((float64_type, uint16_1d_array_c, float64_1d_array_c))
+        (uint16_2d_array, uint32_1d_array),
+    cache=True, fastmath=True)
+def calculate_path_metrics_numba(raster:uint16_2d_array,
+                                 path_indices: uint32_1d_array
+                                 ) -> nb.types.Tuple((float64_type,
+                                                      uint16_1d_array_c,
+                                                      float64_1d_array_c)):
+    """
+    Calculate comprehensive metrics for a power line path.
+
+    This function analyzes an optimal path found by the routing algorithm to
+    provide detailed statistics about path length, terrain traversed, and cost
+    distribution. This information is essential for power line planning and
+    cost estimation.
+
+    Parameters:
+        raster (np.ndarray): 2D cost raster representing terrain/construction costs
+        path_indices (np.ndarray): Array of linear indices representing the path
+
+    Returns:
+        Tuple[float, np.ndarray, np.ndarray]: Total length, categories, lengths
+
+    References:
+        [1]
+    """
+    # Identify unique cost categories in the raster
+    categories_array = np.sort(np.unique(raster))
+    return calculate_path_metrics_categories_numba(raster, path_indices,
+                                                   categories_array)
+
+
+@nb.njit(cache=True, fastmath=True, parallel=True)
 def euclidean_distances_numba(raster: np.ndarray,
                               target_point: np.ndarray) -> np.ndarray:
     """
@@ -718,3 +756,200 @@ def get_outgoing_edges(node_idx: int, raster: np.ndarray, steps: np.ndarray,
         edge_count += 1
 
     return to_nodes[:edge_count], costs[:edge_count]
+
+
+
+@nb.njit(nb.types.Tuple((int64_1d_array, uint32_1d_array, float64_1d_array))
+         (uint32_1d_array, uint32_1d_array, float64_1d_array, pyint_type),
+         cache=True)
+def build_csr_numba(from_nodes: uint32_1d_array,
+                    to_nodes: uint32_1d_array,
+                    cost: float64_1d_array,
+                    n: pyint_type
+                    ) -> nb.types.Tuple((int64_1d_array,
+                                         uint32_1d_array,
+                                         float64_1d_array)):
+    """
+    Convert an undirected edge list to a compressed sparse row (CSR) adjacency.
+
+    Every edge is added in both directions.
+
+    Parameters:
+        from_nodes (np.ndarray): Start nodes of the edges
+        to_nodes (np.ndarray): End nodes of the edges
+        cost (np.ndarray): Weights of the edges
+        n (int): Number of nodes
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row pointers, column indices and
+        weights of the CSR adjacency
+    """
+    m = from_nodes.shape[0]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for i in range(m):
+        indptr[from_nodes[i] + 1] += 1
+        indptr[to_nodes[i] + 1] += 1
+    for i in range(n):
+        indptr[i + 1] += indptr[i]
+
+    fill = indptr[:-1].copy()
+    indices = np.empty(2 * m, dtype=np.uint32)
+    weights = np.empty(2 * m, dtype=np.float64)
+    for i in range(m):
+        u = from_nodes[i]
+        v = to_nodes[i]
+        indices[fill[u]] = v
+        weights[fill[u]] = cost[i]
+        fill[u] += 1
+        indices[fill[v]] = u
+        weights[fill[v]] = cost[i]
+        fill[v] += 1
+    return indptr, indices, weights
+
+
+@nb.njit(cache=True)
+def _heap_sift_up(heap: np.ndarray, pos: np.ndarray, dist: np.ndarray, i: int) -> None:
+    """
+    Move the heap entry at position i up until the heap property holds.
+    """
+    node = heap[i]
+    while i > 0:
+        parent = (i - 1) >> 1
+        if dist[heap[parent]] <= dist[node]:
+            break
+        heap[i] = heap[parent]
+        pos[heap[i]] = i
+        i = parent
+    heap[i] = node
+    pos[node] = i
+
+
+@nb.njit(cache=True)
+def _heap_sift_down(heap: np.ndarray, pos: np.ndarray, dist: np.ndarray, i: int,
+                    heap_size: int) -> None:
+    """
+    Move the heap entry at position i down until the heap property holds.
+    """
+    node = heap[i]
+    while True:
+        child = 2 * i + 1
+        if child >= heap_size:
+            break
+        if child + 1 < heap_size and dist[heap[child + 1]] < dist[heap[child]]:
+            child += 1
+        if dist[heap[child]] >= dist[node]:
+            break
+        heap[i] = heap[child]
+        pos[heap[i]] = i
+        i = child
+    heap[i] = node
+    pos[node] = i
+
+
+@nb.njit(pyint_type(int64_1d_array, uint32_1d_array, float64_1d_array,
+                    float64_1d_array, int64_1d_array, int8_1d_array, int64_1d_array,
+                    int64_1d_array, pyint_type, int64_1d_array),
+         cache=True)
+def dijkstra_resume_numba(indptr: int64_1d_array,
+                          indices: uint32_1d_array,
+                          weights: float64_1d_array,
+                          dist: float64_1d_array,
+                          pred: int64_1d_array,
+                          state: int8_1d_array,
+                          heap: int64_1d_array,
+                          pos: int64_1d_array,
+                          heap_size: pyint_type,
+                          targets: int64_1d_array) -> pyint_type:
+    """
+    Continue a single-source Dijkstra search until all targets are settled.
+
+    The complete search state lives in the passed arrays, which are updated in place:
+    the distances, the predecessors, the state of every node (0 = unseen,
+    1 = in the frontier, 2 = settled) and the frontier as an indexed binary heap
+    (heap holds the nodes, pos the position of each node in the heap or -1). A later
+    call with further targets resumes the search from the saved frontier.
+
+    Parameters:
+        indptr (np.ndarray): Row pointers of the CSR adjacency
+        indices (np.ndarray): Column indices of the CSR adjacency
+        weights (np.ndarray): Edge weights of the CSR adjacency
+        dist (np.ndarray): Distances from the source
+        pred (np.ndarray): Predecessor of every node on its shortest path (-1 if none)
+        state (np.ndarray): Search state of every node
+        heap (np.ndarray): Nodes of the frontier heap
+        pos (np.ndarray): Position of every node in the frontier heap
+        heap_size (int): Number of nodes in the frontier heap
+        targets (np.ndarray): Nodes which need to be settled
+
+    Returns:
+        int: New number of nodes in the frontier heap
+    """
+    remaining = 0
+    is_target = np.zeros(dist.shape[0], dtype=np.bool_)
+    for t in targets:
+        if state[t] != 2 and not is_target[t]:
+            is_target[t] = True
+            remaining += 1
+
+    while heap_size > 0 and remaining > 0:
+        # Settle the node with the smallest distance
+        u = heap[0]
+        heap_size -= 1
+        if heap_size > 0:
+            heap[0] = heap[heap_size]
+            pos[heap[0]] = 0
+            _heap_sift_down(heap, pos, dist, 0, heap_size)
+        pos[u] = -1
+        state[u] = 2
+        if is_target[u]:
+            remaining -= 1
+
+        # Relax the outgoing edges
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if state[v] == 2:
+                continue
+            new_dist = dist[u] + weights[k]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                if state[v] == 0:
+                    state[v] = 1
+                    heap[heap_size] = v
+                    heap_size += 1
+                    _heap_sift_up(heap, pos, dist, heap_size - 1)
+                else:
+                    _heap_sift_up(heap, pos, dist, pos[v])
+    return heap_size
+
+
+@nb.njit(uint32_1d_array(int64_1d_array, pyint_type, pyint_type), cache=True)
+def backtrack_path_numba(pred: int64_1d_array,
+                         source: pyint_type,
+                         target: pyint_type) -> uint32_1d_array:
+    """
+    Reconstruct the path from source to target from the predecessors of a search.
+
+    Parameters:
+        pred (np.ndarray): Predecessor of every node on its shortest path (-1 if none)
+        source (int): Source node of the search
+        target (int): Target node
+
+    Returns:
+        np.ndarray: Nodes of the path from source to target (empty if the target has
+        not been reached)
+    """
+    length = 1
+    node = target
+    while node != source:
+        node = pred[node]
+        if node < 0:
+            return np.zeros(0, dtype=np.uint32)
+        length += 1
+
+    path = np.empty(length, dtype=np.uint32)
+    node = target
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = pred[node]
+    return path
@@ -0,0 +1,115 @@
+"""
+Warm-up of the JIT cache of the numba kernels.
+
+All kernels of pyorps.utils.traversal are cached on disk. Kernels with explicit
+signatures are compiled when the module is imported, the others on their first call.
+Running the warm-up once, e.g. while building a container image, compiles every
+kernel and writes the cache, so later processes load the compiled kernels instead of
+compiling them. The cache location is set with numba's environment variable
+NUMBA_CACHE_DIR, which must point to the same directory when the warm-up runs and
+when pyorps is used:
+
+    NUMBA_CACHE_DIR=/opt/pyorps-cache python -m pyorps.utils.warmup
+"""
+import argparse
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+
+def warm_up() -> dict[str, dict[str, Any]]:
+    """
+    Compile or load all numba kernels and run each of them once on a small input.
+
+    Returns:
+        Dictionary with the runtime of the first call, the cache hits, the cache
+        misses and the cache path of every kernel
+    """
+    from pyorps.utils import traversal
+    from pyorps.utils.neighborhood import get_neighborhood_steps
+
+    raster = np.ones((8, 8), dtype=np.uint16)
+    steps = get_neighborhood_steps(2)
+    path = np.array([0, 9, 18, 27], dtype=np.uint32)
+    from_nodes, to_nodes, cost = traversal.construct_edges(raster, steps, True)
+    indptr, indices, weights = traversal.build_csr_numba(
+        from_nodes, to_nodes, cost, raster.size)
+    n = raster.size
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    state = np.zeros(n, dtype=np.int8)
+    heap = np.zeros(n, dtype=np.int64)
+    pos = np.full(n, -1, dtype=np.int64)
+    dist[0], state[0], pos[0] = 0.0, 1, 0
+    targets = np.array([n - 1], dtype=np.int64)
+
+    calls = {
+        "calculate_path_metrics_numba": lambda: traversal.calculate_path_metrics_numba(
+            raster, path),
+        "calculate_path_metrics_categories_numba":
+            lambda: traversal.calculate_path_metrics_categories_numba(
+                raster, path, np.array([1], dtype=np.uint16)),
+        "euclidean_distances_numba": lambda: traversal.euclidean_distances_numba(
+            np.zeros((4, 2)), np.ones(2)),
+        "get_outgoing_edges": lambda: traversal.get_outgoing_edges(
+            27, raster, steps, raster.shape[0], raster.shape[1], None),
+        "dijkstra_resume_numba": lambda: traversal.dijkstra_resume_numba(
+            indptr, indices, weights, dist, pred, state, heap, pos, 1, targets),
+        "backtrack_path_numba": lambda: traversal.backtrack_path_numba(pred, 0, n - 1),
+    }
+
+    report = {}
+    for name, call in calls.items():
+        start = perf_counter()
+        call()
+        runtime = perf_counter() - start
+        stats = getattr(traversal, name).stats
+        report[name] = {
+            "runtime": runtime,
+            "cache_hits": sum(stats.cache_hits.values()),
+            "cache_misses": sum(stats.cache_misses.values()),
+            "cache_path": stats.cache_path,
+        }
+    for name in ("construct_edges", "build_csr_numba", "find_valid_nodes",
+                 "get_max_number_of_edges", "intermediate_steps_numba"):
+        stats = getattr(traversal, name).stats
+        report[name] = {
+            "runtime": 0.0,
+            "cache_hits": sum(stats.cache_hits.values()),
+            "cache_misses": sum(stats.cache_misses.values()),
+            "cache_path": stats.cache_path,
+        }
+    return report
+
+
+def main(args: list[str] = None) -> None:
+    """
+    Run the warm-up and print the state of the cache of every kernel.
+
+    Parameters:
+        args: Command line arguments. If None, sys.argv is used.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pyorps.utils.warmup",
+        description="Compile the numba kernels of pyorps and write their JIT cache. "
+                    "Set NUMBA_CACHE_DIR to relocate the cache."
+    )
+    parser.add_argument("--quiet", action="store_true",
+                        help="Do not print the state of the kernels")
+    parsed = parser.parse_args(args)
+
+    start = perf_counter()
+    report = warm_up()
+    if not parsed.quiet:
+        for name, entry in report.items():
+            print(f"{name:32s} hits={entry['cache_hits']} "
+                  f"misses={entry['cache_misses']} first call="
+                  f"{entry['runtime']:.3f} s")
+        cache_paths = sorted({entry["cache_path"] for entry in report.values()})
+        print(f"Cache: {', '.join(cache_paths)}")
+        print(f"Warm-up finished in {perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
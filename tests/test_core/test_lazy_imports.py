@@ -0,0 +1,78 @@
+import json
+import subprocess
+import sys
+import unittest
+
+import pyorps
+
+# Modules that must not be imported by "import pyorps"
+HEAVY_MODULES = ["geopandas", "rasterio", "shapely", "pandas", "numba", "networkit",
+                 "pyproj", "requests", "pyorps.utils.traversal"]
+
+
+def _run(code: str) -> dict:
+    """Run code in a fresh interpreter and return the JSON it prints."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for the lazy attribute loading of the packages."""
+
+    def test_import_does_not_load_geo_stack(self):
+        """Test that importing the packages does not import heavy dependencies."""
+        loaded = _run(
+            "import json, sys\n"
+            "import pyorps, pyorps.core, pyorps.io, pyorps.raster, pyorps.graph, "
+            "pyorps.utils, pyorps.server\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_import_does_not_load_kernels(self):
+        """Test that "import pyorps" does not import numba, networkit or rasterio."""
+        loaded = _run(
+            "import json, sys\n"
+            "import pyorps\n"
+            "print(json.dumps([m for m in ('numba', 'networkit', 'rasterio') "
+            "if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_path_finder_does_not_load_caches(self):
+        """Test that the optional caches are only imported when they are used."""
+        caches = ["pyorps.graph.route_cache", "pyorps.graph.shortest_path_tree",
+                  "pyorps.raster.rasterization_cache", "pyorps.io.block_cache",
+                  "pyorps.raster.tiled_rasterization", "sqlite3"]
+        loaded = _run(
+            "import json, sys\n"
+            "import pyorps.graph.path_finder\n"
+            f"print(json.dumps([m for m in {caches!r} if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_attributes_are_loaded_on_access(self):
+        """Test that the re-exported attributes resolve to their submodules."""
+        from pyorps.graph.path_finder import PathFinder
+        from pyorps.io.geo_dataset import initialize_geo_dataset
+        self.assertIs(pyorps.PathFinder, PathFinder)
+        self.assertIs(pyorps.initialize_geo_dataset, initialize_geo_dataset)
+        self.assertIs(pyorps.io.initialize_geo_dataset, initialize_geo_dataset)
+        self.assertIn("PathFinder", dir(pyorps))
+        for name in pyorps.__all__:
+            self.assertIsNotNone(getattr(pyorps, name))
+        for package in (pyorps.core, pyorps.io, pyorps.raster, pyorps.graph,
+                        pyorps.utils, pyorps.server):
+            for name in package.__all__:
+                self.assertIsNotNone(getattr(package, name), name)
+
+    def test_unknown_attribute(self):
+        """Test that unknown attributes raise an AttributeError."""
+        with self.assertRaises(AttributeError):
+            _ = pyorps.does_not_exist
+        self.assertFalse(hasattr(pyorps.io, "does_not_exist"))
+
+
+if __name__ == '__main__':
+    unittest.main()
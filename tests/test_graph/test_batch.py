@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from rasterio.transform import from_origin
+
+from pyorps.graph.path_finder import PathFinder
+from pyorps.core.path import PathCollection
+from pyorps.raster.handler import create_test_tiff
+
+
+class TestFindRoutesBatch(unittest.TestCase):
+    """Test cases for process-pool batch routing."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a test raster and a list of independent pairs."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.test_raster_path = os.path.join(cls.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(cls.test_raster_path, width=150, height=150)
+        cls.pairs = [
+            ((500020, 5599980), (500080, 5599920)),
+            ((500100, 5599900), (500130, 5599870)),
+            ((500010, 5599860), (500060, 5599890)),
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test data."""
+        cls.temp_dir.cleanup()
+
+    def test_batch_matches_sequential_routes(self):
+        """Test that batch routes equal the routes of single PathFinder runs."""
+        path_finder = PathFinder(self.test_raster_path, None, None,
+                                 search_space_buffer_m=20, neighborhood_str="r1")
+        paths = path_finder.find_routes_batch(self.pairs, processes=2)
+
+        self.assertIsInstance(paths, PathCollection)
+        self.assertEqual(len(paths), len(self.pairs))
+
+        for pair_id, (source, target) in enumerate(self.pairs):
+            expected = PathFinder(self.test_raster_path, source, target,
+                                  search_space_buffer_m=20,
+                                  neighborhood_str="r1").find_route()
+            path = paths[pair_id]
+            self.assertEqual(path.path_id, pair_id)
+            self.assertEqual(path.source, source)
+            self.assertEqual(path.target, target)
+            np.testing.assert_array_equal(path.path_indices, expected.path_indices)
+            np.testing.assert_allclose(path.path_coords, expected.path_coords)
+            self.assertAlmostEqual(path.total_cost, expected.total_cost)
+            self.assertAlmostEqual(path.total_length, expected.total_length)
+            self.assertEqual(path.length_by_category, expected.length_by_category)
+            for category, expected_category in zip(path.length_by_category,
+                                                   expected.length_by_category):
+                self.assertEqual(type(category), type(expected_category))
+
+    def test_batch_does_not_modify_raster(self):
+        """Test that masking in the workers leaves the loaded raster untouched."""
+        path_finder = PathFinder(self.test_raster_path, None, None,
+                                 search_space_buffer_m=20, neighborhood_str="r1")
+        path_finder.dataset.load_data()
+        before = path_finder.dataset.data.copy()
+        path_finder.find_routes_batch(self.pairs[:1], processes=1,
+                                      calculate_metrics=False)
+        np.testing.assert_array_equal(path_finder.dataset.data, before)
+
+    def test_categories_keep_the_raster_data_type(self):
+        """Test that categories outside the uint16 range are not truncated."""
+        from pyorps.graph.batch import _route_pair, _worker_state
+
+        path = MagicMock()
+        path.path_indices = [0, 1]
+        path.path_coords = [(0, 0), (1, 1)]
+        path.length_by_category = {np.float64(1.5): 2.0, np.float64(70000.0): 1.0}
+        with patch("pyorps.graph.batch.PathFinder") as mock_path_finder, \
+                patch.dict(_worker_state, route_options={}, data=None,
+                           transform=None, crs=None):
+            mock_path_finder.return_value.find_route.return_value = path
+            result = _route_pair(0, (0, 0), (1, 1))
+        np.testing.assert_array_equal(result["categories"], [1.5, 70000.0])
+        self.assertEqual(result["categories"].dtype, np.float64)
+
+    def test_read_only_raster_window_is_copied(self):
+        """Test that a read-only raster can be used for routing."""
+        data = create_test_tiff(os.path.join(self.temp_dir.name, "ro.tiff"))
+        data.flags.writeable = False
+        path_finder = PathFinder(data, (500020, 5599980), (500080, 5599920),
+                                 transform=from_origin(500000, 5600000, 1, 1),
+                                 crs="EPSG:32632", search_space_buffer_m=20)
+        path = path_finder.find_route()
+        self.assertGreater(len(path.path_indices), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+from unittest.mock import patch
 import numpy as np
 
 from pyorps.graph.api.graph_library_api import GraphLibraryAPI
+from pyorps.graph.api.networkit_api import NetworkitAPI
+from pyorps.utils.neighborhood import get_neighborhood_steps
 
 
 class TestGraphLibraryAPI(unittest.TestCase):
@@ -178,3 +181,59 @@ class TestGraphLibraryAPI(unittest.TestCase):
         # Verify the weighted heuristic is twice the original
         for i in range(len(heuristic)):
             self.assertAlmostEqual(heuristic_weighted[i], heuristic[i] * 2.0)
+
+
+class TestPairwiseGrouping(unittest.TestCase):
+    """Test cases for the source-grouped pairwise shortest path computation."""
+
+    def setUp(self):
+        """Create a small graph from a random raster."""
+        rng = np.random.default_rng(42)
+        raster = rng.integers(1, 10, size=(20, 20)).astype(np.uint16)
+        steps = get_neighborhood_steps("r1", directed=False)
+        self.api = NetworkitAPI(raster, steps)
+
+    def test_plan_pairwise_groups_by_source(self):
+        """Test grouping pairs by their source."""
+        reverse, groups = GraphLibraryAPI._plan_pairwise_groups([1, 1, 2],
+                                                                [5, 6, 7])
+        self.assertFalse(reverse)
+        self.assertEqual(groups, {1: ([5, 6], [0, 1]), 2: ([7], [2])})
+
+    def test_plan_pairwise_groups_by_target(self):
+        """Test grouping pairs by their target if there are fewer targets."""
+        reverse, groups = GraphLibraryAPI._plan_pairwise_groups([1, 2, 3],
+                                                                [9, 9, 8])
+        self.assertTrue(reverse)
+        self.assertEqual(groups, {9: ([1, 2], [0, 1]), 8: ([3], [2])})
+
+    def test_grouped_paths_match_individual_paths(self):
+        """Test that grouped paths keep the pair order and the path endpoints."""
+        sources = [0, 0, 0, 399, 21]
+        targets = [399, 210, 45, 0, 378]
+        paths = self.api.shortest_path(sources, targets, pairwise=True)
+
+        self.assertEqual(len(paths), len(sources))
+        for path, source, target in zip(paths, sources, targets):
+            expected = self.api._compute_single_path(source, target, "dijkstra")
+            self.assertEqual(path[0], source)
+            self.assertEqual(path[-1], target)
+            cost = self._path_cost(path)
+            self.assertAlmostEqual(cost, self._path_cost(expected))
+
+    def test_one_search_per_distinct_source(self):
+        """Test that a multi-target search is run once per distinct source."""
+        sources = [0, 0, 0, 21]
+        targets = [399, 210, 45, 378]
+        with patch.object(self.api, "_compute_single_source_multiple_targets",
+                          wraps=self.api._compute_single_source_multiple_targets
+                          ) as multi, \
+                patch.object(self.api, "_compute_single_path",
+                             wraps=self.api._compute_single_path) as single:
+            self.api.shortest_path(sources, targets, pairwise=True)
+        self.assertEqual(multi.call_count, 1)
+        self.assertEqual(single.call_count, 1)
+
+    def _path_cost(self, path):
+        """Sum up the edge weights along a path."""
+        return sum(self.api.graph.weight(u, v) for u, v in zip(path[:-1], path[1:]))
@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+
+import numpy as np
+
+from pyorps.graph.route_cache import RouteCache
+
+
+class TestRouteCache(unittest.TestCase):
+    """Test cases for RouteCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.steps = np.array([[0, 1], [1, 0]], dtype=np.int8)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _key(self, source=1, target=5, algorithm="dijkstra"):
+        return RouteCache.make_key("digest", source, target, self.steps, algorithm,
+                                   "networkit", True)
+
+    def test_make_key(self):
+        """Test that every key component changes the key."""
+        key = self._key()
+        self.assertEqual(key, self._key())
+        self.assertNotEqual(key, self._key(source=2))
+        self.assertNotEqual(key, self._key(target=6))
+        self.assertNotEqual(key, self._key(algorithm="astar"))
+        self.assertNotEqual(key, RouteCache.make_key("digest", 1, 5, self.steps,
+                                                     "dijkstra", "igraph", True))
+
+    def test_put_and_get(self):
+        """Test storing and retrieving a route with metrics."""
+        cache = RouteCache()
+        self.assertIsNone(cache.get(self._key()))
+        cache.put(self._key(), [1, 2, 5], 2.5, [1, 3], [1.0, 1.5])
+        route = cache.get(self._key())
+        np.testing.assert_array_equal(route["path_indices"], [1, 2, 5])
+        self.assertEqual(route["path_indices"].dtype, np.uint32)
+        self.assertEqual(route["total_length"], 2.5)
+        np.testing.assert_array_equal(route["categories"], [1, 3])
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_memory_limit(self):
+        """Test that the least recently used routes are dropped."""
+        cache = RouteCache(max_entries=2)
+        for source in range(3):
+            cache.put(self._key(source=source), [source, 5])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(self._key(source=0)))
+
+    def test_sqlite_persistence(self):
+        """Test that routes survive in the database."""
+        database_path = os.path.join(self.temp_dir.name, "routes.sqlite")
+        cache = RouteCache(database_path=database_path)
+        cache.put(self._key(), [1, 2, 5])
+        cache.close()
+
+        cache = RouteCache(database_path=database_path)
+        route = cache.get(self._key())
+        np.testing.assert_array_equal(route["path_indices"], [1, 2, 5])
+        self.assertIsNone(route["total_length"])
+        self.assertIsNone(route["categories"])
+        self.assertEqual(cache.stats["database_hits"], 1)
+
+        cache.clear()
+        self.assertIsNone(cache.get(self._key()))
+        cache.close()
+
+    def test_database_limit(self):
+        """Test that the least recently used routes are dropped from the database."""
+        database_path = os.path.join(self.temp_dir.name, "routes.sqlite")
+        cache = RouteCache(max_entries=1, database_path=database_path,
+                           max_database_entries=2)
+        cache.put(self._key(source=0), [0, 5])
+        cache.put(self._key(source=1), [1, 5])
+        # Reading the first route from the database marks it as recently used
+        self.assertIsNotNone(cache.get(self._key(source=0)))
+        cache.put(self._key(source=2), [2, 5])
+        cache.close()
+
+        cache = RouteCache(database_path=database_path)
+        self.assertIsNotNone(cache.get(self._key(source=0)))
+        self.assertIsNone(cache.get(self._key(source=1)))
+        self.assertIsNotNone(cache.get(self._key(source=2)))
+        cache.close()
+
+    def test_categories_keep_the_data_type(self):
+        """Test that categories of any raster data type survive the database."""
+        database_path = os.path.join(self.temp_dir.name, "routes.sqlite")
+        categories = np.array([1.5, 70000.25], dtype=np.float32)
+        cache = RouteCache(database_path=database_path)
+        cache.put(self._key(), [1, 2, 5], 2.5, categories, [1.0, 1.5])
+        self.assertEqual(cache.get(self._key())["categories"].dtype, np.float32)
+        cache.close()
+
+        cache = RouteCache(database_path=database_path)
+        route = cache.get(self._key())
+        self.assertEqual(route["categories"].dtype, np.float32)
+        np.testing.assert_array_equal(route["categories"], categories)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
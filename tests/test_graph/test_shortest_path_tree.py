@@ -0,0 +1,140 @@
+import unittest
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyorps.graph.shortest_path_tree import ShortestPathTree, ShortestPathTreeCache
+from pyorps.utils.traversal import build_csr_numba
+
+
+class TestShortestPathTree(unittest.TestCase):
+    """Test cases for the resumable shortest-path tree."""
+
+    def setUp(self):
+        """Create a path graph 0 - 1 - 2 - 3 - 4 with a costly shortcut 0 - 4."""
+        from_nodes = np.array([0, 1, 2, 3, 0], dtype=np.uint32)
+        to_nodes = np.array([1, 2, 3, 4, 4], dtype=np.uint32)
+        cost = np.array([1.0, 1.0, 1.0, 1.0, 10.0])
+        self.csr = build_csr_numba(from_nodes, to_nodes, cost, 6)
+
+    def test_incremental_targets(self):
+        """Test that further targets resume the search."""
+        tree = ShortestPathTree(*self.csr, 0)
+        self.assertEqual(tree.shortest_paths([1]), [[0, 1]])
+        self.assertTrue(tree.is_settled(1))
+        self.assertFalse(tree.is_settled(4))
+
+        self.assertEqual(tree.shortest_paths([4, 2]), [[0, 1, 2, 3, 4], [0, 1, 2]])
+        np.testing.assert_array_equal(tree.distances([1, 2, 3, 4]), [1, 2, 3, 4])
+
+    def test_settled_target_does_not_resume(self):
+        """Test that settled targets are answered by backtracking alone."""
+        tree = ShortestPathTree(*self.csr, 0)
+        tree.settle([3])
+        heap_size = tree.heap_size
+        state = tree.state.copy()
+        self.assertEqual(tree.shortest_paths([2]), [[0, 1, 2]])
+        self.assertEqual(tree.heap_size, heap_size)
+        np.testing.assert_array_equal(tree.state, state)
+
+    def test_unreachable_target(self):
+        """Test that an isolated node gives an empty path and an infinite cost."""
+        tree = ShortestPathTree(*self.csr, 0)
+        self.assertEqual(tree.shortest_paths([5]), [[]])
+        self.assertTrue(np.isinf(tree.distances([5])[0]))
+
+    def test_memmapped_state(self):
+        """Test that the state can live in memory-mapped files."""
+        with tempfile.TemporaryDirectory() as directory:
+            tree = ShortestPathTree(*self.csr, 0, directory=directory, name="t")
+            self.assertEqual(tree.shortest_paths([4]), [[0, 1, 2, 3, 4]])
+            self.assertEqual(len(os.listdir(directory)), 5)
+            tree.release()
+            self.assertEqual(os.listdir(directory), [])
+            with self.assertRaises(RuntimeError):
+                tree.shortest_paths([4])
+            tree.release()
+
+
+class TestShortestPathTreeCache(unittest.TestCase):
+    """Test cases for the bounded cache of shortest-path trees."""
+
+    def setUp(self):
+        from_nodes = np.array([0, 1], dtype=np.uint32)
+        to_nodes = np.array([1, 2], dtype=np.uint32)
+        self.csr = build_csr_numba(from_nodes, to_nodes, np.ones(2), 3)
+
+    def _create(self, source):
+        return lambda directory, name: ShortestPathTree(*self.csr, source, directory,
+                                                        name)
+
+    def test_get_or_create(self):
+        """Test that a tree is created once per key."""
+        cache = ShortestPathTreeCache()
+        first = cache.get_or_create("a", self._create(0))
+        second = cache.get_or_create("a", self._create(0))
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_eviction_removes_files(self):
+        """Test that evicted trees are released."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ShortestPathTreeCache(max_trees=1, directory=directory)
+            cache.get_or_create("a", self._create(0))
+            cache.get_or_create("b", self._create(1))
+            self.assertNotIn("a", cache)
+            self.assertEqual(cache.stats["evictions"], 1)
+            self.assertTrue(all(name.startswith("b_")
+                                for name in os.listdir(directory)))
+            cache.clear()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_evicted_tree_stays_usable(self):
+        """Test that a tree in use survives its eviction until it is dropped."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ShortestPathTreeCache(max_trees=1, directory=directory)
+            tree = cache.get_or_create("a", self._create(0))
+            cache.get_or_create("b", self._create(1))
+            self.assertNotIn("a", cache)
+            self.assertEqual(tree.shortest_paths([2]), [[0, 1, 2]])
+            np.testing.assert_array_equal(tree.distances([2]), [2.0])
+            self.assertTrue(any(name.startswith("a_")
+                                for name in os.listdir(directory)))
+            del tree
+            self.assertFalse(any(name.startswith("a_")
+                                 for name in os.listdir(directory)))
+            cache.clear()
+
+    def test_concurrent_creation(self):
+        """Test that trees of one key are created once and other keys in parallel."""
+        cache = ShortestPathTreeCache()
+        created = []
+        started = threading.Barrier(2, timeout=5)
+
+        def create(source, wait):
+            def _create(directory, name):
+                created.append(name)
+                if wait:
+                    # Both keys are created at the same time
+                    started.wait()
+                time.sleep(0.05)
+                return ShortestPathTree(*self.csr, source, directory, name)
+            return _create
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(cache.get_or_create, key, create(source, wait))
+                       for key, source, wait in (("a", 0, True), ("b", 1, True),
+                                                 ("a", 0, False), ("b", 1, False))]
+            trees = [future.result() for future in futures]
+        self.assertEqual(sorted(created), ["a", "b"])
+        self.assertIs(trees[0], trees[2])
+        self.assertIs(trees[1], trees[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
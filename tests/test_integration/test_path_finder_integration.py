@@ -2,14 +2,20 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 import os
+import asyncio
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import geopandas as gpd
 import importlib
 import warnings
 from shapely.geometry import Polygon, LineString
-from numpy import array, random
+from numpy import array, random, isinf, testing
+from pyproj import Transformer
 
-from pyorps.graph.path_finder import get_graph_api_class, PathFinder
+from pyorps.graph.path_finder import get_graph_api_class, PathFinder, process_cache
+from pyorps.graph.route_cache import RouteCache
+from pyorps.graph.shortest_path_tree import ShortestPathTreeCache
 from pyorps.raster.handler import create_test_tiff
 from pyorps.core.cost_assumptions import CostAssumptions
 from pyorps.core.path import Path, PathCollection
@@ -803,3 +809,439 @@ class TestGraphLibraryPathFinding(unittest.TestCase):
                     self.assertLess(abs(length1 - length2) / max(length1, length2), 0.15,
                                     f"Paths from {algo1} and {algo2} differ too much in length")
 
+
+
+class TestConcurrentQueries(unittest.TestCase):
+    """Tests for thread-safe route queries on a shared PathFinder."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a test raster and a warmed PathFinder."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.test_raster_path = os.path.join(cls.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(cls.test_raster_path)
+        cls.sources = [(500020, 5599980), (500030, 5599970), (500025, 5599960)]
+        cls.targets = [(500080, 5599920), (500070, 5599930), (500075, 5599940)]
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test data."""
+        cls.temp_dir.cleanup()
+
+    def test_concurrent_queries_match_sequential_queries(self):
+        """Test that concurrent queries return the same paths as sequential ones."""
+        path_finder = PathFinder(self.test_raster_path, self.sources, self.targets,
+                                 search_space_buffer_m=20, neighborhood_str="r1")
+        runtimes_before = dict(path_finder.runtimes)
+        queries = [(s, t) for s in self.sources for t in self.targets] * 4
+
+        expected = [path_finder.query_route(s, t) for s, t in queries]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda q: path_finder.query_route(*q),
+                                        queries))
+
+        for path, expected_path in zip(results, expected):
+            self.assertEqual(list(path.path_indices), list(expected_path.path_indices))
+            self.assertAlmostEqual(path.total_cost, expected_path.total_cost)
+            self.assertIn("shortest_path", path.runtimes)
+
+        # The PathFinder itself is not changed by the queries
+        self.assertEqual(len(path_finder.paths), 0)
+        self.assertEqual(set(path_finder.runtimes) - set(runtimes_before),
+                         {"import_time_graph_api", "edge_construction",
+                          "graph_creation", "shortest_path_start_time"})
+
+    def test_query_multiple_targets(self):
+        """Test a query with a single source and multiple targets."""
+        path_finder = PathFinder(self.test_raster_path, self.sources, self.targets,
+                                 search_space_buffer_m=20, neighborhood_str="r1")
+        paths = path_finder.query_route(self.sources[0], self.targets)
+        self.assertIsInstance(paths, PathCollection)
+        self.assertEqual(len(paths), len(self.targets))
+
+    def test_query_without_raster_handler(self):
+        """Test that a query requires a loaded raster handler."""
+        path_finder = PathFinder(self.test_raster_path, None, None)
+        with self.assertRaises(ValueError):
+            path_finder.query_route(self.sources[0], self.targets[0])
+
+
+class TestAsyncRouting(unittest.IsolatedAsyncioTestCase):
+    """Tests for the asyncio routing API of the PathFinder."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a test raster."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.test_raster_path = os.path.join(cls.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(cls.test_raster_path)
+        cls.sources = [(500020, 5599980), (500030, 5599970)]
+        cls.targets = [(500080, 5599920), (500070, 5599930), (500075, 5599940)]
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test data."""
+        cls.temp_dir.cleanup()
+
+    def _create_path_finder(self):
+        """Create a PathFinder without raster handler."""
+        path_finder = PathFinder(self.test_raster_path, None, None,
+                                 search_space_buffer_m=20, neighborhood_str="r1")
+        path_finder.source_coords = self.sources
+        path_finder.target_coords = self.targets
+        return path_finder
+
+    async def test_find_route_async(self):
+        """Test that the async route equals the synchronous route."""
+        path_finder = self._create_path_finder()
+        path = await path_finder.find_route_async(self.sources[0], self.targets[0])
+        expected = path_finder.query_route(self.sources[0], self.targets[0])
+        self.assertEqual(list(path.path_indices), list(expected.path_indices))
+        self.assertEqual(len(path_finder.paths), 0)
+
+    async def test_concurrent_async_requests(self):
+        """Test many concurrent requests on one PathFinder."""
+        path_finder = self._create_path_finder()
+        requests = [path_finder.find_route_async(s, t)
+                    for s in self.sources for t in self.targets]
+        paths = await asyncio.gather(*requests)
+        self.assertEqual(len(paths), len(self.sources) * len(self.targets))
+        self.assertTrue(all(len(p.path_indices) > 1 for p in paths))
+
+    async def test_stream_routes_async(self):
+        """Test streaming the paths of a multi-target query."""
+        path_finder = self._create_path_finder()
+        paths = [path async for path in path_finder.stream_routes_async()]
+        self.assertEqual(len(paths), len(self.sources) * len(self.targets))
+        self.assertEqual({(p.source, p.target) for p in paths},
+                         {(s, t) for s in self.sources for t in self.targets})
+
+    async def test_stream_routes_async_yields_per_target(self):
+        """Test that the targets of a single source are yielded as they settle."""
+        path_finder = self._create_path_finder()
+        await path_finder.find_route_async(self.sources[0], self.targets[0])
+        slow_target = self.targets[-1]
+        release = threading.Event()
+        query_route = path_finder.query_route
+
+        def delayed_query_route(source, target, **kwargs):
+            if target == slow_target:
+                release.wait(10)
+            return query_route(source, target, **kwargs)
+
+        path_finder.query_route = delayed_query_route
+        stream = path_finder.stream_routes_async(self.sources[0], self.targets)
+        try:
+            first = await anext(stream)
+            self.assertNotEqual(first.target, slow_target)
+        finally:
+            release.set()
+        paths = [first] + [path async for path in stream]
+        self.assertEqual([p.target for p in paths].count(slow_target), 1)
+        self.assertEqual(len(paths), len(self.targets))
+
+    async def test_cost_matrix_async(self):
+        """Test that the async cost matrix equals the synchronous cost matrix."""
+        path_finder = self._create_path_finder()
+        matrix = await path_finder.cost_matrix_async()
+        self.assertEqual(matrix.shape, (len(self.sources), len(self.targets)))
+        testing.assert_allclose(matrix, path_finder.cost_matrix())
+        self.assertFalse(isinf(matrix).any())
+
+        path = path_finder.query_route(self.sources[1], self.targets[2])
+        self.assertAlmostEqual(matrix[1, 2], path.total_cost)
+
+    async def test_cancellation_between_stages(self):
+        """Test that a cancelled request does not start the graph construction."""
+        path_finder = self._create_path_finder()
+        task = asyncio.create_task(path_finder.find_route_async())
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # Wait for the running raster loading stage to finish in the executor
+        await asyncio.sleep(0.5)
+        self.assertIsNone(path_finder._graph_api)
+
+
+class TestEdgeCache(unittest.TestCase):
+    """Tests for the on-disk edge cache of the PathFinder."""
+
+    def setUp(self):
+        """Create a test raster and a cache directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_raster_path = os.path.join(self.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(self.test_raster_path)
+        self.cache_dir = os.path.join(self.temp_dir.name, "edge_cache")
+
+    def tearDown(self):
+        """Clean up test data."""
+        self.temp_dir.cleanup()
+
+    def _find_route(self, **kwargs):
+        path_finder = PathFinder(self.test_raster_path, (500020, 5599980),
+                                 (500080, 5599920), search_space_buffer_m=20,
+                                 neighborhood_str="r1", **kwargs)
+        return path_finder, path_finder.find_route()
+
+    def test_warm_run_reuses_edges(self):
+        """Test that a second run loads the edges from the cache."""
+        _, expected = self._find_route()
+        cold, cold_path = self._find_route(edge_cache_dir=self.cache_dir)
+        warm, warm_path = self._find_route(edge_cache_dir=self.cache_dir)
+
+        self.assertEqual(cold.edge_cache.stats["misses"], 1)
+        self.assertEqual(warm.edge_cache.stats["hits"], 1)
+        self.assertEqual(warm.edge_cache.stats["writes"], 0)
+        self.assertEqual(list(warm_path.path_indices), list(expected.path_indices))
+        self.assertEqual(list(cold_path.path_indices), list(expected.path_indices))
+        self.assertAlmostEqual(warm_path.total_cost, expected.total_cost)
+
+    def test_different_neighborhood_different_entry(self):
+        """Test that the steps are part of the cache key."""
+        self._find_route(edge_cache_dir=self.cache_dir)
+        path_finder = PathFinder(self.test_raster_path, (500020, 5599980),
+                                 (500080, 5599920), search_space_buffer_m=20,
+                                 neighborhood_str="r2",
+                                 edge_cache_dir=self.cache_dir)
+        path_finder.find_route()
+        self.assertEqual(path_finder.edge_cache.stats["misses"], 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+class TestProcessCache(unittest.TestCase):
+    """Tests for sharing rasters, windows and graphs between PathFinders."""
+
+    def setUp(self):
+        """Create a test raster and clear the process cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_raster_path = os.path.join(self.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(self.test_raster_path)
+        process_cache.clear()
+
+    def tearDown(self):
+        """Clean up test data."""
+        process_cache.clear()
+        self.temp_dir.cleanup()
+
+    def _create_path_finder(self, neighborhood_str="r1", **kwargs):
+        return PathFinder(self.test_raster_path, (500020, 5599980), (500080, 5599920),
+                          search_space_buffer_m=20, neighborhood_str=neighborhood_str,
+                          use_process_cache=True, **kwargs)
+
+    def test_second_path_finder_reuses_raster_window_and_graph(self):
+        """Test that equal PathFinders share the raster, the window and the graph."""
+        first = self._create_path_finder()
+        first_path = first.find_route()
+        second = self._create_path_finder()
+        second_path = second.find_route()
+
+        self.assertIs(first.dataset, second.dataset)
+        self.assertIs(first.raster_handler, second.raster_handler)
+        self.assertIs(first.graph_api, second.graph_api)
+        self.assertFalse(first.dataset.data.flags.writeable)
+        self.assertEqual(second.runtimes["graph_creation"], 0.0)
+        self.assertEqual(list(first_path.path_indices),
+                         list(second_path.path_indices))
+        self.assertEqual(process_cache.stats["hits"], 3)
+
+        expected = PathFinder(self.test_raster_path, (500020, 5599980),
+                              (500080, 5599920), search_space_buffer_m=20,
+                              neighborhood_str="r1").find_route()
+        self.assertEqual(list(first_path.path_indices), list(expected.path_indices))
+
+    def test_other_neighborhood_reuses_window(self):
+        """Test that another neighborhood only creates a new graph."""
+        first = self._create_path_finder("r1")
+        first.find_route()
+        second = self._create_path_finder("r2")
+        second.find_route()
+
+        self.assertIs(first.raster_handler, second.raster_handler)
+        self.assertIsNot(first.graph_api, second.graph_api)
+
+    def test_contained_search_space_reuses_window(self):
+        """Test that a query inside a cached search space shares its window."""
+        first = self._create_path_finder()
+        first.find_route()
+        inner = PathFinder(self.test_raster_path, (500030, 5599970),
+                           (500070, 5599930), search_space_buffer_m=5,
+                           neighborhood_str="r1", use_process_cache=True)
+        path = inner.find_route()
+        self.assertIs(first.raster_handler, inner.raster_handler)
+        self.assertIs(first.graph_api, inner.graph_api)
+        self.assertEqual(path.source, (500030, 5599970))
+
+        outer = PathFinder(self.test_raster_path, (500010, 5599990),
+                           (500090, 5599910), search_space_buffer_m=20,
+                           neighborhood_str="r1", use_process_cache=True)
+        self.assertIsNot(first.raster_handler, outer.raster_handler)
+
+    def test_modified_file_is_reloaded(self):
+        """Test that a changed raster file is loaded again."""
+        first = self._create_path_finder()
+        stat = os.stat(self.test_raster_path)
+        os.utime(self.test_raster_path, ns=(stat.st_atime_ns,
+                                            stat.st_mtime_ns + 10 ** 9))
+        second = self._create_path_finder()
+        self.assertIsNot(first.dataset, second.dataset)
+
+    def test_cost_assumptions_bypass_cache(self):
+        """Test that PathFinders modifying the raster do not use the cache."""
+        path_finder = PathFinder(self.test_raster_path, None, None,
+                                 use_process_cache=True,
+                                 datasets_to_modify=[{"input_data": None}])
+        self.assertIsNone(path_finder._dataset_cache_key)
+        self.assertEqual(len(process_cache), 0)
+
+
+class TestRouteCacheIntegration(unittest.TestCase):
+    """Tests for memoizing routes of the PathFinder."""
+
+    def setUp(self):
+        """Create a test raster."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_raster_path = os.path.join(self.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(self.test_raster_path)
+
+    def tearDown(self):
+        """Clean up test data."""
+        self.temp_dir.cleanup()
+
+    def _create_path_finder(self, route_cache, neighborhood_str="r1"):
+        return PathFinder(self.test_raster_path, (500020, 5599980), (500080, 5599920),
+                          search_space_buffer_m=20, neighborhood_str=neighborhood_str,
+                          route_cache=route_cache)
+
+    def test_hit_returns_path_without_graph(self):
+        """Test that a cached route is returned without creating the graph."""
+        route_cache = RouteCache()
+        expected = self._create_path_finder(route_cache).find_route()
+
+        path_finder = self._create_path_finder(route_cache)
+        path = path_finder.find_route()
+
+        self.assertIsNone(path_finder._graph_api)
+        self.assertEqual(route_cache.stats["hits"], 1)
+        self.assertEqual(list(path.path_indices), list(expected.path_indices))
+        testing.assert_allclose(path.path_coords, expected.path_coords)
+        self.assertAlmostEqual(path.total_cost, expected.total_cost)
+        self.assertAlmostEqual(path.total_length, expected.total_length)
+        self.assertEqual(len(path_finder.paths), 1)
+
+    def test_other_neighborhood_misses(self):
+        """Test that the neighborhood is part of the key."""
+        route_cache = RouteCache()
+        self._create_path_finder(route_cache, "r1").find_route()
+        path_finder = self._create_path_finder(route_cache, "r2")
+        path_finder.find_route()
+        self.assertIsNotNone(path_finder._graph_api)
+        self.assertEqual(route_cache.stats["hits"], 0)
+
+    def test_metrics_are_calculated_for_routes_cached_without_metrics(self):
+        """Test that missing metrics of a cached route are calculated on a hit."""
+        route_cache = RouteCache()
+        self._create_path_finder(route_cache).find_route(calculate_metrics=False)
+        path = self._create_path_finder(route_cache).find_route()
+        self.assertIsNotNone(path.total_cost)
+
+
+class TestShortestPathTreeIntegration(unittest.TestCase):
+    """Tests for incremental target queries of the PathFinder."""
+
+    def setUp(self):
+        """Create a test raster."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_raster_path = os.path.join(self.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(self.test_raster_path)
+        self.source = (500020, 5599980)
+        self.targets = [(500080, 5599920), (500070, 5599930), (500075, 5599940)]
+
+    def tearDown(self):
+        """Clean up test data."""
+        self.temp_dir.cleanup()
+
+    def _create_path_finder(self, **kwargs):
+        return PathFinder(self.test_raster_path, self.source, self.targets,
+                          search_space_buffer_m=20, neighborhood_str="r1", **kwargs)
+
+    def test_tree_paths_match_graph_paths(self):
+        """Test that the tree finds paths with the costs of the graph library."""
+        expected = self._create_path_finder().find_route()
+        path_finder = self._create_path_finder(tree_cache=ShortestPathTreeCache())
+        paths = path_finder.find_route()
+
+        self.assertIsNone(path_finder._graph_api)
+        self.assertEqual(len(paths), len(expected))
+        expected_costs = {tuple(p.target): p.total_cost for p in expected}
+        for path in paths:
+            self.assertAlmostEqual(path.total_cost, expected_costs[tuple(path.target)])
+
+    def test_added_target_reuses_tree(self):
+        """Test that a further target of the source reuses the saved tree."""
+        tree_cache = ShortestPathTreeCache()
+        path_finder = self._create_path_finder(tree_cache=tree_cache)
+        path_finder.find_route(self.source, self.targets[:2])
+        path = path_finder.find_route(self.source, self.targets[2])
+
+        self.assertEqual(tree_cache.stats["misses"], 1)
+        self.assertEqual(tree_cache.stats["hits"], 1)
+        expected = self._create_path_finder().find_route(self.source,
+                                                         self.targets[2])
+        self.assertAlmostEqual(path.total_cost, expected.total_cost)
+
+
+class TestWindowedRasterReads(unittest.TestCase):
+    """Tests for reading only the search window of raster files."""
+
+    def setUp(self):
+        """Create a test raster with two bands."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_raster_path = os.path.join(self.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(self.test_raster_path, bands=2)
+        self.source = (500020, 5599980)
+        self.target = (500080, 5599920)
+
+    def tearDown(self):
+        """Clean up test data."""
+        self.temp_dir.cleanup()
+
+    def test_only_window_is_read(self):
+        """Test that the window read finds the route of the full read."""
+        path_finder = PathFinder(self.test_raster_path, self.source, self.target,
+                                 search_space_buffer_m=10, indexes=1)
+        path = path_finder.find_route()
+
+        self.assertIsNone(path_finder.dataset.data)
+        self.assertEqual(path_finder.dataset.count, 1)
+        self.assertEqual(path_finder.raster_handler.data.shape[0], 1)
+        self.assertLess(path_finder.raster_handler.data.size, 100 * 100)
+
+        expected = PathFinder(self.test_raster_path, self.source, self.target,
+                              search_space_buffer_m=10, load_full_raster=True,
+                              indexes=1).find_route()
+        self.assertIsNotNone(expected.total_cost)
+        self.assertEqual(list(path.path_indices), list(expected.path_indices))
+        self.assertAlmostEqual(path.total_cost, expected.total_cost)
+
+    def test_reprojected_window(self):
+        """Test routing on a raster reprojected to the project crs on the fly."""
+        transformer = Transformer.from_crs("EPSG:32632", "EPSG:3857", always_xy=True)
+        source = transformer.transform(*self.source)
+        target = transformer.transform(*self.target)
+        path_finder = PathFinder(self.test_raster_path, source, target,
+                                 search_space_buffer_m=10, crs="EPSG:3857",
+                                 indexes=1)
+        path = path_finder.find_route()
+
+        self.assertTrue(path_finder.dataset.is_warped)
+        self.assertIsNone(path_finder.dataset.data)
+        self.assertEqual(path_finder.dataset.crs.to_epsg(), 3857)
+        self.assertIsNotNone(path.total_cost)
+        self.assertLess(path_finder.raster_handler.data.size, 100 * 100)
+
+    def test_buffer_is_estimated_from_window(self):
+        """Test that the buffer estimation does not need the complete raster."""
+        path_finder = PathFinder(self.test_raster_path, self.source, self.target)
+        self.assertIsNone(path_finder.dataset.data)
+        self.assertGreater(path_finder.search_space_buffer_m, 0)
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.windows import Window
+
+from pyorps.graph.path_finder import PathFinder
+from pyorps.io.block_cache import RasterBlockCache
+from pyorps.io.geo_dataset import LocalRasterDataset
+from pyorps.raster.handler import create_test_tiff
+
+
+class TestRasterBlockCache(unittest.TestCase):
+    """Test cases for the cache of decoded raster blocks."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        striped_path = os.path.join(self.temp_dir.name, "striped.tif")
+        self.data = create_test_tiff(striped_path, bands=2)
+        self.path = os.path.join(self.temp_dir.name, "tiled.tif")
+        with rio_open(striped_path) as src:
+            profile = src.profile
+            profile.update(tiled=True, blockxsize=16, blockysize=16,
+                           compress="deflate")
+            with rio_open(self.path, "w", **profile) as dst:
+                dst.write(src.read())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_windows_equal_direct_reads(self):
+        """Test windows crossing block borders and the raster border."""
+        cache = RasterBlockCache()
+        for window in (Window(0, 0, 100, 100), Window(5, 7, 30, 21),
+                       Window(90, 80, 10, 20), Window(16, 16, 16, 16)):
+            with self.subTest(window=window):
+                rows, cols = window.toslices()
+                np.testing.assert_array_equal(cache.read_window(self.path, window),
+                                              self.data[:, rows, cols])
+                np.testing.assert_array_equal(
+                    cache.read_window(self.path, window, indexes=2),
+                    self.data[1:, rows, cols])
+
+    def test_windows_outside_the_raster_are_clipped(self):
+        """Test that windows beyond the raster are clipped like direct reads."""
+        cache = RasterBlockCache()
+        with rio_open(self.path) as src:
+            for window in (Window(80, 80, 40, 40), Window(-10, 50, 30, 70),
+                           Window(100, 0, 10, 10)):
+                with self.subTest(window=window):
+                    expected = src.read(window=window)
+                    data = cache.read_window(self.path, window)
+                    self.assertEqual(data.shape, expected.shape)
+                    np.testing.assert_array_equal(data, expected)
+
+    def test_overlapping_windows_hit_the_cache(self):
+        """Test that overlapping windows decode every block only once."""
+        cache = RasterBlockCache()
+        cache.read_window(self.path, Window(0, 0, 40, 40), indexes=1)
+        self.assertEqual(cache.stats["misses"], 9)
+        self.assertEqual(cache.stats["hits"], 0)
+
+        cache.read_window(self.path, Window(10, 10, 30, 30), indexes=1)
+        self.assertEqual(cache.stats["misses"], 9)
+        self.assertEqual(cache.stats["hits"], 9)
+        self.assertAlmostEqual(cache.hit_rate, 0.5)
+        self.assertEqual(len(cache), 9)
+
+    def test_memory_budget(self):
+        """Test that the least recently used blocks are evicted."""
+        cache = RasterBlockCache(max_bytes=4 * 16 * 16 * 2)
+        cache.read_window(self.path, Window(0, 0, 48, 48), indexes=1)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+        self.assertEqual(cache.stats["evictions"], 5)
+
+    def test_rewritten_file_is_read_again(self):
+        """Test that blocks of a rewritten file are not reused."""
+        cache = RasterBlockCache()
+        cache.read_window(self.path, Window(0, 0, 16, 16), indexes=1)
+        with rio_open(self.path, "r+") as dst:
+            dst.write(np.zeros((100, 100), dtype=np.uint16), 1)
+        os.utime(self.path, ns=(0, 0))
+        window = cache.read_window(self.path, Window(0, 0, 16, 16), indexes=1)
+        self.assertFalse(window.any())
+
+    def test_dataset_and_path_finder(self):
+        """Test the block cache of raster datasets and PathFinders."""
+        cache = RasterBlockCache()
+        dataset = LocalRasterDataset(self.path)
+        dataset.block_cache = cache
+        dataset.load_metadata(indexes=1)
+        np.testing.assert_array_equal(dataset.read_window(Window(3, 4, 20, 20)),
+                                      self.data[:1, 4:24, 3:23])
+
+        source, target = (500020, 5599980), (500080, 5599920)
+        paths = [PathFinder(self.path, source, target, search_space_buffer_m=10,
+                            block_cache=cache, indexes=1).find_route()
+                 for _ in range(2)]
+        expected = PathFinder(self.path, source, target, search_space_buffer_m=10,
+                              indexes=1).find_route()
+        self.assertGreater(cache.stats["hits"], 0)
+        for path in paths:
+            self.assertEqual(list(path.path_indices), list(expected.path_indices))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,10 @@ import geopandas as gpd
 from shapely.geometry import Point, Polygon
 import numpy as np
 from rasterio.transform import Affine
+from rasterio import open as rio_open
+from rasterio.enums import Resampling
+from rasterio.warp import reproject
+from rasterio.windows import Window
 
 
 from pyorps.io.geo_dataset import (
@@ -336,6 +340,51 @@ class TestLocalRasterDataset(GeoTestCase):
         self.assertEqual(dataset.data.shape[1:], (10, 10))  # 10x10 pixels
         self.assertEqual(dataset.crs.to_string(), 'EPSG:4326')
 
+    def test_load_metadata_and_read_window(self):
+        """Test reading the metadata and a window without loading the data."""
+        raster_file_path = self.raster_files[".tif"]
+        full = LocalRasterDataset(raster_file_path)
+        full.load_data()
+
+        dataset = LocalRasterDataset(raster_file_path)
+        dataset.load_metadata()
+        self.assertIsNone(dataset.data)
+        self.assertEqual(dataset.shape, full.shape)
+        self.assertEqual(dataset.count, full.count)
+        self.assertEqual(dataset.dtype, full.data.dtype)
+        self.assertEqual(dataset.transform, full.transform)
+
+        window = dataset.read_window(Window(2, 3, 4, 5))
+        np.testing.assert_array_equal(window, full.data[:, 3:8, 2:6])
+
+        # Single bands are read as (1, height, width)
+        dataset.load_metadata(indexes=1)
+        self.assertEqual(dataset.read_window(Window(0, 0, 2, 2)).shape, (1, 2, 2))
+
+    def test_reprojected_window(self):
+        """Test reading windows of a raster reprojected to another crs."""
+        raster_file_path = self.raster_files[".tif"]
+        dataset = LocalRasterDataset(raster_file_path, "EPSG:4326")
+        dataset.load_metadata()
+        self.assertFalse(dataset.is_warped)
+
+        dataset = LocalRasterDataset(raster_file_path, "EPSG:3857")
+        dataset.load_metadata()
+        self.assertTrue(dataset.is_warped)
+        self.assertEqual(dataset.crs.to_string(), "EPSG:3857")
+
+        # Reference: nearest neighbour reprojection of the complete raster
+        with rio_open(raster_file_path) as src:
+            expected = np.zeros((1, *dataset.shape), dtype=dataset.dtype)
+            reproject(src.read(), expected, src_transform=src.transform,
+                      src_crs=src.crs, dst_transform=dataset.transform,
+                      dst_crs=dataset.crs, resampling=Resampling.nearest)
+
+        window = dataset.read_window(Window(2, 3, 4, 5))
+        np.testing.assert_array_equal(window, expected[:, 3:8, 2:6])
+        dataset.load_data()
+        np.testing.assert_array_equal(dataset.data, expected)
+
 
 class TestInMemoryRasterDataset(unittest.TestCase):
     """Test cases for the InMemoryRasterDataset class."""
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.crs import CRS
+from rasterio.transform import from_origin
+
+from pyorps.graph.path_finder import PathFinder
+from pyorps.io.geo_dataset import MemmapRasterDataset, initialize_geo_dataset
+from pyorps.io.memmap_raster import (write_memmap_raster, convert_to_memmap_raster,
+                                     open_memmap_raster)
+from pyorps.raster.handler import RasterHandler, create_test_tiff
+
+
+class TestMemmapRaster(unittest.TestCase):
+    """Test cases for memory-mapped rasters."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tiff_path = os.path.join(self.temp_dir.name, "cost.tif")
+        self.data = create_test_tiff(self.tiff_path, bands=2)
+        self.npy_path = os.path.join(self.temp_dir.name, "cost.npy")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_and_open(self):
+        """Test the pyorps raster format with its sidecar file."""
+        transform = from_origin(500000, 5600000, 1, 1)
+        write_memmap_raster(self.npy_path, self.data[0], "EPSG:32632", transform, 0)
+        data, metadata = open_memmap_raster(self.npy_path)
+
+        self.assertIsInstance(data, np.memmap)
+        self.assertFalse(data.flags.writeable)
+        np.testing.assert_array_equal(data, self.data[:1])
+        self.assertEqual(metadata["crs"].to_epsg(), 32632)
+        self.assertEqual(metadata["transform"], transform)
+        self.assertEqual(metadata["nodata"], 0)
+
+    def test_convert_geotiff(self):
+        """Test the block-wise conversion of a GeoTIFF."""
+        convert_to_memmap_raster(self.tiff_path, self.npy_path)
+        dataset = initialize_geo_dataset(self.npy_path)
+        self.assertIsInstance(dataset, MemmapRasterDataset)
+        dataset.load_data()
+        np.testing.assert_array_equal(dataset.data, self.data)
+        self.assertEqual(dataset.count, 2)
+        self.assertEqual(dataset.shape, (100, 100))
+        self.assertEqual(dataset.crs.to_epsg(), 32632)
+
+    def test_geotiff_layouts(self):
+        """Test memory-mapping pixel and band interleaved GeoTIFFs."""
+        for interleave in ("pixel", "band"):
+            with self.subTest(interleave=interleave):
+                path = os.path.join(self.temp_dir.name, f"{interleave}.tif")
+                with rio_open(self.tiff_path) as src:
+                    profile = src.profile
+                    profile.update(interleave=interleave)
+                    with rio_open(path, "w", **profile) as dst:
+                        dst.write(src.read())
+                data, metadata = open_memmap_raster(path)
+                np.testing.assert_array_equal(data, self.data)
+                self.assertEqual(metadata["transform"],
+                                 from_origin(500000, 5600000, 1, 1))
+
+    def test_unsupported_geotiffs(self):
+        """Test that compressed and tiled GeoTIFFs are rejected."""
+        for options in ({"compress": "deflate"},
+                        {"tiled": True, "blockxsize": 32, "blockysize": 32}):
+            with self.subTest(options=options):
+                path = os.path.join(self.temp_dir.name, "unsupported.tif")
+                with rio_open(self.tiff_path) as src:
+                    profile = src.profile
+                    profile.update(**options)
+                    with rio_open(path, "w", **profile) as dst:
+                        dst.write(src.read())
+                with self.assertRaises(ValueError):
+                    open_memmap_raster(path)
+
+    def test_target_crs(self):
+        """Test that the crs of the file is kept and a differing crs is rejected."""
+        transform = from_origin(500000, 5600000, 1, 1)
+        write_memmap_raster(self.npy_path, self.data[0], None, transform, 0)
+        for source, crs in ((self.tiff_path, "EPSG:32632"),
+                            (self.npy_path, "EPSG:32632")):
+            with self.subTest(source=source):
+                dataset = MemmapRasterDataset(source, crs=crs)
+                dataset.load_data()
+                self.assertEqual(CRS.from_user_input(dataset.crs).to_epsg(), 32632)
+
+        dataset = MemmapRasterDataset(self.tiff_path, crs="EPSG:25832")
+        with self.assertRaises(ValueError):
+            dataset.load_data()
+
+    def test_windows_are_views(self):
+        """Test that the window of the RasterHandler does not copy the raster."""
+        dataset = MemmapRasterDataset(self.tiff_path)
+        dataset.load_data(indexes=2)
+        self.assertEqual(dataset.count, 1)
+        handler = RasterHandler(dataset, (500020, 5599980), (500080, 5599920),
+                                search_space_buffer_m=10, apply_mask=False)
+        self.assertTrue(np.shares_memory(handler.data, dataset.data))
+        rows, cols = handler.window.toslices()
+        np.testing.assert_array_equal(handler.data[0], self.data[1, rows, cols])
+
+    def test_path_finder(self):
+        """Test that routes on memory-mapped rasters equal routes on GeoTIFFs."""
+        convert_to_memmap_raster(self.tiff_path, self.npy_path)
+        source, target = (500020, 5599980), (500080, 5599920)
+        path = PathFinder(self.npy_path, source, target, search_space_buffer_m=10,
+                          indexes=1).find_route()
+        expected = PathFinder(self.tiff_path, source, target,
+                              search_space_buffer_m=10, indexes=1).find_route()
+        self.assertEqual(list(path.path_indices), list(expected.path_indices))
+        self.assertAlmostEqual(path.total_cost, expected.total_cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.windows import Window, transform as window_transform
+
+from pyorps.graph.path_finder import PathFinder
+from pyorps.io.block_cache import RasterBlockCache
+from pyorps.io.geo_dataset import MosaicRasterDataset, initialize_geo_dataset
+from pyorps.io.mosaic import TileIndex, find_tiles, vrt_source_files
+from pyorps.raster.handler import create_test_tiff
+
+VRT_TEMPLATE = """<VRTDataset rasterXSize="100" rasterYSize="100">
+  <VRTRasterBand dataType="UInt16" band="1">
+{sources}
+  </VRTRasterBand>
+</VRTDataset>
+"""
+
+
+class TestMosaicRasterDataset(unittest.TestCase):
+    """Test cases for mosaics of raster tiles."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        full_path = os.path.join(self.temp_dir.name, "full.tif")
+        self.data = create_test_tiff(full_path, bands=2)
+        self.full_path = full_path
+        self.tile_dir = os.path.join(self.temp_dir.name, "tiles")
+        os.mkdir(self.tile_dir)
+
+        # 4 x 3 tiles of 25 x 34 pixels (the last column is narrower)
+        with rio_open(full_path) as src:
+            profile = src.profile
+            for row in range(0, 100, 25):
+                for col in range(0, 100, 34):
+                    window = Window(col, row, min(34, 100 - col), 25)
+                    profile.update(height=window.height, width=window.width,
+                                   transform=window_transform(window, src.transform))
+                    path = os.path.join(self.tile_dir, f"tile_{row}_{col}.tif")
+                    with rio_open(path, "w", **profile) as dst:
+                        dst.write(src.read(window=window))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tile_index(self):
+        """Test the grid of the mosaic and the R-tree query."""
+        index = TileIndex(find_tiles(self.tile_dir))
+        self.assertEqual(len(index.tiles), 12)
+        self.assertEqual(index.shape, (100, 100))
+        with rio_open(self.full_path) as src:
+            self.assertEqual(index.transform, src.transform)
+        self.assertEqual(len(index.query(Window(0, 0, 10, 10))), 1)
+        self.assertEqual(len(index.query(Window(30, 20, 10, 10))), 4)
+        # Windows touching a tile border do not read the neighbouring tile
+        self.assertEqual(len(index.query(Window(0, 0, 34, 25))), 1)
+
+    def test_windows_equal_the_merged_raster(self):
+        """Test windows of directory, glob and list sources."""
+        sources = [self.tile_dir, os.path.join(self.tile_dir, "*.tif"),
+                   find_tiles(self.tile_dir)]
+        for source in sources:
+            with self.subTest(source=source):
+                dataset = initialize_geo_dataset(source)
+                self.assertIsInstance(dataset, MosaicRasterDataset)
+                dataset.load_metadata()
+                self.assertIsNone(dataset.data)
+                self.assertEqual(dataset.count, 2)
+                for window in (Window(0, 0, 100, 100), Window(20, 10, 40, 50)):
+                    rows, cols = window.toslices()
+                    np.testing.assert_array_equal(dataset.read_window(window),
+                                                  self.data[:, rows, cols])
+
+        dataset = MosaicRasterDataset(self.tile_dir, max_workers=1)
+        dataset.block_cache = RasterBlockCache()
+        dataset.load_data(indexes=2)
+        np.testing.assert_array_equal(dataset.data, self.data[1:])
+
+    def test_missing_tiles_are_filled(self):
+        """Test that pixels without tiles get the maximum of the data type."""
+        tiles = [t for t in find_tiles(self.tile_dir) if "tile_25_34" not in t]
+        index = TileIndex(tiles)
+        window = index.read_window(Window(30, 20, 10, 10), indexes=1)
+        self.assertTrue((window[0, 5:, 4:] == np.iinfo(np.uint16).max).all())
+        np.testing.assert_array_equal(window[0, :5, :], self.data[0, 20:25, 30:40])
+
+    def test_gap_between_tiles_is_forbidden(self):
+        """Test that a gap between two tiles without nodata gets the forbidden cost."""
+        gap_dir = os.path.join(self.temp_dir.name, "gap")
+        os.mkdir(gap_dir)
+        with rio_open(self.full_path) as src:
+            profile = src.profile
+            profile.pop("nodata", None)
+            profile.update(count=1)
+            for col in (0, 60):
+                window = Window(col, 0, 40, 100)
+                profile.update(height=window.height, width=window.width,
+                               transform=window_transform(window, src.transform))
+                path = os.path.join(gap_dir, f"tile_{col}.tif")
+                with rio_open(path, "w", **profile) as dst:
+                    dst.write(src.read(1, window=window), 1)
+
+        index = TileIndex(find_tiles(gap_dir))
+        self.assertIsNone(index.nodata)
+        self.assertEqual(index.shape, (100, 100))
+        window = index.read_window(Window(0, 0, 100, 100), indexes=1)
+        self.assertTrue((window[0, :, 40:60] == np.iinfo(np.uint16).max).all())
+        np.testing.assert_array_equal(window[0, :, :40], self.data[0, :, :40])
+        np.testing.assert_array_equal(window[0, :, 60:], self.data[0, :, 60:])
+
+    def test_vrt(self):
+        """Test reading the sources of a VRT file."""
+        sources = "\n".join(
+            f'    <SimpleSource><SourceFilename relativeToVRT="1">tiles/{name}'
+            f'</SourceFilename><SourceBand>1</SourceBand></SimpleSource>'
+            for name in sorted(os.listdir(self.tile_dir)))
+        vrt_path = os.path.join(self.temp_dir.name, "mosaic.vrt")
+        with open(vrt_path, "w") as f:
+            f.write(VRT_TEMPLATE.format(sources=sources))
+
+        self.assertEqual(vrt_source_files(vrt_path), find_tiles(self.tile_dir))
+        dataset = initialize_geo_dataset(vrt_path)
+        self.assertIsInstance(dataset, MosaicRasterDataset)
+        dataset.load_data()
+        np.testing.assert_array_equal(dataset.data, self.data)
+
+    def test_target_crs(self):
+        """Test that a crs differing from the crs of the tiles is rejected."""
+        dataset = initialize_geo_dataset(self.tile_dir, crs="EPSG:32632")
+        dataset.load_metadata()
+        self.assertEqual(dataset.shape, (100, 100))
+        dataset = initialize_geo_dataset(self.tile_dir, crs="EPSG:25832")
+        with self.assertRaises(ValueError):
+            dataset.load_metadata()
+        with self.assertRaises(ValueError):
+            dataset.load_data()
+
+    def test_misaligned_tiles(self):
+        """Test that tiles of different grids are rejected."""
+        path = os.path.join(self.temp_dir.name, "coarse.tif")
+        create_test_tiff(path, width=10, height=10)
+        with rio_open(path, "r+") as dst:
+            dst.transform = dst.transform * dst.transform.scale(2)
+        with self.assertRaises(ValueError):
+            TileIndex([self.full_path, path])
+
+    def test_path_finder(self):
+        """Test that routes on the mosaic equal routes on the merged raster."""
+        source, target = (500020, 5599980), (500080, 5599920)
+        path_finder = PathFinder(self.tile_dir, source, target,
+                                 search_space_buffer_m=10, indexes=1)
+        path = path_finder.find_route()
+        self.assertIsNone(path_finder.dataset.data)
+        expected = PathFinder(self.full_path, source, target,
+                              search_space_buffer_m=10, indexes=1).find_route()
+        self.assertEqual(list(path.path_indices), list(expected.path_indices))
+        self.assertAlmostEqual(path.total_cost, expected.total_cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
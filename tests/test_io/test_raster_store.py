@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.windows import Window
+
+from pyorps.graph.path_finder import PathFinder
+from pyorps.io.geo_dataset import RasterStoreDataset, initialize_geo_dataset
+from pyorps.io.raster_store import RasterStore, create_raster_store
+from pyorps.raster.handler import create_test_tiff
+from pyorps.utils.traversal import (calculate_path_metrics_numba,
+                                    calculate_path_metrics_categories_numba)
+
+
+class TestRasterStore(unittest.TestCase):
+    """Test cases for the chunked raster store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tiff_path = os.path.join(self.temp_dir.name, "cost.tif")
+        self.data = create_test_tiff(self.tiff_path, bands=2)
+        self.data[0, 50, 50:60] = 65535
+        with rio_open(self.tiff_path, "r+") as dst:
+            dst.write(self.data)
+        self.store_path = os.path.join(self.temp_dir.name, "store")
+        self.statistics = create_raster_store(self.tiff_path, self.store_path,
+                                              chunk_size=32)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_statistics(self):
+        """Test the precomputed statistics against the raster."""
+        statistics = RasterStore(self.store_path).statistics
+        np.testing.assert_array_equal(statistics.minimum, self.data.min(axis=(1, 2)))
+        np.testing.assert_array_equal(statistics.maximum, self.data.max(axis=(1, 2)))
+        for band in range(2):
+            np.testing.assert_array_equal(statistics.categories[band],
+                                          np.unique(self.data[band]))
+        self.assertEqual(statistics.forbidden_value, 65535)
+        self.assertEqual(list(statistics.forbidden_count), [10, 0])
+        self.assertEqual(statistics.chunk_min.shape, (2, 4, 4))
+
+        window = Window(10, 40, 30, 30)
+        rows, cols = window.toslices()
+        self.assertLessEqual(statistics.window_min(window, band=2),
+                             self.data[1, rows, cols].min())
+        self.assertGreaterEqual(statistics.window_max(window),
+                                self.data[0, rows, cols].max())
+
+        self.assertEqual(statistics.pyramid_factors, [2, 4])
+        level = RasterStore(self.store_path).read_pyramid(4)
+        self.assertEqual(level.shape, (2, 25, 25))
+        np.testing.assert_array_equal(
+            level, self.data.reshape(2, 25, 4, 25, 4).min(axis=(2, 4)))
+        with self.assertRaises(ValueError):
+            RasterStore(self.store_path).read_pyramid(8)
+
+    def test_read_window(self):
+        """Test that windows of the store equal windows of the raster."""
+        store = RasterStore(self.store_path)
+        self.assertEqual(store.shape, (100, 100))
+        with rio_open(self.tiff_path) as src:
+            self.assertEqual(store.transform, src.transform)
+            self.assertEqual(store.crs, src.crs)
+        for window in (Window(0, 0, 100, 100), Window(20, 30, 45, 50)):
+            rows, cols = window.toslices()
+            np.testing.assert_array_equal(store.read_window(window),
+                                          self.data[:, rows, cols])
+            np.testing.assert_array_equal(store.read_window(window, indexes=2),
+                                          self.data[1:, rows, cols])
+
+    def test_array_source(self):
+        """Test creating a store from an array."""
+        store_path = os.path.join(self.temp_dir.name, "array_store")
+        with self.assertRaises(ValueError):
+            create_raster_store(self.data[0], store_path, chunk_size=30)
+        statistics = create_raster_store(self.data[0].astype(np.float32), store_path,
+                                         crs="EPSG:32632", chunk_size=64)
+        self.assertIsNone(statistics.categories)
+        self.assertIsNone(statistics.forbidden_value)
+        np.testing.assert_array_equal(
+            RasterStore(store_path).read_window(Window(0, 0, 100, 100))[0],
+            self.data[0])
+
+    def test_dataset(self):
+        """Test the detection and the statistics of store datasets."""
+        dataset = initialize_geo_dataset(self.store_path)
+        self.assertIsInstance(dataset, RasterStoreDataset)
+        dataset.load_metadata(indexes=2)
+        self.assertIsNone(dataset.data)
+        self.assertEqual(dataset.count, 1)
+        np.testing.assert_array_equal(dataset.statistics.categories[0],
+                                      np.unique(self.data[1]))
+        dataset.load_data(indexes=2)
+        np.testing.assert_array_equal(dataset.data, self.data[1:])
+
+        # The store is not reprojected
+        initialize_geo_dataset(self.store_path, crs="EPSG:32632").load_metadata()
+        with self.assertRaises(ValueError):
+            initialize_geo_dataset(self.store_path, crs="EPSG:25832").load_metadata()
+
+    def test_path_metrics_with_categories(self):
+        """Test that the metrics with given categories equal the original metrics."""
+        raster = self.data[0, :20, :20].copy()
+        path = np.array([0, 21, 42, 43, 44, 64], dtype=np.uint32)
+        total, categories, lengths = calculate_path_metrics_numba(raster, path)
+        all_categories = np.unique(self.data[0])
+        total_2, categories_2, lengths_2 = calculate_path_metrics_categories_numba(
+            raster, path, all_categories)
+        self.assertAlmostEqual(total, total_2)
+        # The given categories, which are not in the raster, have zero length
+        self.assertEqual(dict(zip(categories_2, lengths_2)),
+                         {**dict.fromkeys(all_categories, 0.0),
+                          **dict(zip(categories, lengths))})
+
+    def test_path_finder(self):
+        """Test that routes on the store equal routes on the GeoTIFF."""
+        source, target = (500020, 5599980), (500080, 5599920)
+        for algorithm in ("dijkstra", "astar"):
+            with self.subTest(algorithm=algorithm):
+                path_finder = PathFinder(self.store_path, source, target,
+                                         search_space_buffer_m=10, indexes=1)
+                path = path_finder.find_route(algorithm=algorithm)
+                handler = path_finder.raster_handler
+                self.assertIsNone(path_finder.dataset.data)
+                self.assertIn(handler.outside_value, handler.categories)
+                self.assertLessEqual(handler.min_value, handler.data.min())
+
+                expected = PathFinder(self.tiff_path, source, target,
+                                      search_space_buffer_m=10,
+                                      indexes=1).find_route(algorithm=algorithm)
+                self.assertAlmostEqual(path.total_cost, expected.total_cost)
+                self.assertAlmostEqual(path.total_length, expected.total_length)
+                # Categories, which the path does not cross, have zero length
+                lengths = {k: v for k, v in path.length_by_category.items() if v > 0}
+                expected_lengths = {k: v for k, v in
+                                    expected.length_by_category.items() if v > 0}
+                self.assertEqual(lengths.keys(), expected_lengths.keys())
+                for category, length in expected_lengths.items():
+                    self.assertAlmostEqual(lengths[category], length)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from rasterio import open as rio_open
+from rasterio.transform import from_origin
+
+from pyorps.io.raster_writer import write_geotiff, overview_factors
+
+
+class TestWriteGeoTIFF(unittest.TestCase):
+    """Test cases for the GeoTIFF writer."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cost.tif")
+        rng = np.random.default_rng(0)
+        # Cost categories in homogeneous patches
+        self.data = np.kron(rng.integers(1, 5, size=(15, 15)),
+                            np.ones((40, 40))).astype(np.uint16)
+        self.transform = from_origin(500000, 5600000, 1, 1)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tiled_and_compressed(self):
+        """Test the default tiles, compression and predictor."""
+        write_geotiff(self.path, self.data, "EPSG:32632", self.transform, nodata=0)
+        with rio_open(self.path) as src:
+            self.assertEqual(src.block_shapes, [(256, 256)])
+            self.assertEqual(src.compression.value, "DEFLATE")
+            self.assertEqual(src.tags(ns="IMAGE_STRUCTURE").get("PREDICTOR"), "2")
+            self.assertEqual(src.overviews(1), [])
+            self.assertEqual(src.nodata, 0)
+            self.assertEqual(src.transform, self.transform)
+            np.testing.assert_array_equal(src.read(1), self.data)
+
+    def test_overviews(self):
+        """Test that the overviews keep the cost categories."""
+        write_geotiff(self.path, self.data, "EPSG:32632", self.transform,
+                      compress="zstd", blocksize=128, overviews="auto")
+        with rio_open(self.path) as src:
+            self.assertEqual(src.compression.value, "ZSTD")
+            self.assertEqual(src.overviews(1), [2, 4, 8])
+            coarse = src.read(1, out_shape=(75, 75))
+            self.assertTrue(set(np.unique(coarse)) <= set(np.unique(self.data)))
+            np.testing.assert_array_equal(coarse, self.data[::8, ::8])
+
+    def test_cloud_optimized_geotiff(self):
+        """Test writing a Cloud Optimized GeoTIFF."""
+        float_data = self.data.astype(np.float32)[None] / 3
+        write_geotiff(self.path, float_data, "EPSG:32632", self.transform,
+                      overviews=[2, 4], cog=True)
+        with rio_open(self.path) as src:
+            structure = src.tags(ns="IMAGE_STRUCTURE")
+            self.assertEqual(structure.get("LAYOUT"), "COG")
+            self.assertEqual(structure.get("PREDICTOR"), "3")
+            self.assertEqual(src.overviews(1), [2, 4])
+            np.testing.assert_array_equal(src.read(), float_data)
+
+    def test_uncompressed_strips(self):
+        """Test that the previous layout can still be written."""
+        write_geotiff(self.path, self.data, "EPSG:32632", self.transform,
+                      tiled=False, compress=None)
+        with rio_open(self.path) as src:
+            self.assertIsNone(src.compression)
+            self.assertFalse(src.profile["tiled"])
+
+    def test_overview_factors(self):
+        """Test that the overviews reach a single block."""
+        self.assertEqual(overview_factors(100, 100), [])
+        self.assertEqual(overview_factors(600, 300), [2, 4])
+        self.assertEqual(overview_factors(600, 300, blocksize=512), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
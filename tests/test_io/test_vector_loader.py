@@ -311,11 +311,15 @@ class TestWFSFunctions(GeoTestCase):
         result = load_from_wfs("https://example.com/wfs", "layer1")
 
         # Check that correct functions were called
-        mock_resolve.assert_called_once_with("https://example.com/wfs", "layer1")
-        mock_direct.assert_called_once_with("https://example.com/wfs", "layer1", None, None)
-        mock_extent.assert_called_once_with("https://example.com/wfs", "layer1")
+        mock_resolve.assert_called_once_with("https://example.com/wfs", "layer1",
+                                             cache=None)
+        mock_direct.assert_called_once_with("https://example.com/wfs", "layer1", None,
+                                            None, cache=None)
+        mock_extent.assert_called_once_with("https://example.com/wfs", "layer1",
+                                            cache=None)
         mock_parallel.assert_called_once_with("https://example.com/wfs", "layer1",
-                                              (0, 0, 10, 10), None, 4, None)
+                                              (0, 0, 10, 10), None, 4, None,
+                                              cache=None)
 
         # Check result
         self.assert_gdf_equal(result, parallel_gdf)
@@ -352,7 +356,8 @@ class TestWFSFunctions(GeoTestCase):
         np.testing.assert_array_almost_equal(args[0], test_gdf.total_bounds)
 
         mock_parallel.assert_called_once_with("https://example.com/wfs", "layer1",
-                                              (-1, -1, 1, 1), None, 4, None)
+                                              (-1, -1, 1, 1), None, 4, None,
+                                              cache=None)
 
         # Check result
         self.assert_gdf_equal(result, parallel_gdf)
@@ -398,7 +403,8 @@ class TestWFSFunctions(GeoTestCase):
 
         # Check that parallel loading was called with the mask
         mock_parallel.assert_called_once_with("https://example.com/wfs", "layer1",
-                                              (0, 0, 10, 10), None, 4, mask)
+                                              (0, 0, 10, 10), None, 4, mask,
+                                              cache=None)
 
         # Check result
         self.assert_gdf_equal(result, parallel_gdf)
@@ -411,7 +417,7 @@ class TestWFSFunctions(GeoTestCase):
 
         result = _resolve_layer("https://example.com/wfs", "layer2")
 
-        mock_get_layers.assert_called_once_with("https://example.com/wfs")
+        mock_get_layers.assert_called_once_with("https://example.com/wfs", cache=None)
         mock_find_match.assert_not_called()  # Should not need to find match
         self.assertEqual(result, "layer2")
 
@@ -424,7 +430,7 @@ class TestWFSFunctions(GeoTestCase):
 
         result = _resolve_layer("https://example.com/wfs", "layer_2")
 
-        mock_get_layers.assert_called_once_with("https://example.com/wfs")
+        mock_get_layers.assert_called_once_with("https://example.com/wfs", cache=None)
         mock_find_match.assert_called_once_with("layer_2", ["layer1", "layer2", "layer3"])
         self.assertEqual(result, "layer2")
 
@@ -996,7 +1002,7 @@ class TestWFSFunctions(GeoTestCase):
         # Create a patch for _fetch_wfs_data to return test data
         with patch('pyorps.io.vector_loader._fetch_wfs_data') as mock_fetch:
             # Return different data for different chunks
-            def side_effect(url, layer, bbox, filter_params=None):
+            def side_effect(url, layer, bbox, filter_params=None, cache=None):
                 # Create different points based on the bbox
                 minx, miny, maxx, maxy = bbox
                 center_x, center_y = (minx + maxx) / 2, (miny + maxy) / 2
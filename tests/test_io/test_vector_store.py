@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from importlib.util import find_spec
+from unittest.mock import patch
+
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point, box
+
+from pyorps.io.geo_dataset import ParquetVectorDataset, initialize_geo_dataset
+from pyorps.io.vector_store import (create_vector_store, read_vector_store,
+                                    row_group_bounds)
+from pyorps.raster.rasterizer import GeoRasterizer
+
+
+@unittest.skipIf(find_spec("pyarrow") is None, "pyarrow is not installed")
+class TestVectorStore(unittest.TestCase):
+    """Test cases for the GeoParquet vector store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        xy = rng.uniform(0, 1000, size=(2000, 2))
+        self.gdf = gpd.GeoDataFrame(
+            {"land_use": rng.choice(["forest", "field", "road"], size=len(xy)),
+             "name": [f"feature {i}" for i in range(len(xy))],
+             "area": rng.uniform(0, 1, size=len(xy))},
+            geometry=[Point(x, y).buffer(2) for x, y in xy],
+            crs="EPSG:25832"
+        )
+        self.store_path = os.path.join(self.temp_dir.name, "base.parquet")
+        create_vector_store(self.gdf, self.store_path, row_group_size=100)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_row_groups_are_spatially_compact(self):
+        """The Hilbert sorted row groups cover small parts of the total extent."""
+        bounds = row_group_bounds(self.store_path)
+        self.assertEqual(len(bounds), 20)
+        areas = (bounds[:, 2] - bounds[:, 0]) * (bounds[:, 3] - bounds[:, 1])
+        self.assertLess(np.median(areas), 0.25 * 1004 ** 2)
+
+    def test_bbox_read_matches_full_read(self):
+        """A bbox read returns the same features as filtering all features."""
+        bounds = (100.0, 200.0, 300.0, 350.0)
+        data = read_vector_store(self.store_path, bounds=bounds)
+        expected = self.gdf[self.gdf.intersects(box(*bounds))]
+        self.assertEqual(sorted(data["name"]), sorted(expected["name"]))
+        self.assertEqual(data.crs, self.gdf.crs)
+
+    def test_row_groups_outside_bbox_are_skipped(self):
+        """Only the row groups intersecting the bbox are read."""
+        import pyarrow.parquet as pq
+
+        bounds = (100.0, 200.0, 300.0, 350.0)
+        group_bounds = row_group_bounds(self.store_path)
+        expected = [i for i, (xmin, ymin, xmax, ymax) in enumerate(group_bounds)
+                    if xmin <= bounds[2] and xmax >= bounds[0] and
+                    ymin <= bounds[3] and ymax >= bounds[1]]
+        self.assertLess(len(expected), len(group_bounds) // 2)
+
+        read_row_groups = pq.ParquetFile.read_row_groups
+        with patch.object(pq.ParquetFile, "read_row_groups", autospec=True,
+                          side_effect=read_row_groups) as mock_read:
+            read_vector_store(self.store_path, bounds=bounds)
+        self.assertEqual(mock_read.call_args.args[1], expected)
+
+    def test_dataset_forwards_read_kwargs(self):
+        """Keyword arguments of load_data are passed to the Parquet reader."""
+        dataset = initialize_geo_dataset(self.store_path, bbox=box(0, 0, 200, 200))
+        dataset.load_data(use_threads=False)
+        self.assertEqual(len(dataset.data),
+                         self.gdf.intersects(box(0, 0, 200, 200)).sum())
+        with self.assertRaises(TypeError):
+            dataset.load_data(unknown_argument=True)
+
+    def test_column_selection(self):
+        """Only the requested columns and the geometry are read."""
+        data = read_vector_store(self.store_path, columns=["land_use"])
+        self.assertEqual(list(data.columns), ["land_use", "geometry"])
+        self.assertEqual(len(data), len(self.gdf))
+
+    def test_dataset_from_parquet_file(self):
+        """Parquet files are opened as ParquetVectorDataset with bbox and mask."""
+        bbox = box(0, 0, 200, 200)
+        dataset = initialize_geo_dataset(self.store_path, bbox=bbox)
+        self.assertIsInstance(dataset, ParquetVectorDataset)
+        dataset.load_data()
+        self.assertEqual(len(dataset.data), self.gdf.intersects(bbox).sum())
+
+        mask = gpd.GeoSeries([Point(500, 500).buffer(100)], crs="EPSG:25832")
+        dataset = initialize_geo_dataset(self.store_path, mask=mask)
+        dataset.load_data(columns=["area"])
+        self.assertEqual(len(dataset.data), self.gdf.intersects(mask.iloc[0]).sum())
+        self.assertEqual(list(dataset.data.columns), ["area", "geometry"])
+
+    def test_rasterizer_reads_cost_columns(self):
+        """The GeoRasterizer only reads the columns of the cost assumptions."""
+        dataset = initialize_geo_dataset(self.store_path)
+        rasterizer = GeoRasterizer(dataset, {"land_use": {"forest": 5, "field": 1,
+                                                          "road": 2}})
+        self.assertEqual(list(rasterizer.base_data.columns)[:1], ["land_use"])
+        self.assertNotIn("name", rasterizer.base_data.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from pyorps.io.vector_loader import load_from_wfs, _fetch_wfs_data
+from pyorps.io.wfs_cache import WFSResponseCache
+
+
+class _StandInWFSHandler(BaseHTTPRequestHandler):
+    """GetFeature handler returning one point per bbox with an ETag."""
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        params = {k.upper(): v[0] for k, v in query.items()}
+        if server.exception:
+            with server.lock:
+                server.requests += 1
+            body = (b'<?xml version="1.0" encoding="UTF-8"?>'
+                    b'<ows:ExceptionReport version="2.0.0" '
+                    b'xmlns:ows="http://www.opengis.net/ows/1.1">'
+                    b'<ows:Exception exceptionCode="OperationProcessingFailed"/>'
+                    b'</ows:ExceptionReport>')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        minx, miny, maxx, maxy = map(float, params["BBOX"].split(",")[:4])
+        etag = f'"{server.revision}"'
+        with server.lock:
+            server.requests += 1
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({
+            "type": "FeatureCollection",
+            "features": [{
+                "type": "Feature",
+                "properties": {"revision": server.revision},
+                "geometry": {"type": "Point",
+                             "coordinates": [(minx + maxx) / 2, (miny + maxy) / 2]},
+            }],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestWFSResponseCache(unittest.TestCase):
+    """Test cases for the WFS response cache against a local stand-in server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInWFSHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.not_modified = 0
+        self.server.revision = 1
+        self.server.exception = False
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/wfs"
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bbox = (0.0, 0.0, 100.0, 100.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_fresh_responses_are_served_from_disk(self):
+        """Chunks within the time to live do not reach the service."""
+        cache = WFSResponseCache(self.temp_dir.name)
+        first = load_from_wfs(self.url, "layer", bbox=self.bbox, auto_match=False,
+                              cache=cache)
+        self.assertEqual(len(first), 4)
+        self.assertEqual(self.server.requests, 4)
+
+        second = load_from_wfs(self.url, "layer", bbox=self.bbox, auto_match=False,
+                               cache=WFSResponseCache(self.temp_dir.name))
+        self.assertEqual(self.server.requests, 4)
+        self.assertEqual(sorted(first.geometry.to_wkt()),
+                         sorted(second.geometry.to_wkt()))
+
+    def test_stale_responses_are_revalidated(self):
+        """Stale chunks are revalidated with their ETag and reloaded on changes."""
+        cache = WFSResponseCache(self.temp_dir.name, ttl=0)
+        _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        gdf = _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(cache.stats["revalidated"], 1)
+        self.assertEqual(gdf["revision"].iloc[0], 1)
+
+        self.server.revision = 2
+        gdf = _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertEqual(gdf["revision"].iloc[0], 2)
+        self.assertEqual(cache.stats["downloads"], 2)
+
+    def test_stale_while_revalidate(self):
+        """Stale chunks are returned at once and updated in the background."""
+        cache = WFSResponseCache(self.temp_dir.name, ttl=0,
+                                 stale_while_revalidate=True)
+        _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.server.revision = 2
+        gdf = _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertEqual(gdf["revision"].iloc[0], 1)
+        cache.wait()
+        cache.offline = True
+        gdf = _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertEqual(gdf["revision"].iloc[0], 2)
+
+    def test_offline(self):
+        """Cached chunks are used when offline or when the service is down."""
+        cache = WFSResponseCache(self.temp_dir.name, ttl=0)
+        _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.server.shutdown()
+        self.server.server_close()
+
+        gdf = _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertEqual(len(gdf), 1)
+
+        offline = WFSResponseCache(self.temp_dir.name, offline=True)
+        self.assertEqual(len(_fetch_wfs_data(self.url, "layer", self.bbox,
+                                             cache=offline)), 1)
+        with self.assertRaises(requests.ConnectionError):
+            offline.get(self.url, {"BBOX": "1,2,3,4"})
+
+    def test_service_exceptions_are_not_cached(self):
+        """Exception reports returned with status 200 are not stored."""
+        self.server.exception = True
+        cache = WFSResponseCache(self.temp_dir.name)
+        for _ in range(2):
+            response = cache.get(self.url, {"BBOX": "1,2,3,4"})
+            self.assertIn(b"ExceptionReport", response.content)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(cache.stats["exceptions"], 2)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+        self.server.exception = False
+        cache.get(self.url, {"BBOX": "1,2,3,4"})
+        cache.get(self.url, {"BBOX": "1,2,3,4"})
+        self.assertEqual(self.server.requests, 3)
+
+    def test_key_covers_request_parameters(self):
+        """Keys depend on all parameters but not on their order or case."""
+        key = WFSResponseCache.make_key(self.url, {"typeNames": "a", "BBOX": "1,2"})
+        self.assertEqual(key, WFSResponseCache.make_key(
+            self.url, {"BBOX": "1,2", "TYPENAMES": "a"}))
+        self.assertNotEqual(key, WFSResponseCache.make_key(
+            self.url, {"BBOX": "1,3", "TYPENAMES": "a"}))
+        cache = WFSResponseCache(self.temp_dir.name)
+        _fetch_wfs_data(self.url, "layer", self.bbox, cache=cache)
+        self.assertTrue(any(f.endswith(".body")
+                            for f in os.listdir(self.temp_dir.name)))
+        cache.clear()
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -263,7 +263,7 @@ class TestRasterHandler(unittest.TestCase):
 
         try:
             # Mock rasterio.open to avoid actual file operations
-            with patch('pyorps.raster.handler.rio_open') as mock_open:
+            with patch('pyorps.io.raster_writer.rio_open') as mock_open:
                 # Set up mock for context manager
                 mock_dataset = MagicMock()
                 mock_open.return_value.__enter__.return_value = mock_dataset
@@ -290,6 +290,12 @@ class TestRasterHandler(unittest.TestCase):
                 self.assertEqual(kwargs['crs'], handler.raster_dataset.crs)
                 self.assertEqual(kwargs['transform'], handler.window_transform)
 
+                # Check the default tiling and compression
+                self.assertTrue(kwargs['tiled'])
+                self.assertEqual(kwargs['blockxsize'], 256)
+                self.assertEqual(kwargs['compress'], 'deflate')
+                self.assertEqual(kwargs['predictor'], 2)
+
                 # Check that write was called with the data
                 mock_dataset.write.assert_called_once_with(handler.data)
 
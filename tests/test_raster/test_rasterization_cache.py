@@ -0,0 +1,185 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import box
+
+from pyorps.core.cost_assumptions import CostAssumptions
+from pyorps.graph.path_finder import PathFinder
+from pyorps.io.geo_dataset import InMemoryVectorDataset, LocalVectorDataset
+from pyorps.raster.rasterization_cache import RasterizationCache, fingerprint
+from pyorps.raster.rasterizer import GeoRasterizer
+
+
+def create_land_use(offset: float = 0.0) -> gpd.GeoDataFrame:
+    """Create a small land use dataset."""
+    return gpd.GeoDataFrame(
+        {"category": ["forest", "agriculture", "water"]},
+        geometry=[box(offset, 0, 60, 100), box(60, 0, 100, 100),
+                  box(40, 40, 60, 60)],
+        crs="EPSG:32632"
+    )
+
+
+class TestFingerprint(unittest.TestCase):
+    """Test cases for the fingerprint of rasterization inputs."""
+
+    def test_file_content(self):
+        """Test that files are described by their content."""
+        with tempfile.TemporaryDirectory() as directory:
+            first = os.path.join(directory, "a.txt")
+            second = os.path.join(directory, "b.txt")
+            for path in (first, second):
+                with open(path, "w") as f:
+                    f.write("content")
+            self.assertEqual(fingerprint(first), fingerprint(second))
+            with open(second, "w") as f:
+                f.write("changed")
+            self.assertNotEqual(fingerprint(first), fingerprint(second))
+
+    def test_shapefile_members(self):
+        """Test that editing the attributes in the .dbf of a shapefile changes the
+        fingerprint."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "land_use.shp")
+            create_land_use().to_file(path)
+            before = fingerprint(path)
+            self.assertEqual([name for name, _ in before[1]],
+                             [".cpg", ".dbf", ".prj", ".shp", ".shx"])
+
+            edited = create_land_use()
+            edited["category"] = ["water", "agriculture", "forest"]
+            edited_path = os.path.join(directory, "edited", "land_use.shp")
+            os.makedirs(os.path.dirname(edited_path))
+            edited.to_file(edited_path)
+            shutil.copyfile(edited_path[:-4] + ".dbf", path[:-4] + ".dbf")
+            self.assertNotEqual(fingerprint(path), before)
+            self.assertNotEqual(RasterizationCache.make_key(path, None),
+                                RasterizationCache.make_key(before, None))
+
+    def test_directory_content(self):
+        """Test that directories are described by the content of all their files."""
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("part-0.parquet", "part-1.parquet"):
+                with open(os.path.join(directory, name), "w") as f:
+                    f.write(name)
+            before = fingerprint(directory)
+            self.assertEqual(before, fingerprint(directory))
+            with open(os.path.join(directory, "part-1.parquet"), "w") as f:
+                f.write("changed")
+            self.assertNotEqual(fingerprint(directory), before)
+
+    def test_geodataframe_content(self):
+        """Test that GeoDataFrames are described by their rows and geometries."""
+        self.assertEqual(fingerprint(create_land_use()),
+                         fingerprint(create_land_use()))
+        self.assertNotEqual(fingerprint(create_land_use()),
+                            fingerprint(create_land_use(offset=1.0)))
+
+    def test_cost_assumptions_content(self):
+        """Test that the key does not depend on the form of the cost assumptions."""
+        costs = {"category": {"forest": 50, "agriculture": 20, "water": 100}}
+        key = RasterizationCache.make_key("source", costs)
+        self.assertEqual(key, RasterizationCache.make_key("source",
+                                                          CostAssumptions(costs)))
+        costs["category"]["water"] = 200
+        self.assertNotEqual(key, RasterizationCache.make_key("source", costs))
+
+    def test_dict_order(self):
+        """Test that the order of dictionary items does not change the key."""
+        self.assertEqual(fingerprint({"a": 1, "b": 2}), fingerprint({"b": 2, "a": 1}))
+
+
+class TestRasterizationCache(unittest.TestCase):
+    """Test cases for the RasterizationCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = RasterizationCache(os.path.join(self.temp_dir.name, "cache"))
+        self.costs = {"category": {"forest": 50, "agriculture": 20, "water": 100}}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _rasterize(self, **kwargs):
+        dataset = InMemoryVectorDataset(create_land_use(), crs="EPSG:32632")
+        rasterizer = GeoRasterizer(dataset, self.costs)
+        return rasterizer, rasterizer.rasterize(resolution_in_m=5.0, cache=self.cache,
+                                                **kwargs)
+
+    def test_rasterize_uses_cache(self):
+        """Test that a second rasterization returns the cached raster."""
+        _, expected = self._rasterize()
+        rasterizer, raster = self._rasterize()
+
+        self.assertEqual(self.cache.stats,
+                         {"hits": 1, "misses": 1, "writes": 1, "evictions": 0})
+        np.testing.assert_array_equal(raster.data, expected.data)
+        self.assertEqual(raster.transform, expected.transform)
+        self.assertEqual(raster.crs, expected.crs)
+        self.assertIs(rasterizer.raster_dataset, raster)
+
+    def test_parameters_are_part_of_key(self):
+        """Test that other rasterization parameters miss the cache."""
+        self._rasterize()
+        self._rasterize(geometry_buffer_m=2.0)
+        self.assertEqual(self.cache.stats["hits"], 0)
+
+    def test_cached_raster_is_copy_on_write(self):
+        """Test that modifying a cached raster does not change the cache."""
+        _, expected = self._rasterize()
+        _, raster = self._rasterize()
+        raster.data[:] = 1
+        _, raster = self._rasterize()
+        np.testing.assert_array_equal(raster.data, expected.data)
+
+    def test_size_limit(self):
+        """Test that the least recently used rasters are evicted."""
+        _, raster = self._rasterize()
+        entry_size = sum(entry.stat().st_size
+                         for entry in os.scandir(self.cache.directory))
+        self.cache.max_bytes = 2 * entry_size + 1000
+        self._rasterize(geometry_buffer_m=1.0)
+        # Date the entries back, as file times may be too coarse to order them
+        past = time.time() - 100
+        for entry in os.scandir(self.cache.directory):
+            os.utime(entry.path, (past, past))
+        self._rasterize()
+        self._rasterize(geometry_buffer_m=2.0)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 4)
+        # The least recently used raster was evicted, the recently read one was kept
+        self._rasterize()
+        self.assertEqual(self.cache.stats["hits"], 2)
+
+        self.cache.max_bytes = raster.data.nbytes - 1
+        self.cache.clear()
+        self._rasterize()
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def test_path_finder_with_vector_file(self):
+        """Test that a PathFinder starts from the cached raster of a vector file."""
+        path = os.path.join(self.temp_dir.name, "land_use.gpkg")
+        create_land_use().to_file(path)
+
+        def find_route():
+            path_finder = PathFinder(path, (10, 90), (90, 10),
+                                     cost_assumptions=self.costs,
+                                     rasterization_cache=self.cache,
+                                     search_space_buffer_m=30,
+                                     resolution_in_m=5.0)
+            return path_finder, path_finder.find_route()
+
+        _, expected = find_route()
+        path_finder, route = find_route()
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertIsNone(path_finder.dataset.data)
+        self.assertAlmostEqual(route.total_cost, expected.total_cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,17 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import os
+import shutil
 import tempfile
 import numpy as np
 import geopandas as gpd
 import pandas as pd
 from shapely.geometry import Polygon, box
+from rasterio.features import geometry_mask
 from rasterio.transform import from_origin
 
-from pyorps.raster.rasterizer import GeoRasterizer
+from pyorps.raster.rasterizer import GeoRasterizer, prepared_dataset_cache
+from pyorps.raster.rasterization_cache import file_hash
 from pyorps.io.geo_dataset import InMemoryRasterDataset, InMemoryVectorDataset
 from pyorps.core.cost_assumptions import CostAssumptions
 
@@ -209,12 +212,29 @@ class TestGeoRasterizer(unittest.TestCase):
                 bounding_box=bounding_box
             )
 
-            # Check that rasterize was called twice (once for the box, once for the data)
-            self.assertEqual(mock_rasterize.call_count, 2)
+            # Check that all shapes were burned in a single call
+            mock_rasterize.assert_called_once()
 
             # Check that the result is a RasterDataset
             self.assertIsInstance(result, InMemoryRasterDataset)
 
+    def test_rasterize_with_bounding_box_priority(self):
+        """Test that higher costs win where shapes of different costs overlap."""
+        gdf = gpd.GeoDataFrame(
+            {'category': ['road', 'building', 'road']},
+            geometry=[box(0, 0, 6, 6), box(2, 2, 8, 8), box(4, 0, 10, 4)],
+            crs="EPSG:32632"
+        )
+        rasterizer = GeoRasterizer(InMemoryVectorDataset(gdf, crs="EPSG:32632"),
+                                   self.cost_assumptions)
+        raster = rasterizer.rasterize(bounding_box=box(0, 0, 10, 10)).data
+
+        expected = np.full((10, 10), 65535, dtype=np.uint16)
+        expected[4:10, 0:6] = 10
+        expected[6:10, 4:10] = 10
+        expected[2:8, 2:8] = 20
+        np.testing.assert_array_equal(raster, expected)
+
     def test_rasterize_empty_data(self):
         """Test rasterize with empty data."""
         # Create an empty GeoDataFrame
@@ -253,7 +273,7 @@ class TestGeoRasterizer(unittest.TestCase):
 
         try:
             # Mock rasterio.open
-            with patch('pyorps.raster.rasterizer.rio_open') as mock_open:
+            with patch('pyorps.io.raster_writer.rio_open') as mock_open:
                 # Configure mock for context manager
                 mock_dataset = MagicMock()
                 mock_open.return_value.__enter__.return_value = mock_dataset
@@ -285,32 +305,30 @@ class TestGeoRasterizer(unittest.TestCase):
             self.cost_assumptions
         )
 
-        # Create a test GeoDataFrame for modification
-        mod_geometry = [Polygon([(0.25, 0.25), (0.25, 0.75), (0.75, 0.75), (0.75, 0.25)])]
+        # Create a test GeoDataFrame for modification covering the cells [2:7, 2:7]
+        mod_geometry = [box(500020, 5599930, 500070, 5599980)]
         mod_df = pd.DataFrame({'value': [20]})
         mod_gdf = gpd.GeoDataFrame(mod_df, geometry=mod_geometry, crs="EPSG:32632")
+        mask = np.zeros((10, 10), dtype=bool)
+        mask[2:7, 2:7] = True
 
-        # Mock geometry_mask function
-        with patch('pyorps.raster.rasterizer.geometry_mask') as mock_mask:
-            # Create a mock mask that matches the raster shape
-            mask = np.zeros((10, 10), dtype=bool)  # 2D mask
-            mask[2:7, 2:7] = True
-            mock_mask.return_value = mask
-
+        # Spy on geometry_mask to check the window of the mask
+        with patch('pyorps.raster.rasterizer.geometry_mask',
+                   side_effect=geometry_mask) as mock_mask:
             # Test modify_raster_with_geodataframe
             result = rasterizer.modify_raster_with_geodataframe(mod_gdf, value=20)
 
-            # Check that geometry_mask was called
+            # Check that geometry_mask was only called for the window of the polygon
             mock_mask.assert_called_once()
+            self.assertEqual(mock_mask.call_args.kwargs['out_shape'], (5, 5))
 
-            # Fix the index dimension issue - access the proper slice for 3D array
-            if len(result.shape) == 3:
-                # For 3D array, check the first band
-                self.assertTrue(np.all(result[0][mask] == 20))  # Modified area
-                self.assertTrue(np.all(result[0][~mask] == 1))  # Unmodified area
-            else:
-                self.assertTrue(np.all(result[mask] == 20))  # Modified area
-                self.assertTrue(np.all(result[~mask] == 1))  # Unmodified area
+            self.assertTrue(np.all(result[0][mask] == 20))  # Modified area
+            self.assertTrue(np.all(result[0][~mask] == 1))  # Unmodified area
+
+        # Geometries outside the raster do not modify it
+        outside = gpd.GeoDataFrame(geometry=[box(0, 0, 1, 1)], crs="EPSG:32632")
+        result = rasterizer.modify_raster_with_geodataframe(outside, value=30)
+        self.assertFalse(np.any(result == 30))
 
     def test_modify_raster_from_dataset(self):
         """Test modify_raster_from_dataset method."""
@@ -404,6 +422,119 @@ class TestGeoRasterizer(unittest.TestCase):
                     # Should make two calls to modify_raster_with_geodataframe
                     self.assertEqual(mock_modify.call_count, 2)
 
+    def test_modify_raster_from_dataset_use_cache(self):
+        """Test that prepared modifier datasets are reused with use_cache."""
+        mod_gdf = gpd.GeoDataFrame(
+            {'category': ['road']},
+            geometry=[Polygon([(0.25, 0.25), (0.25, 0.75), (0.75, 0.75),
+                               (0.75, 0.25)])],
+            crs="EPSG:32632"
+        )
+        mock_bounds_gdf = gpd.GeoDataFrame(geometry=[box(0, 0, 1, 1)], crs="EPSG:32632")
+        prepared_dataset_cache.clear()
+
+        raster_dataset = InMemoryRasterDataset(np.ones((10, 10), dtype=np.uint16),
+                                               self.crs, from_origin(0, 1, 0.1, 0.1))
+        rasterizer = GeoRasterizer(raster_dataset, self.cost_assumptions)
+        with patch.object(rasterizer, 'create_bounds_geodataframe',
+                          return_value=mock_bounds_gdf):
+            with patch('pyorps.raster.rasterizer.initialize_geo_dataset') as mock_init:
+                mock_dataset = MagicMock()
+                mock_dataset.data = mod_gdf.copy()
+                mock_init.return_value = mock_dataset
+
+                for cost in (5, 7):
+                    rasterizer.modify_raster_from_dataset(
+                        mod_gdf, cost_assumptions={'category': {'road': cost}},
+                        geometry_buffer_m=0.1, use_cache=True
+                    )
+
+                # The dataset is only loaded and buffered once
+                mock_init.assert_called_once()
+                self.assertEqual(rasterizer.raster[5, 5], 7)
+                self.assertEqual(prepared_dataset_cache.stats['hits'], 1)
+
+                # A different buffer is a different prepared dataset
+                mock_dataset.data = mod_gdf.copy()
+                rasterizer.modify_raster_from_dataset(mod_gdf, cost_assumptions=3,
+                                                      geometry_buffer_m=0.2,
+                                                      use_cache=True)
+                self.assertEqual(mock_init.call_count, 2)
+
+        # The cost column of a study does not leak into the cached GeoDataFrames
+        for cached, _ in prepared_dataset_cache._entries.values():
+            self.assertNotIn('cost', cached.columns)
+        prepared_dataset_cache.clear()
+
+    def test_modify_raster_from_dataset_use_cache_with_file(self):
+        """Test that cached modifier files are only hashed once and reloaded when any
+        of their files changes."""
+        prepared_dataset_cache.clear()
+        raster_dataset = InMemoryRasterDataset(np.ones((10, 10), dtype=np.uint16),
+                                               self.crs, from_origin(0, 1, 0.1, 0.1))
+        rasterizer = GeoRasterizer(raster_dataset, self.cost_assumptions)
+        mod_gdf = gpd.GeoDataFrame({'category': ['road']},
+                                   geometry=[box(0.25, 0.25, 0.75, 0.75)],
+                                   crs="EPSG:32632")
+        costs = {'category': {'road': 5, 'building': 9}}
+        bbox = gpd.GeoDataFrame(geometry=[box(0, 0, 1, 1)], crs="EPSG:32632")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "modifier.shp")
+            mod_gdf.to_file(path)
+            with patch('pyorps.raster.rasterization_cache.file_hash',
+                       wraps=file_hash) as mock_hash:
+                for _ in range(2):
+                    rasterizer.modify_raster_from_dataset(path, costs, bbox=bbox,
+                                                          use_cache=True)
+                # Every file of the shapefile is only hashed once
+                self.assertEqual(mock_hash.call_count, 5)
+            self.assertEqual(prepared_dataset_cache.stats['hits'], 1)
+            self.assertEqual(rasterizer.raster[5, 5], 5)
+
+            # Editing the attributes in the .dbf file loads the dataset again
+            edited_path = os.path.join(temp_dir, "edited", "modifier.shp")
+            os.makedirs(os.path.dirname(edited_path))
+            mod_gdf.assign(category=['building']).to_file(edited_path)
+            shutil.copyfile(edited_path[:-4] + ".dbf", path[:-4] + ".dbf")
+            rasterizer.modify_raster_from_dataset(path, costs, bbox=bbox,
+                                                  use_cache=True)
+            self.assertEqual(prepared_dataset_cache.stats['hits'], 1)
+            self.assertEqual(rasterizer.raster[5, 5], 9)
+        prepared_dataset_cache.clear()
+
+    def test_modify_raster_from_dataset_windowed_masks(self):
+        """Test that the windowed masks equal masks over the full raster."""
+        rng = np.random.default_rng(0)
+        raster = rng.integers(1, 10, size=(100, 120)).astype(np.uint16)
+        raster[40:60, 40:60] = 65535
+        transform = from_origin(0, 100, 1, 1)
+        mod_gdf = gpd.GeoDataFrame(
+            {'category': ['road', 'building', 'road']},
+            geometry=[box(10.3, 10.3, 50.2, 30.7), box(30, 20, 55, 70),
+                      box(110, -20, 150, 5)],
+            crs="EPSG:32632"
+        )
+        rasterizer = GeoRasterizer(
+            InMemoryRasterDataset(raster.copy(), self.crs, transform),
+            self.cost_assumptions
+        )
+        with patch('pyorps.raster.rasterizer.initialize_geo_dataset') as mock_init:
+            mock_init.return_value.data = mod_gdf.copy()
+            result = rasterizer.modify_raster_from_dataset(
+                mod_gdf, cost_assumptions=self.cost_assumptions,
+                bbox=gpd.GeoDataFrame(geometry=[box(0, 0, 120, 100)],
+                                      crs="EPSG:32632")
+            )
+
+        expected = raster.copy()
+        for category, cost in (('road', 10), ('building', 20)):
+            inside = geometry_mask(mod_gdf.loc[mod_gdf['category'] == category,
+                                               'geometry'].values,
+                                   transform=transform, invert=True,
+                                   out_shape=raster.shape)
+            expected[inside & (expected != 65535)] = cost
+        np.testing.assert_array_equal(result, expected)
+
     def test_shrink_raster(self):
         """Test shrinking raster by removing outer bounds."""
         # Create a 2D raster without the band dimension to match how the function works
@@ -0,0 +1,72 @@
+import unittest
+
+import geopandas as gpd
+import numpy as np
+from rasterio.features import rasterize
+from rasterio.transform import from_origin
+from shapely.geometry import LineString, Point, box
+
+from pyorps.raster.rasterizer import GeoRasterizer
+from pyorps.raster.tiled_rasterization import rasterize_tiled, tile_windows
+from pyorps.io.geo_dataset import InMemoryVectorDataset
+
+
+class TestTiledRasterization(unittest.TestCase):
+    """Test cases for the tiled rasterization."""
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        # Overlapping polygons, buffered lines and points with random costs
+        geometries = [box(x, y, x + w, y + h) for x, y, w, h in
+                      rng.uniform(0, 180, size=(60, 4)) * [1, 1, 0.4, 0.4]]
+        geometries += [LineString(rng.uniform(0, 200, size=(3, 2))).buffer(2)
+                       for _ in range(20)]
+        geometries += [Point(rng.uniform(0, 200, size=2)).buffer(5) for _ in range(20)]
+        self.gdf = gpd.GeoDataFrame({"category": "road",
+                                     "cost": rng.integers(1, 50, size=100)},
+                                    geometry=geometries, crs="EPSG:32632")
+        self.gdf = self.gdf.sort_values("cost")
+        self.gdf["value"] = self.gdf["cost"]
+        self.transform = from_origin(0, 200, 1, 1)
+
+    def test_tile_windows(self):
+        """Test that the tiles cover the raster."""
+        windows = tile_windows((100, 70), 32)
+        self.assertEqual(len(windows), 12)
+        self.assertEqual(sum(w.width * w.height for w in windows), 7000)
+        self.assertEqual((windows[-1].width, windows[-1].height), (6, 4))
+
+    def test_equals_single_call(self):
+        """Test that the tiled raster equals a single rasterize call."""
+        expected = rasterize(zip(self.gdf.geometry, self.gdf["cost"]),
+                             out_shape=(200, 200), fill=65535, dtype="uint16",
+                             transform=self.transform)
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                raster = rasterize_tiled(self.gdf.geometry.values,
+                                         self.gdf["cost"].values, (200, 200),
+                                         self.transform, 65535, "uint16",
+                                         tile_size=48, processes=processes)
+                np.testing.assert_array_equal(raster, expected)
+
+    def test_rasterizer(self):
+        """Test the tiled mode of GeoRasterizer.rasterize in both branches."""
+        for bounding_box in (None, box(-10, -10, 210, 190)):
+            with self.subTest(bounding_box=bounding_box):
+                rasters = []
+                for tile_size in (None, 64):
+                    rasterizer = GeoRasterizer(
+                        InMemoryVectorDataset(self.gdf.copy(), crs="EPSG:32632"),
+                        {"category": {"road": 1}})
+                    rasters.append(rasterizer.rasterize(
+                        field_name="value", bounding_box=bounding_box,
+                        tile_size=tile_size, processes=1).data)
+                np.testing.assert_array_equal(rasters[1], rasters[0])
+
+        parameters = GeoRasterizer.rasterize_parameters(tile_size=64)
+        self.assertNotIn("tile_size", parameters)
+        self.assertNotIn("processes", parameters)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyorps.core.exceptions import RoutingServerError
+from pyorps.graph.path_finder import PathFinder
+from pyorps.raster.handler import create_test_tiff
+from pyorps.server import RoutingServer, RoutingClient
+
+
+class TestRoutingServer(unittest.TestCase):
+    """Test cases for the routing server and its client."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a test raster and start a server on a free port."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.test_raster_path = os.path.join(cls.temp_dir.name, "test_raster.tiff")
+        create_test_tiff(cls.test_raster_path)
+        cls.config_path = os.path.join(cls.temp_dir.name, "config.json")
+        with open(cls.config_path, "w") as f:
+            json.dump({"datasets": {"test": {"source": cls.test_raster_path,
+                                             "search_space_buffer_m": 20,
+                                             "neighborhood_str": "r1"}},
+                       "max_path_finders": 2}, f)
+        cls.server = RoutingServer.from_config(cls.config_path, port=0).start()
+        cls.client = RoutingClient(cls.server.url)
+        cls.source = (500020, 5599980)
+        cls.target = (500080, 5599920)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server and clean up test data."""
+        cls.server.shutdown()
+        cls.temp_dir.cleanup()
+
+    def test_health_and_datasets(self):
+        """Test the informational endpoints."""
+        self.assertEqual(self.client.health(), {"status": "ok"})
+        datasets = self.client.datasets()
+        self.assertEqual(list(datasets), ["test"])
+        self.assertEqual(datasets["test"]["defaults"]["neighborhood_str"], "r1")
+
+    def test_loaded_raster_is_read_only(self):
+        """Test that the served raster cannot be modified by the search windows."""
+        self.assertFalse(self.server.datasets["test"].data.flags.writeable)
+
+    def test_route_matches_path_finder(self):
+        """Test that a served route equals the route of a PathFinder."""
+        paths = self.client.route("test", self.source, self.target)
+        expected = PathFinder(self.test_raster_path, self.source, self.target,
+                              search_space_buffer_m=20,
+                              neighborhood_str="r1").find_route()
+        self.assertEqual(len(paths), 1)
+        np.testing.assert_allclose(paths[0]["path_coords"], expected.path_coords)
+        self.assertAlmostEqual(paths[0]["total_cost"], expected.total_cost)
+
+    def test_repeated_route_hits_cache(self):
+        """Test that repeated queries reuse the cached PathFinder."""
+        source, target = (500030, 5599970), (500070, 5599930)
+        self.client.route("test", source, target)
+        hits = self.client.stats()["hits"]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: self.client.route("test", source, target), range(4)))
+        self.assertEqual(self.client.stats()["hits"], hits + 4)
+        self.assertTrue(all(r[0]["path_coords"] == results[0][0]["path_coords"]
+                            for r in results))
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used PathFinders are evicted."""
+        for dx in range(3):
+            self.client.route("test", (500020 + dx, 5599980), self.target)
+        stats = self.client.stats()
+        self.assertLessEqual(stats["cached_path_finders"], 2)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_query_inside_cached_search_space_hits_cache(self):
+        """Test that a PathFinder is reused for endpoints inside its search space."""
+        self.client.route("test", (500010, 5599990), (500090, 5599910))
+        stats = self.client.stats()
+        paths = self.client.route("test", (500021, 5599979), (500079, 5599921))
+        self.assertEqual(self.client.stats()["hits"], stats["hits"] + 1)
+        self.assertEqual(self.client.stats()["misses"], stats["misses"])
+        self.assertGreater(len(paths[0]["path_coords"]), 1)
+
+    def test_cache_memory_budget(self):
+        """Test that the cached PathFinders are bounded by the memory budget."""
+        server = RoutingServer.from_config(self.config_path, port=0,
+                                           max_path_finders=10,
+                                           max_cache_bytes=600000)
+        for dx in range(0, 60, 20):
+            server.route({"dataset": "test", "source": [500020 + dx, 5599980],
+                          "target": [500020 + dx, 5599920]})
+        stats = server.cache_stats()
+        self.assertLessEqual(stats["cached_bytes"], 600000)
+        self.assertEqual(stats["cached_path_finders"], 2)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_cost_matrix(self):
+        """Test the cost matrix endpoint."""
+        sources = [self.source, (500030, 5599970)]
+        targets = [self.target, (500070, 5599930), (500075, 5599940)]
+        costs = self.client.cost_matrix("test", sources, targets)
+        self.assertEqual(costs.shape, (2, 3))
+        self.assertTrue(np.isfinite(costs).all())
+        self.assertTrue((costs > 0).all())
+
+    def test_errors(self):
+        """Test the error responses of the server."""
+        with self.assertRaises(RoutingServerError) as context:
+            self.client.route("unknown", self.source, self.target)
+        self.assertEqual(context.exception.status, 404)
+
+        with self.assertRaises(RoutingServerError) as context:
+            self.client.route("test", None, self.target)
+        self.assertEqual(context.exception.status, 400)
+
+        with self.assertRaises(RoutingServerError) as context:
+            self.client._request("GET", "/unknown")
+        self.assertEqual(context.exception.status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
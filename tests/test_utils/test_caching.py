@@ -0,0 +1,195 @@
+import unittest
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyorps.utils.caching import content_hash, DiskArrayCache, MemoryCache
+
+
+class TestContentHash(unittest.TestCase):
+    """Test cases for content_hash."""
+
+    def test_equal_content_equal_hash(self):
+        """Test that equal arrays and values give equal hashes."""
+        a = np.arange(12, dtype=np.uint16).reshape(3, 4)
+        self.assertEqual(content_hash(a, 1, True), content_hash(a.copy(), 1, True))
+
+    def test_different_content_different_hash(self):
+        """Test that data, dtype, shape and values change the hash."""
+        a = np.arange(12, dtype=np.uint16).reshape(3, 4)
+        h = content_hash(a, True)
+        self.assertNotEqual(h, content_hash(a + 1, True))
+        self.assertNotEqual(h, content_hash(a.astype(np.int16), True))
+        self.assertNotEqual(h, content_hash(a.reshape(4, 3), True))
+        self.assertNotEqual(h, content_hash(a, False))
+
+    def test_non_contiguous_array(self):
+        """Test that views are hashed by their content."""
+        a = np.arange(20, dtype=np.uint16).reshape(4, 5)
+        self.assertEqual(content_hash(a[1:3, 1:4]),
+                         content_hash(a[1:3, 1:4].copy()))
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test cases for MemoryCache."""
+
+    def test_get_and_put(self):
+        """Test storing and retrieving objects with statistics."""
+        cache = MemoryCache(max_bytes=100)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", [1, 2], 10)
+        self.assertEqual(cache.get("a"), [1, 2])
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "evictions": 0})
+        self.assertEqual(cache.nbytes, 10)
+        self.assertIn("a", cache)
+
+    def test_budget_eviction(self):
+        """Test that the least recently used entries are evicted."""
+        cache = MemoryCache(max_bytes=100)
+        cache.put("a", "a", 40)
+        cache.put("b", "b", 40)
+        cache.get("a")
+        cache.put("c", "c", 40)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.nbytes, 80)
+        self.assertEqual(cache.stats["evictions"], 1)
+
+        cache.resize(50)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("c", cache)
+
+    def test_value_larger_than_budget(self):
+        """Test that values larger than the budget are not stored."""
+        cache = MemoryCache(max_bytes=10)
+        cache.put("a", "a", 11)
+        self.assertEqual(len(cache), 0)
+
+    def test_entry_limit(self):
+        """Test that the number of entries is bounded by max_entries."""
+        cache = MemoryCache(max_bytes=100, max_entries=2)
+        for key in "abc":
+            cache.put(key, key, 1)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_find(self):
+        """Test finding the most recently used matching entry."""
+        cache = MemoryCache()
+        cache.put(("x", 1), 1, 1)
+        cache.put(("x", 2), 2, 1)
+        cache.put(("y", 3), 3, 1)
+        self.assertEqual(cache.find(lambda key, value: key[0] == "x"), (("x", 2), 2))
+        self.assertIsNone(cache.find(lambda key, value: value > 3))
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 0, "evictions": 0})
+
+    def test_get_or_create(self):
+        """Test that the object is only created once."""
+        cache = MemoryCache()
+        calls = []
+
+        def create():
+            calls.append(1)
+            return np.zeros(10)
+
+        first = cache.get_or_create("key", create, lambda a: a.nbytes)
+        second = cache.get_or_create("key", create, lambda a: a.nbytes)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.nbytes, 80)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats["hits"], 0)
+
+    def test_get_or_create_concurrent(self):
+        """Test that concurrent calls for the same key create the object once."""
+        cache = MemoryCache()
+        calls = []
+
+        def create():
+            calls.append(1)
+            time.sleep(0.1)
+            return np.zeros(10)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: cache.get_or_create("key", create, lambda a: a.nbytes),
+                range(4)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(cache._key_locks, {})
+
+
+class TestDiskArrayCache(unittest.TestCase):
+    """Test cases for DiskArrayCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.arrays = {"a": np.arange(100, dtype=np.uint32),
+                       "b": np.linspace(0, 1, 100)}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        """Test that stored arrays are returned as memory maps."""
+        cache = DiskArrayCache(self.temp_dir.name)
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", self.arrays)
+        arrays = cache.get("key")
+        self.assertIsInstance(arrays["a"], np.memmap)
+        np.testing.assert_array_equal(arrays["a"], self.arrays["a"])
+        np.testing.assert_array_equal(arrays["b"], self.arrays["b"])
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.stats["writes"], 1)
+
+    def test_put_existing_key(self):
+        """Test that storing an existing key keeps the entry."""
+        cache = DiskArrayCache(self.temp_dir.name)
+        cache.put("key", self.arrays)
+        cache.put("key", self.arrays)
+        np.testing.assert_array_equal(cache.get("key")["a"], self.arrays["a"])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        entry_size = sum(a.nbytes for a in self.arrays.values())
+        cache = DiskArrayCache(self.temp_dir.name, max_bytes=int(2.9 * entry_size))
+        cache.put("first", self.arrays)
+        cache.put("second", self.arrays)
+        past = time.time() - 100
+        os.utime(os.path.join(self.temp_dir.name, "first"), (past, past))
+        os.utime(os.path.join(self.temp_dir.name, "second"), (past + 1, past + 1))
+        # Using the first entry makes the second one the least recently used
+        cache.get("first")
+        cache.put("third", self.arrays)
+
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("third"))
+        self.assertEqual(cache.stats["evictions"], 1)
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+
+    def test_entry_larger_than_limit_is_not_stored(self):
+        """Test that an entry larger than the size limit is not stored."""
+        cache = DiskArrayCache(self.temp_dir.name, max_bytes=10)
+        cache.put("key", self.arrays)
+        self.assertIsNone(cache.get("key"))
+
+    def test_clear(self):
+        """Test removing all entries."""
+        cache = DiskArrayCache(self.temp_dir.name)
+        cache.put("key", self.arrays)
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+        self.assertIsNone(cache.get("key"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from pyorps.utils.shared_array import SharedArray
+
+
+class TestSharedArray(unittest.TestCase):
+    """Test cases for numpy arrays in shared memory."""
+
+    def test_release_with_copy(self):
+        """Test that the released copy keeps the data and the block is unlinked."""
+        shared = SharedArray((3, 4), np.uint16)
+        shared.array[...] = np.arange(12).reshape(3, 4)
+        name, shape, dtype = shared.handle
+        self.assertEqual((shape, dtype), ((3, 4), np.dtype(np.uint16).str))
+
+        data = shared.release(copy=True)
+        np.testing.assert_array_equal(data, np.arange(12).reshape(3, 4))
+        self.assertIsNone(shared.array)
+        self.assertIsNone(shared.release())
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
+
+    def test_context_manager(self):
+        """Test that leaving the context releases the block."""
+        with SharedArray((0,), np.float32) as shared:
+            name = shared.handle[0]
+            self.assertEqual(shared.array.size, 0)
+        self.assertIsNone(shared.array)
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from pyorps.utils import traversal
+from pyorps.utils.warmup import warm_up, main
+
+
+class TestWarmUp(unittest.TestCase):
+    """Test cases for the warm-up of the numba kernels."""
+
+    def test_all_kernels_are_compiled_and_cached(self):
+        """Test that every kernel is compiled or loaded from the JIT cache."""
+        report = warm_up()
+        self.assertIn("calculate_path_metrics_numba", report)
+        self.assertIn("euclidean_distances_numba", report)
+        for name, entry in report.items():
+            self.assertGreater(len(getattr(traversal, name).signatures), 0, name)
+            self.assertGreaterEqual(entry["cache_hits"] + entry["cache_misses"], 1,
+                                    name)
+            self.assertTrue(entry["cache_path"])
+
+    def test_path_metrics_do_not_depend_on_chunks(self):
+        """Test that the chunked accumulation of the path metrics is complete."""
+        raster = np.arange(1, 401, dtype=np.uint16).reshape(20, 20) % 3 + 1
+        path = np.array([21 * i for i in range(20)], dtype=np.uint32)
+        total_length, categories, lengths = traversal.calculate_path_metrics_numba(
+            raster, path)
+        self.assertAlmostEqual(total_length, 19 * np.sqrt(2))
+        np.testing.assert_array_equal(categories, [1, 2, 3])
+        self.assertAlmostEqual(lengths.sum(), total_length)
+
+    def test_main(self):
+        """Test the command line entry point."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([])
+        self.assertIn("Cache:", output.getvalue())
+        self.assertIn("calculate_path_metrics_numba", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()